@@ -3,21 +3,71 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+import os
+import requests
+import threading
+import time
 from datetime import datetime
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 
-from config import APP_TITLE, APP_ICON, CACHE_TTL_PRICES, CACHE_TTL_MAPPING, CACHE_TTL_CHAINS
-from data import ALL_ITEMS, BANK_LOCATIONS
-from models import generate_all_chains
-from services import OSRSWikiConnection, ItemIDLookup, calculate_gp_per_hour
+from config import APP_TITLE, APP_ICON, CACHE_TTL_PRICES, CACHE_TTL_MAPPING, CACHE_TTL_CHAINS, CACHE_TTL_HISTORY, HISTORY_STORE_DIR, MAX_BACKFILL_WINDOWS, MAX_QUANTITY, PROFIT_BAND_WINDOWS, FORECAST_HORIZONS
+from data import ALL_ITEMS, BANK_LOCATIONS, ITEM_CATEGORIES, GE_TAX_RATE, GE_TAX_CAP, GE_TAX_THRESHOLD, TIMINGS_CALIBRATED
+from models import generate_all_chains, build_chain_graph, ChainGraph, CompiledCatalog, load_catalog
+from services import (
+    OSRSWikiConnection,
+    ItemIDLookup,
+    explode_order,
+    PROFIT_CONFIG_KEYS,
+    catalog_price_arrays,
+    evaluate_catalog,
+    resolve_item_ids,
+    fetch_price_history,
+    build_price_matrix,
+    estimate_return_covariance,
+    simulate_profit_risk,
+    solve_break_even,
+    run_what_if,
+    plan_session,
+    ArbitrageDetector,
+    arbitrage_config_key,
+    hourly_volumes,
+    liquidity_caps,
+    pareto_frontier,
+    xp_per_item_array,
+    profit_curves,
+    quantity_grid,
+    simulate_items_per_hour,
+    best_locations,
+    location_requirements,
+    equipment_payback,
+    production_lines,
+    PriceStore,
+    open_price_store,
+    backtest,
+    iter_sweep,
+    TIMESTEP_SECONDS,
+    RollingStats,
+    chain_trends,
+    ROLLING_WINDOW,
+    ProfitBands,
+    projected_profit,
+    CoMovement,
+    leg_correlation,
+)
 from ui import (
     OSRS_CSS,
     render_best_item_card,
+    render_step_indicator,
     create_profit_chart,
     create_category_pie,
     create_profit_histogram,
     create_roi_scatter,
     create_category_comparison,
+    create_pareto_scatter,
+    create_quantity_curve,
+    create_simulation_histogram,
+    create_profit_over_time,
+    create_correlation_heatmap,
 )
 from utils import format_gp, get_clean_item_name, get_item_icon_url
 
@@ -46,6 +96,115 @@ def fetch_latest_prices(_conn: OSRSWikiConnection) -> Dict:
     return _conn.fetch_prices()
 
 
+@st.cache_resource
+def get_price_store(_conn: OSRSWikiConnection, timestep: str) -> Optional[PriceStore]:
+    item_ids = sorted(int(item_id) for item_id in fetch_item_mapping(_conn))
+    try:
+        return open_price_store(os.path.join(HISTORY_STORE_DIR, timestep), item_ids, timestep)
+    except OSError:
+        return None  # Read-only deployment: history isn't kept
+
+
+@st.cache_resource
+def get_rolling_stats(_conn: OSRSWikiConnection, timestep: str) -> RollingStats:
+    item_ids = sorted(int(item_id) for item_id in fetch_item_mapping(_conn))
+    return RollingStats.load(os.path.join(HISTORY_STORE_DIR, timestep, "rolling_stats.npz"), item_ids)
+
+
+@st.cache_resource
+def get_comovement(timestep: str, item_ids: Tuple) -> CoMovement:
+    return CoMovement.load(os.path.join(HISTORY_STORE_DIR, timestep, "comovement.npz"), item_ids)
+
+
+@st.cache_resource(max_entries=8)
+def get_profit_bands(timestep: str, profit_config: Tuple) -> ProfitBands:
+    return ProfitBands(len(load_catalog()), max(PROFIT_BAND_WINDOWS.values()))
+
+
+@st.cache_data(ttl=CACHE_TTL_HISTORY, show_spinner=False)
+def fetch_history(_conn: OSRSWikiConnection, timestep: str, count: int) -> List:
+    return fetch_price_history(_conn, timestep, count)
+
+
+def ingest_history(conn: OSRSWikiConnection, timestep: str, snapshots: List) -> None:
+    """Keep fetched windows: append them to the store and fold them into the rolling stats."""
+    store = get_price_store(conn, timestep)
+    stats = get_rolling_stats(conn, timestep)
+    if store is not None:
+        store.append(snapshots)
+    if stats.ingest(snapshots) and store is not None:
+        stats.save(os.path.join(store.directory, "rolling_stats.npz"))
+
+
+def recent_price_matrix(conn: OSRSWikiConnection, timestep: str, count: int, item_ids: List) -> Dict:
+    """
+    Last count closed windows as build_price_matrix arrays. Read from the
+    price store when it holds them, fetching only windows newer than its
+    last; otherwise all count windows are fetched.
+    """
+    step = TIMESTEP_SECONDS[timestep]
+    # Most recent closed window, as in fetch_price_history
+    last = (int(time.time()) // step) * step - step
+    start = last - (count - 1) * step
+    store = get_price_store(conn, timestep)
+    if store is not None:
+        store.refresh()
+        if store.first_timestamp is not None and store.first_timestamp <= start <= store.last_timestamp:
+            missing = (last - store.last_timestamp) // step
+            if missing > 0:
+                ingest_history(conn, timestep, fetch_price_history(conn, timestep, missing))
+            stored = store.slice(start, last + 1, item_ids)
+            if len(stored["timestamps"]) == count:
+                return stored
+    snapshots = fetch_history(conn, timestep, count)
+    ingest_history(conn, timestep, snapshots)
+    return build_price_matrix(snapshots, item_ids)
+
+
+@st.cache_data(ttl=CACHE_TTL_PRICES, show_spinner=False)
+def get_liquidity_caps(
+    high: np.ndarray,
+    low: np.ndarray,
+    config: Dict,
+    buy_limits: List,
+    buy_volume: np.ndarray,
+    sell_volume: np.ndarray
+) -> Dict:
+    return liquidity_caps(load_catalog(), high, low, config, buy_limits, buy_volume, sell_volume)
+
+
+@st.cache_data(ttl=CACHE_TTL_PRICES, show_spinner=False)
+def get_pareto_frontier(high: np.ndarray, low: np.ndarray, config: Dict, owned_only: bool) -> Dict:
+    return pareto_frontier(load_catalog(), high, low, config, owned_only)
+
+
+@st.cache_data(ttl=CACHE_TTL_PRICES, show_spinner=False)
+def get_chain_breakdown(
+    chain_name: str,
+    config: Dict,
+    high: np.ndarray,
+    low: np.ndarray,
+    _prices: Dict,
+    _id_lookup: ItemIDLookup
+) -> Optional[Dict]:
+    # high/low key the cache to the price snapshot for catalog items
+    for chains in get_all_chains().values():
+        for chain in chains:
+            if chain.name == chain_name:
+                return chain.calculate(_prices, config, _id_lookup)
+    return None
+
+
+@st.cache_data(ttl=CACHE_TTL_PRICES, show_spinner=False)
+def get_profit_curves(high: np.ndarray, low: np.ndarray, config: Dict, buy_limits: List) -> Dict:
+    return profit_curves(load_catalog(), high, low, config, quantity_grid(MAX_QUANTITY), buy_limits)
+
+
+@st.cache_data(show_spinner=False)
+def run_trip_simulation(timing_key: str, config: Dict, n_hours: int, bank_delay_ticks: float) -> Optional[Dict]:
+    return simulate_items_per_hour(timing_key, config, n_hours, seed=0, bank_delay_ticks=bank_delay_ticks)
+
+
 @st.cache_resource
 def get_id_lookup(_mapping_hash: str, item_mapping: Dict) -> ItemIDLookup:
     return ItemIDLookup(item_mapping)
@@ -56,6 +215,41 @@ def get_all_chains() -> Dict:
     return generate_all_chains()
 
 
+@st.cache_resource
+def get_chain_graph() -> ChainGraph:
+    return build_chain_graph(get_all_chains())
+
+
+@st.cache_resource
+def get_arbitrage_detector() -> ArbitrageDetector:
+    return ArbitrageDetector(load_catalog())
+
+
+def describe_line(catalog: CompiledCatalog, stages: np.ndarray, order: np.ndarray, r: int) -> str:
+    """Stage outputs of recipe r's production line, in the given stage order."""
+    return " → ".join(catalog.recipes[s].output.item_name for s in order if stages[r, s] > 0)
+
+
+EQUIPMENT_LABELS = {
+    "has_imcando_hammer": "Imcando hammer",
+    "has_amys_saw": "Amy's saw",
+    "has_plank_sack": "Plank sack",
+    "has_smithing_outfit": "Smiths' uniform",
+    "ancient_furnace": "Ancient furnace",
+}
+
+
+def describe_setup(catalog: CompiledCatalog, recipe_idx: int, setup: Dict) -> str:
+    """Bank, stamina, plank method and equipment of a swept setup for recipe_idx."""
+    parts = [setup["bank_location"]]
+    if not setup["use_stamina"]:
+        parts.append("no stamina")
+    if catalog.recipes[recipe_idx].category == "Planks":
+        parts.append(setup["plank_method"])
+    parts.extend(label for key, label in EQUIPMENT_LABELS.items() if setup[key])
+    return ", ".join(parts)
+
+
 def main():
     col1, col2 = st.columns([4, 1])
     with col1:
@@ -130,6 +324,8 @@ def main():
                 
                 selected_bank = BANK_LOCATIONS[bank_location]
                 st.caption(f"*{selected_bank.total_overhead:.0f}s overhead | Req: {selected_bank.requirements}*")
+                if TIMINGS_CALIBRATED:
+                    st.caption("*Timings calibrated from gameplay logs*")
                 
                 use_stamina = True
                 if selected_bank.stamina_dependent:
@@ -177,7 +373,7 @@ def main():
             quantity = st.number_input(
                 "Calculate for quantity:",
                 min_value=1,
-                max_value=100000,
+                max_value=MAX_QUANTITY,
                 value=int(params.get("quantity", 1)),
                 step=1
             )
@@ -233,12 +429,55 @@ def main():
         "has_smithing_outfit": params.get("smithing_outfit", "false") == "true",
     }
     
+    catalog = load_catalog()
+    high, low = catalog_price_arrays(catalog, prices, id_lookup)
+    break_even = solve_break_even(catalog, high, low, config)
+    buy_limits = [
+        item_mapping.get(item_id, {}).get("limit") if item_id else None
+        for item_id in resolve_item_ids(catalog, id_lookup)
+    ]
+    
+    # Hourly history only adds columns; without it the tabs fall back to latest prices
+    recent_history = trends = profit_bands = comovement = hedge = None
+    try:
+        # Same windows the Risk tab loads by default, so this is a cache hit
+        recent_history = fetch_history(conn, "1h", ROLLING_WINDOW)
+        ingest_history(conn, "1h", recent_history)
+        trends = chain_trends(catalog, get_rolling_stats(conn, "1h").columns(resolve_item_ids(catalog, id_lookup)), config)
+        
+        # Profit sketches for this setup pick up whatever the 1h store gained
+        # Keyed on price-relevant settings only, so rate toggles reuse the sketches
+        profit_bands = get_profit_bands("1h", tuple((key, config.get(key)) for key in PROFIT_CONFIG_KEYS))
+        history_store = get_price_store(conn, "1h")
+        if history_store is not None:
+            profit_bands.ingest_store(catalog, history_store, resolve_item_ids(catalog, id_lookup), config)
+        else:
+            profit_bands.ingest(catalog, build_price_matrix(recent_history, resolve_item_ids(catalog, id_lookup)), config)
+        
+        comovement = get_comovement("1h", tuple(resolve_item_ids(catalog, id_lookup)))
+        if comovement.ingest(recent_history) and history_store is not None:
+            comovement.save(os.path.join(history_store.directory, "comovement.npz"))
+        hedge = leg_correlation(catalog, comovement.covariance(), high)
+    except requests.RequestException as e:
+        st.warning(f"Hourly price history unavailable ({e}); trend, forecast, band and co-movement figures are hidden.")
+    
     tabs = st.tabs([
         "All Chains", 
         "Search Items", 
         "Sailing Items",
         "Best Profits",
-        "Analytics"
+        "Analytics",
+        "Order Planner",
+        "Risk",
+        "What-If",
+        "Session Planner",
+        "Arbitrage",
+        "Pareto",
+        "Simulator",
+        "Locations",
+        "Equipment",
+        "Production Lines",
+        "Backtest"
     ])
     
     # Tab 1: All Chains
@@ -254,14 +493,35 @@ def main():
         chains = all_chains[category]
         show_gp_hr_display = config.get("show_gp_hr", False)
         
+        price_mode = st.radio(
+            "Prices", ["Latest"] + [f"Projected {h}" for h in FORECAST_HORIZONS], horizontal=True,
+            key="chain_price_mode", help="Projected uses a Holt trend forecast of every input and output from hourly history"
+        )
+        projected = None
+        if price_mode != "Latest" and recent_history is None:
+            st.info("Hourly history unavailable; showing latest prices.")
+        elif price_mode != "Latest":
+            horizon = FORECAST_HORIZONS[price_mode.split()[-1]] // TIMESTEP_SECONDS["1h"]
+            forecast_history = build_price_matrix(recent_history, resolve_item_ids(catalog, id_lookup))
+            start = time.perf_counter()
+            projected = projected_profit(catalog, forecast_history, [horizon], config)
+            st.caption(f"Forecast fitted for {len(catalog.item_names)} items in {(time.perf_counter() - start) * 1000:.1f} ms; bands are ~90%.")
+        
+        if show_gp_hr_display:
+            buy_volume = sell_volume = None  # Without history only buy limits cap
+            if recent_history is not None:
+                buy_volume, sell_volume = hourly_volumes(build_price_matrix(recent_history, resolve_item_ids(catalog, id_lookup)), "1h")
+            liquidity = get_liquidity_caps(high, low, config, buy_limits, buy_volume, sell_volume)
+        
         if chains:
             results = []
             for chain in chains:
-                result = chain.calculate(prices, config, id_lookup)
+                result = chain.calculate(prices, config, id_lookup, include_steps=False)
                 if "error" not in result:
                     profit = result["net_profit"]
                     profit_per_item = result["profit_per_item"]
                     output_name = result.get("output_item_name", chain.name)
+                    recipe_idx = catalog.recipe_index(chain.name)
                     
                     row = {
                         "Icon": get_item_icon_url(output_name),
@@ -272,6 +532,9 @@ def main():
                         "Output": result["output_value"],
                         "Tax": result["ge_tax"],
                         "Net Profit": profit,
+                        "Safety %": break_even["output_margin"][recipe_idx] if recipe_idx is not None else None,
+                        "Min Sell": break_even["min_output_price"][recipe_idx] if recipe_idx is not None else None,
+                        "Max Buy": break_even["max_input_price"][recipe_idx] if recipe_idx is not None else None,
                         "Per Item": profit_per_item,
                         "ROI %": result['roi'] if result['roi'] != float('inf') else None,
                         "_profit_raw": profit,
@@ -279,18 +542,37 @@ def main():
                         "_output_name": output_name
                     }
                     
+                    if trends is not None:
+                        row["24h Avg Profit"] = trends["rolling_profit_per_item"][recipe_idx] if recipe_idx is not None else None
+                        row["EMA Profit"] = trends["ema_profit_per_item"][recipe_idx] if recipe_idx is not None else None
+                        row["Volatility %"] = trends["output_volatility"][recipe_idx] * 100 if recipe_idx is not None else None
+                        row["Spread %"] = trends["output_spread_pct"][recipe_idx] if recipe_idx is not None else None
+                    if hedge is not None:
+                        row["Leg Corr."] = hedge[recipe_idx] if recipe_idx is not None else None
+                    
+                    if projected is not None:
+                        row["Projected"] = projected["profit_per_item"][0][recipe_idx] if recipe_idx is not None else None
+                        row["Proj. Low"] = projected["low_profit_per_item"][0][recipe_idx] if recipe_idx is not None else None
+                        row["Proj. High"] = projected["high_profit_per_item"][0][recipe_idx] if recipe_idx is not None else None
+                    
                     if show_gp_hr_display:
-                        gp_hr_data = calculate_gp_per_hour(
-                            profit_per_item, category, chain.name, config
-                        )
-                        if gp_hr_data:
-                            row["GP/hr"] = gp_hr_data["gp_per_hour"]
-                            row["Items/hr"] = gp_hr_data["items_per_hour"]
-                            row["_gp_hr_raw"] = gp_hr_data["gp_per_hour"]
+                        has_timing = recipe_idx is not None and np.isfinite(liquidity["items_per_hour"][recipe_idx])
+                        if has_timing:
+                            row["GP/hr"] = liquidity["gp_per_hour"][recipe_idx]
+                            row["Items/hr"] = liquidity["items_per_hour"][recipe_idx]
+                            row["_gp_hr_raw"] = liquidity["gp_per_hour"][recipe_idx]
+                            max_batch = liquidity["max_batch"][recipe_idx]
+                            bottleneck = liquidity["bottleneck"][recipe_idx]
+                            row["Capped GP/hr"] = liquidity["capped_gp_per_hour"][recipe_idx]
+                            row["Max Batch"] = max_batch if np.isfinite(max_batch) else None
+                            row["Limited By"] = catalog.item_names[bottleneck] if bottleneck >= 0 else ""
                         else:
                             row["GP/hr"] = None
                             row["Items/hr"] = None
                             row["_gp_hr_raw"] = 0
+                            row["Capped GP/hr"] = None
+                            row["Max Batch"] = None
+                            row["Limited By"] = ""
                     
                     results.append(row)
             
@@ -299,6 +581,8 @@ def main():
                 
                 if show_gp_hr_display and "GP/hr" in df.columns:
                     df = df.sort_values("_gp_hr_raw", ascending=False, na_position='last')
+                elif projected is not None:
+                    df = df.sort_values("Projected", ascending=False, na_position='last')
                 else:
                     df = df.sort_values("_profit_raw", ascending=False)
                 
@@ -311,16 +595,32 @@ def main():
                     "Output": st.column_config.NumberColumn("Output Value", format="%.0f gp"),
                     "Tax": st.column_config.NumberColumn("GE Tax", format="%.0f gp"),
                     "Net Profit": st.column_config.NumberColumn("Net Profit", format="%.0f gp"),
+                    "Safety %": st.column_config.NumberColumn("Margin of Safety", format="%.1f%%", help="How far the sell price can fall before the chain stops breaking even"),
+                    "Min Sell": st.column_config.NumberColumn("Break-even Sell", format="%.1f gp", help="Lowest output price that breaks even"),
+                    "Max Buy": st.column_config.NumberColumn("Break-even Buy", format="%.1f gp", help="Highest price for the main input that breaks even"),
                     "Per Item": st.column_config.NumberColumn("Per Item", format="%.1f gp"),
                     "ROI %": st.column_config.ProgressColumn("ROI %", format="%.1f%%", min_value=-100, max_value=100),
+                    "24h Avg Profit": st.column_config.NumberColumn("24h Avg Profit", format="%.1f gp", help="Profit per item at the output's and inputs' rolling 24h mean prices"),
+                    "EMA Profit": st.column_config.NumberColumn("EMA Profit", format="%.1f gp", help="Profit per item at exponentially smoothed hourly prices"),
+                    "Volatility %": st.column_config.NumberColumn("Volatility", format="%.1f%%", help="Hourly volatility of the output's mid price"),
+                    "Spread %": st.column_config.NumberColumn("Spread", format="%.1f%%", help="Output's average high-low spread over 24h, as % of mid price"),
+                    "Leg Corr.": st.column_config.NumberColumn("Leg Corr.", format="%.2f", help="Correlation of input and output price moves; near 1 means the margin is naturally hedged"),
                     "_profit_raw": None,
                     "_profitable": None,
                     "_output_name": None
                 }
                 
+                if projected is not None:
+                    column_config["Projected"] = st.column_config.NumberColumn("Projected", format="%.1f gp", help=f"Profit per item at forecast prices {price_mode.split()[-1]} ahead")
+                    column_config["Proj. Low"] = st.column_config.NumberColumn("Proj. Low", format="%.1f gp", help="Inputs at the top of their band, output at the bottom")
+                    column_config["Proj. High"] = st.column_config.NumberColumn("Proj. High", format="%.1f gp", help="Inputs at the bottom of their band, output at the top")
+                
                 if show_gp_hr_display:
                     column_config["GP/hr"] = st.column_config.NumberColumn("GP/hr", format="%.0f")
                     column_config["Items/hr"] = st.column_config.NumberColumn("Items/hr", format="%.0f")
+                    column_config["Capped GP/hr"] = st.column_config.NumberColumn("Capped GP/hr", format="%.0f", help="GP/hr limited by GE buy limits and traded volume")
+                    column_config["Max Batch"] = st.column_config.NumberColumn("Max Batch", format="%.0f", help="Most items per 4-hour buy-limit window")
+                    column_config["Limited By"] = st.column_config.TextColumn("Limited By", help="Item whose buy limit or volume caps throughput")
                     column_config["_gp_hr_raw"] = None
                 
                 st.dataframe(df, use_container_width=True, hide_index=True, column_config=column_config)
@@ -354,6 +654,79 @@ def main():
                     with col4:
                         if best_profit["ROI %"]:
                             st.metric("Best ROI", f"{best_profit['ROI %']:.1f}%")
+            
+            st.subheader("Chain Breakdown")
+            drill_chain = st.selectbox(
+                "Chain",
+                [None] + [chain.name for chain in chains],
+                format_func=lambda name: "Select a chain..." if name is None else name,
+                key="drill_chain"
+            )
+            
+            if drill_chain:
+                breakdown = get_chain_breakdown(drill_chain, config, high, low, prices, id_lookup)
+                if breakdown and breakdown["steps"]:
+                    st.dataframe(
+                        pd.DataFrame([{
+                            "Step": render_step_indicator(step["step_type"]),
+                            "Icon": get_item_icon_url(step["name"]),
+                            "Item": step["name"],
+                            "Quantity": step["quantity"],
+                            "Unit Price": step["unit_price"],
+                            "Value": step["total_value"],
+                            "Processing": step["processing_cost"],
+                            "Notes": step["processing_notes"] or ("Self-obtained" if step["is_self_obtained"] and step["step_type"] != "Output" else ""),
+                        } for step in breakdown["steps"]]),
+                        use_container_width=True,
+                        hide_index=True,
+                        column_config={
+                            "Step": st.column_config.TextColumn("Step", width="small"),
+                            "Icon": st.column_config.ImageColumn("Icon", width="small"),
+                            "Item": st.column_config.TextColumn("Item", width="medium"),
+                            "Quantity": st.column_config.NumberColumn("Quantity", format="%.2f"),
+                            "Unit Price": st.column_config.NumberColumn("Unit Price", format="%.0f gp"),
+                            "Value": st.column_config.NumberColumn("Value", format="%.0f gp"),
+                            "Processing": st.column_config.NumberColumn("Processing", format="%.0f gp"),
+                            "Notes": st.column_config.TextColumn("Notes", width="large"),
+                        }
+                    )
+                    if breakdown["missing_prices"]:
+                        st.caption(f"*Missing prices: {', '.join(breakdown['missing_prices'])}*")
+                    st.caption(
+                        f"*Total cost {format_gp(breakdown['total_input_cost'])} | "
+                        f"GE tax {format_gp(breakdown['ge_tax'])} | "
+                        f"Net profit {format_gp(breakdown['net_profit'])}*"
+                    )
+                    
+                    curves = get_profit_curves(high, low, config, buy_limits)
+                    recipe_idx = catalog.recipe_index(drill_chain)
+                    if recipe_idx is not None:
+                        breakpoints = {
+                            "Tax starts": curves["tax_threshold_quantity"][recipe_idx],
+                            "Tax cap": curves["tax_cap_quantity"][recipe_idx],
+                            "Buy limit": curves["buy_limit_quantity"][recipe_idx],
+                        }
+                        breakpoints = {k: v for k, v in breakpoints.items() if 1 < v <= MAX_QUANTITY}
+                        optimal_profit = curves["optimal_profit"][recipe_idx]
+                        
+                        col1, col2, col3 = st.columns(3)
+                        with col1:
+                            st.metric("Best Batch", f"{curves['optimal_quantity'][recipe_idx]:,.0f}" if optimal_profit > 0 else "—")
+                        with col2:
+                            st.metric("Best Batch Profit", format_gp(optimal_profit) if optimal_profit > 0 else "Unprofitable")
+                        with col3:
+                            min_profitable = curves["min_profitable_quantity"][recipe_idx]
+                            st.metric("Profitable From", f"{min_profitable:,.0f}" if np.isfinite(min_profitable) else "Never")
+                        
+                        st.plotly_chart(
+                            create_quantity_curve(
+                                curves["quantities"].tolist(),
+                                curves["net_profit"][:, recipe_idx].tolist(),
+                                breakpoints,
+                                curves["optimal_quantity"][recipe_idx] if optimal_profit > 0 else None
+                            ),
+                            use_container_width=True
+                        )
     
     # Tab 2: Search Items
     with tabs[1]:
@@ -451,37 +824,60 @@ def main():
     with tabs[3]:
         st.header("Most Profitable Chains")
         
+        band_window = st.radio(
+            "Profit bands over", list(PROFIT_BAND_WINDOWS), horizontal=True, key="bp_band_window",
+            help="P10/P50/P90 profit per item over hourly history for your current setup"
+        )
+        if profit_bands is not None:
+            p10, p50, p90 = profit_bands.percentiles(PROFIT_BAND_WINDOWS[band_window])["quantiles"]
+        else:
+            p10 = p50 = p90 = np.full(len(catalog), np.nan)
+        
         all_results = []
         
         with st.spinner("Calculating..."):
             for cat, cat_chains in all_chains.items():
                 for chain in cat_chains:
-                    result = chain.calculate(prices, config, id_lookup)
+                    result = chain.calculate(prices, config, id_lookup, include_steps=False)
                     if "error" not in result:
                         output_name = result.get("output_item_name", chain.name)
+                        recipe_idx = catalog.recipe_index(chain.name)
                         all_results.append({
                             "Icon": get_item_icon_url(output_name),
                             "Category": cat,
                             "Item": chain.name,
                             "Profit": result["net_profit"],
+                            "Safety %": break_even["output_margin"][recipe_idx] if recipe_idx is not None else None,
                             "Per Item": result["profit_per_item"],
                             "ROI %": result['roi'] if result['roi'] != float('inf') else None,
+                            "P10": p10[recipe_idx] if recipe_idx is not None else None,
+                            "P50": p50[recipe_idx] if recipe_idx is not None else None,
+                            "P90": p90[recipe_idx] if recipe_idx is not None else None,
                             "_profit_raw": result["net_profit"],
                             "_output_name": output_name
                         })
         
         if all_results:
-            col1, col2 = st.columns(2)
+            col1, col2, col3 = st.columns(3)
             with col1:
                 show_profitable_only = st.toggle("Show profitable only", value=True)
             with col2:
+                rank_by = st.radio("Rank by", ["Net Profit", "Margin of Safety", "Median Profit"], horizontal=True)
+            with col3:
                 top_n = st.slider("Show top N", 5, 50, 20)
             
             filtered_results = all_results
             if show_profitable_only:
                 filtered_results = [r for r in all_results if r["_profit_raw"] > 0]
             
-            filtered_results.sort(key=lambda x: x["_profit_raw"], reverse=True)
+            if rank_by in ("Margin of Safety", "Median Profit"):
+                rank_key = "Safety %" if rank_by == "Margin of Safety" else "P50"
+                filtered_results.sort(
+                    key=lambda x: x[rank_key] if x[rank_key] is not None and not np.isnan(x[rank_key]) else -np.inf,
+                    reverse=True
+                )
+            else:
+                filtered_results.sort(key=lambda x: x["_profit_raw"], reverse=True)
             top_results = filtered_results[:top_n]
             
             if top_results:
@@ -496,8 +892,12 @@ def main():
                         "Category": st.column_config.TextColumn("Category"),
                         "Item": st.column_config.TextColumn("Item", width="medium"),
                         "Profit": st.column_config.NumberColumn("Net Profit", format="%.0f gp"),
+                        "Safety %": st.column_config.NumberColumn("Margin of Safety", format="%.1f%%"),
                         "Per Item": st.column_config.NumberColumn("Per Item", format="%.1f gp"),
                         "ROI %": st.column_config.ProgressColumn("ROI %", format="%.1f%%", min_value=-100, max_value=100),
+                        "P10": st.column_config.NumberColumn("P10", format="%.1f gp", help=f"Profit per item beaten 90% of the time over {band_window}"),
+                        "P50": st.column_config.NumberColumn("Median", format="%.1f gp", help=f"Median profit per item over {band_window}"),
+                        "P90": st.column_config.NumberColumn("P90", format="%.1f gp", help=f"Profit per item beaten 10% of the time over {band_window}"),
                         "_profit_raw": None,
                         "_output_name": None
                     }
@@ -526,7 +926,7 @@ def main():
                 if exclude_dragon and "dragon" in chain.name.lower():
                     continue
                     
-                result = chain.calculate(prices, config, id_lookup)
+                result = chain.calculate(prices, config, id_lookup, include_steps=False)
                 if "error" not in result:
                     profit = result["net_profit"]
                     if use_per_item and quantity_val > 0:
@@ -601,7 +1001,792 @@ def main():
             with col4:
                 max_profit = max(profits)
                 st.metric("Best Profit", format_gp(max_profit))
+    
+    # Tab 6: Order Planner
+    with tabs[5]:
+        st.header("Order Planner")
+        st.caption("Explode a mixed order into raw materials, intermediates and processing costs.")
+        
+        chain_graph = get_chain_graph()
+        craftable_items = sorted(chain_graph.producers.keys())
+        
+        order_df = st.data_editor(
+            pd.DataFrame([
+                {"Item": "Large rosewood hull parts", "Quantity": 40},
+                {"Item": "Large dragon keel parts", "Quantity": 20},
+                {"Item": "Rosewood repair kit", "Quantity": 300},
+            ]),
+            num_rows="dynamic",
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "Item": st.column_config.SelectboxColumn("Item", options=craftable_items, required=True),
+                "Quantity": st.column_config.NumberColumn("Quantity", min_value=1, step=1, format="%d"),
+            },
+            key="order_list"
+        )
+        
+        buy_items = st.multiselect(
+            "Buy instead of craft",
+            craftable_items,
+            help="Intermediates to buy on the GE rather than craft"
+        )
+        
+        order = [
+            (row["Item"], row["Quantity"])
+            for row in order_df.to_dict("records")
+            if isinstance(row.get("Item"), str) and pd.notna(row.get("Quantity"))
+        ]
+        bom = explode_order(order, chain_graph, prices, config, id_lookup, buy_items)
+        
+        if bom["unknown_items"]:
+            st.warning(f"Unknown items: {', '.join(bom['unknown_items'])}")
+        
+        if bom["raw_materials"]:
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("Raw Materials", format_gp(bom["raw_material_cost"]))
+            with col2:
+                st.metric("Processing", format_gp(bom["processing_costs"]))
+            with col3:
+                st.metric("Total Cost", format_gp(bom["total_cost"]))
+            with col4:
+                st.metric("Order Value", format_gp(bom["output_value"]))
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.subheader("Shopping List")
+                st.dataframe(
+                    pd.DataFrame([{
+                        "Icon": get_item_icon_url(r["name"]),
+                        "Item": r["name"],
+                        "Quantity": r["quantity"],
+                        "Unit Price": r["unit_price"],
+                        "Total": r["total_cost"],
+                    } for r in bom["raw_materials"]]),
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config={
+                        "Icon": st.column_config.ImageColumn("Icon", width="small"),
+                        "Item": st.column_config.TextColumn("Item", width="medium"),
+                        "Quantity": st.column_config.NumberColumn("Quantity", format="%.0f"),
+                        "Unit Price": st.column_config.NumberColumn("Unit Price", format="%d gp"),
+                        "Total": st.column_config.NumberColumn("Total", format="%.0f gp"),
+                    }
+                )
+            
+            with col2:
+                st.subheader("Crafted Items")
+                st.dataframe(
+                    pd.DataFrame([{
+                        "Icon": get_item_icon_url(r["name"]),
+                        "Item": r["name"],
+                        "Craft": r["quantity"],
+                        "Ordered": r["ordered"],
+                        "Process Cost": r["processing_cost"],
+                    } for r in bom["intermediates"]]),
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config={
+                        "Icon": st.column_config.ImageColumn("Icon", width="small"),
+                        "Item": st.column_config.TextColumn("Item", width="medium"),
+                        "Craft": st.column_config.NumberColumn("Craft", format="%.0f"),
+                        "Ordered": st.column_config.NumberColumn("Ordered", format="%.0f"),
+                        "Process Cost": st.column_config.NumberColumn("Process Cost", format="%.0f gp"),
+                    }
+                )
+            
+            if bom["missing_prices"]:
+                st.caption(f"*No price data: {', '.join(bom['missing_prices'])}*")
+        else:
+            st.info("Add items to the order list.")
+    
+    # Tab 7: Risk
+    with tabs[6]:
+        st.header("Profit Risk")
+        st.caption("Monte Carlo over correlated price moves estimated from recent 5m/1h history.")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            risk_timestep = st.selectbox("History", ["1h", "5m"], key="risk_timestep")
+        with col2:
+            risk_windows = st.slider("Windows", 12, 96, 24, key="risk_windows", help="History windows used for volatility")
+        with col3:
+            risk_horizon = st.number_input("Horizon (windows)", min_value=1, max_value=48, value=1, key="risk_horizon")
+        with col4:
+            risk_samples = st.selectbox("Samples", [1_000, 10_000, 50_000], index=1, key="risk_samples")
+        
+        price_matrix = None
+        try:
+            with st.spinner("Loading price history..."):
+                price_matrix = recent_price_matrix(conn, risk_timestep, risk_windows, resolve_item_ids(catalog, id_lookup))
+        except requests.RequestException as e:
+            st.warning(f"Price history unavailable ({e}).")
+        
+        if price_matrix is not None:
+            cov = estimate_return_covariance(price_matrix)
+            
+            start = time.perf_counter()
+            risk = simulate_profit_risk(catalog, high, low, cov, config, risk_samples, risk_horizon)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            current = evaluate_catalog(catalog, high, low, config)
+            
+            risk_df = pd.DataFrame({
+                "Icon": [get_item_icon_url(r.output.item_name) for r in catalog.recipes],
+                "Category": [r.category for r in catalog.recipes],
+                "Item": [r.name for r in catalog.recipes],
+                "Net Profit": current["net_profit"],
+                "P5": risk["p5"],
+                "P50": risk["p50"],
+                "P95": risk["p95"],
+                "Loss %": risk["prob_loss"] * 100,
+                "Leg Corr.": hedge,
+            }).sort_values("P50", ascending=False)
+            
+            st.dataframe(
+                risk_df,
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "Icon": st.column_config.ImageColumn("Icon", width="small"),
+                    "Category": st.column_config.TextColumn("Category"),
+                    "Item": st.column_config.TextColumn("Item", width="medium"),
+                    "Net Profit": st.column_config.NumberColumn("Net Profit", format="%.0f gp"),
+                    "P5": st.column_config.NumberColumn("P5", format="%.0f gp"),
+                    "P50": st.column_config.NumberColumn("P50", format="%.0f gp"),
+                    "P95": st.column_config.NumberColumn("P95", format="%.0f gp"),
+                    "Loss %": st.column_config.ProgressColumn("Loss Chance", format="%.0f%%", min_value=0, max_value=100),
+                    "Leg Corr.": st.column_config.NumberColumn("Leg Corr.", format="%.2f", help="Correlation of input and output price moves"),
+                }
+            )
+            st.caption(f"*{risk_samples:,} samples x {len(catalog)} chains in {elapsed_ms:.0f} ms*")
+        
+        st.subheader("Co-movement")
+        comove_category = st.selectbox("Chains", ["All"] + list(all_chains.keys()), key="comove_category")
+        shown = sorted({
+            item
+            for r, recipe in enumerate(catalog.recipes)
+            if comove_category == "All" or recipe.category == comove_category
+            for item in [*catalog.input_items[catalog.input_indptr[r]:catalog.input_indptr[r + 1]], catalog.output_index[r]]
+        })
+        if comovement is not None and comovement.updates >= 2:
+            corr = comovement.correlation()[np.ix_(shown, shown)]
+            st.plotly_chart(
+                create_correlation_heatmap(corr.tolist(), [catalog.item_names[i] for i in shown]),
+                use_container_width=True
+            )
+            st.caption(f"*{comovement.updates:,} hourly returns, span {comovement.span} windows*")
+        else:
+            st.info("Co-movement needs at least three hourly windows of history.")
 
+    
+    # Tab 8: What-If
+    with tabs[7]:
+        st.header("What-If Sandbox")
+        st.caption("Override prices or tax rules; every chain recomputes against the adjusted snapshot.")
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            tax_rate_pct = st.number_input("GE Tax Rate (%)", min_value=0.0, max_value=50.0, value=GE_TAX_RATE * 100, step=0.5, key="whatif_tax_rate")
+        with col2:
+            tax_cap = st.number_input("GE Tax Cap", min_value=0, value=GE_TAX_CAP, step=100_000, key="whatif_tax_cap")
+        with col3:
+            tax_threshold = st.number_input("GE Tax Threshold", min_value=0, value=GE_TAX_THRESHOLD, step=10, key="whatif_tax_threshold")
+        
+        with st.expander("Category price shifts"):
+            shift_cols = st.columns(4)
+            category_shifts = {}
+            for i, group in enumerate(ITEM_CATEGORIES):
+                with shift_cols[i % 4]:
+                    category_shifts[group] = st.slider(f"{group} %", -50, 50, 0, key=f"whatif_shift_{group}")
+        
+        overrides_df = st.data_editor(
+            pd.DataFrame({"Item": pd.Series(dtype="str"), "Price": pd.Series(dtype="float")}),
+            num_rows="dynamic",
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "Item": st.column_config.SelectboxColumn("Item", options=sorted(catalog.item_names), required=True),
+                "Price": st.column_config.NumberColumn("Price", min_value=0, format="%d gp"),
+            },
+            key="whatif_overrides"
+        )
+        item_prices = {
+            row["Item"]: row["Price"]
+            for row in overrides_df.to_dict("records")
+            if isinstance(row.get("Item"), str) and pd.notna(row.get("Price"))
+        }
+        
+        start = time.perf_counter()
+        what_if = run_what_if(
+            catalog, high, low, config,
+            item_prices=item_prices,
+            category_shifts=category_shifts,
+            tax_overrides={
+                "ge_tax_rate": tax_rate_pct / 100,
+                "ge_tax_cap": tax_cap,
+                "ge_tax_threshold": tax_threshold,
+            }
+        )
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        
+        what_if_df = pd.DataFrame({
+            "Icon": [get_item_icon_url(r.output.item_name) for r in catalog.recipes],
+            "Category": [r.category for r in catalog.recipes],
+            "Item": [r.name for r in catalog.recipes],
+            "Net Profit": what_if["net_profit"],
+            "Change": what_if["net_profit"] - what_if["baseline_net_profit"],
+            "GP/hr": what_if["gp_per_hour"],
+            "GP/hr Change": what_if["gp_per_hour"] - what_if["baseline_gp_per_hour"],
+        }).sort_values("Net Profit", ascending=False)
+        
+        st.dataframe(
+            what_if_df,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "Icon": st.column_config.ImageColumn("Icon", width="small"),
+                "Category": st.column_config.TextColumn("Category"),
+                "Item": st.column_config.TextColumn("Item", width="medium"),
+                "Net Profit": st.column_config.NumberColumn("Net Profit", format="%.0f gp"),
+                "Change": st.column_config.NumberColumn("vs Live", format="%+.0f gp"),
+                "GP/hr": st.column_config.NumberColumn("GP/hr", format="%.0f"),
+                "GP/hr Change": st.column_config.NumberColumn("GP/hr vs Live", format="%+.0f"),
+            }
+        )
+        
+        now_profitable = int(((what_if["net_profit"] > 0) & (what_if["baseline_net_profit"] <= 0)).sum())
+        now_unprofitable = int(((what_if["net_profit"] <= 0) & (what_if["baseline_net_profit"] > 0)).sum())
+        st.caption(f"*{now_profitable} chains turn profitable, {now_unprofitable} turn unprofitable | recomputed in {elapsed_ms:.1f} ms*")
+
+    
+    # Tab 9: Session Planner
+    with tabs[8]:
+        st.header("Session Planner")
+        st.caption("Linear program: hours per chain that maximize profit under time, bankroll and GE buy limits.")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            session_hours = st.number_input("Session length (hours)", min_value=0.5, max_value=24.0, value=2.0, step=0.5, key="plan_hours")
+        with col2:
+            bankroll = st.number_input("Bankroll (gp)", min_value=0, value=10_000_000, step=1_000_000, key="plan_bankroll")
+        
+        start = time.perf_counter()
+        plan = plan_session(catalog, high, low, config, session_hours, bankroll, buy_limits)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        
+        if plan["status"] != 0:
+            st.error(f"Planner failed: {plan['message']}")
+        elif plan["total_hours"] <= 0:
+            st.warning("No profitable chains with GP/hr data under current settings.")
+        else:
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Expected Profit", format_gp(plan["total_profit"]))
+            with col2:
+                st.metric("Hours Used", f"{plan['total_hours']:.2f} / {session_hours:g}")
+            with col3:
+                st.metric("Capital Used", format_gp(plan["capital_used"]))
+            
+            scheduled = np.flatnonzero(plan["hours"])
+            st.dataframe(
+                pd.DataFrame({
+                    "Icon": [get_item_icon_url(catalog.recipes[r].output.item_name) for r in scheduled],
+                    "Category": [catalog.recipes[r].category for r in scheduled],
+                    "Item": [catalog.recipes[r].name for r in scheduled],
+                    "Hours": plan["hours"][scheduled],
+                    "Items": plan["items"][scheduled],
+                    "Profit": plan["profit"][scheduled],
+                }).sort_values("Profit", ascending=False),
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "Icon": st.column_config.ImageColumn("Icon", width="small"),
+                    "Category": st.column_config.TextColumn("Category"),
+                    "Item": st.column_config.TextColumn("Item", width="medium"),
+                    "Hours": st.column_config.NumberColumn("Hours", format="%.2f"),
+                    "Items": st.column_config.NumberColumn("Items", format="%.0f"),
+                    "Profit": st.column_config.NumberColumn("Profit", format="%.0f gp"),
+                }
+            )
+            
+            if plan["limited_items"]:
+                st.caption(f"*Buy limit reached: {', '.join(plan['limited_items'])}*")
+        
+        st.caption(f"*Solved in {elapsed_ms:.1f} ms*")
+
+
+    
+    # Tab 10: Arbitrage
+    with tabs[9]:
+        st.header("Arbitrage")
+        st.caption("Buy inputs, craft along the cheapest route, sell the output: cycles that end with more GP than they started.")
+        
+        start = time.perf_counter()
+        arbitrage_seen = st.session_state.setdefault("arbitrage_seen", {})
+        arbitrage = get_arbitrage_detector().update(
+            high, low, config, arbitrage_seen.setdefault(arbitrage_config_key(config), {})
+        )
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        
+        if arbitrage["has_cycle"]:
+            st.warning("Recipes form a value-creating loop; route costs did not converge.")
+        
+        new_items = [o["item"] for o in arbitrage["opportunities"] if o["is_new"]]
+        if new_items:
+            st.success(f"New opportunities: {', '.join(new_items)}")
+        if arbitrage["closed"]:
+            st.caption(f"*Closed since last refresh: {', '.join(arbitrage['closed'])}*")
+        
+        if arbitrage["opportunities"]:
+            opportunities = arbitrage["opportunities"]
+            st.dataframe(
+                pd.DataFrame({
+                    "Icon": [get_item_icon_url(o["item"]) for o in opportunities],
+                    "Item": [o["item"] for o in opportunities],
+                    "Route": [" → ".join(o["route"]) for o in opportunities],
+                    "Route Cost": [o["route_cost"] for o in opportunities],
+                    "Sell": [o["sell_net"] for o in opportunities],
+                    "Gain": [o["gain"] for o in opportunities],
+                    "Gain %": [o["gain_pct"] for o in opportunities],
+                    "New": [o["is_new"] for o in opportunities],
+                }),
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "Icon": st.column_config.ImageColumn("Icon", width="small"),
+                    "Item": st.column_config.TextColumn("Item", width="medium"),
+                    "Route": st.column_config.TextColumn("Route", width="large"),
+                    "Route Cost": st.column_config.NumberColumn("Route Cost", format="%.1f gp"),
+                    "Sell": st.column_config.NumberColumn("Sell (after tax)", format="%.1f gp"),
+                    "Gain": st.column_config.NumberColumn("Gain/item", format="%.1f gp"),
+                    "Gain %": st.column_config.NumberColumn("Gain %", format="%.1f%%"),
+                    "New": st.column_config.CheckboxColumn("New"),
+                }
+            )
+        else:
+            st.info("No profitable conversion cycles at current prices.")
+        
+        if arbitrage["routes"]:
+            st.subheader("Cheaper Than GE")
+            routes = arbitrage["routes"]
+            st.dataframe(
+                pd.DataFrame({
+                    "Item": [r["item"] for r in routes],
+                    "GE Price": [r["ge_price"] for r in routes],
+                    "Route Cost": [r["route_cost"] for r in routes],
+                    "Saving": [r["saving"] for r in routes],
+                    "Route": [" → ".join(r["route"]) for r in routes],
+                }),
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "GE Price": st.column_config.NumberColumn("GE Price", format="%.0f gp"),
+                    "Route Cost": st.column_config.NumberColumn("Route Cost", format="%.1f gp"),
+                    "Saving": st.column_config.NumberColumn("Saving", format="%.1f gp"),
+                    "Route": st.column_config.TextColumn("Route", width="large"),
+                }
+            )
+        
+        st.caption(f"*Scanned {len(catalog)} recipes in {elapsed_ms:.1f} ms*")
+
+
+    
+    # Tab 11: Pareto
+    with tabs[10]:
+        st.header("GP vs XP Frontier")
+        st.caption("Every chain under every bank location, plank method and equipment setup. Frontier setups can't be beaten on GP/hr, XP/hr and capital/hr at once.")
+        
+        owned_only = st.toggle("Only equipment I have", value=False, key="pareto_owned", help="Skip setups using equipment not enabled in the sidebar")
+        
+        with st.spinner("Computing frontier..."):
+            start = time.perf_counter()
+            frontier = get_pareto_frontier(high, low, config, owned_only)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+        
+        _, skills = xp_per_item_array(catalog, config)
+        front_df = pd.DataFrame({
+            "recipe": frontier["recipe"],
+            "config": frontier["config"],
+            "gear": [sum(frontier["configs"][c][key] for key in EQUIPMENT_LABELS) for c in frontier["config"]],
+            "GP/hr": frontier["gp_per_hour"],
+            "XP/hr": frontier["xp_per_hour"],
+            "Capital/hr": frontier["capital_per_hour"],
+        })[frontier["on_front"]]
+        
+        # Setups with unused equipment repeat a point; keep the one needing least gear
+        front_df = front_df.sort_values("gear").drop_duplicates(["recipe", "GP/hr", "XP/hr", "Capital/hr"])
+        front_df["Item"] = [catalog.recipes[r].name for r in front_df["recipe"]]
+        front_df["Skill"] = [skills[r] for r in front_df["recipe"]]
+        front_df["Setup"] = [describe_setup(catalog, r, frontier["configs"][c]) for r, c in zip(front_df["recipe"], front_df["config"])]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            front_df["GP/XP"] = np.where(front_df["XP/hr"] > 0, front_df["GP/hr"] / front_df["XP/hr"], np.nan)
+        
+        # Thin out dominated points so the chart stays responsive
+        dominated = np.flatnonzero(~frontier["on_front"])
+        dominated = dominated[::max(1, len(dominated) // 2000)]
+        shown = np.concatenate([front_df.index.to_numpy(), dominated])
+        st.plotly_chart(
+            create_pareto_scatter(
+                frontier["gp_per_hour"][shown].tolist(),
+                frontier["xp_per_hour"][shown].tolist(),
+                frontier["capital_per_hour"][shown].tolist(),
+                [catalog.recipes[r].name for r in frontier["recipe"][shown]],
+                frontier["on_front"][shown].tolist()
+            ),
+            use_container_width=True
+        )
+        
+        st.dataframe(
+            front_df.sort_values("GP/hr", ascending=False)[["Item", "Skill", "Setup", "GP/hr", "XP/hr", "Capital/hr", "GP/XP"]],
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "Item": st.column_config.TextColumn("Item", width="medium"),
+                "Setup": st.column_config.TextColumn("Setup", width="large"),
+                "GP/hr": st.column_config.NumberColumn("GP/hr", format="%.0f"),
+                "XP/hr": st.column_config.NumberColumn("XP/hr", format="%.0f"),
+                "Capital/hr": st.column_config.NumberColumn("Capital/hr", format="%.0f gp"),
+                "GP/XP": st.column_config.NumberColumn("GP/XP", format="%.2f", help="Negative = cost per XP"),
+            }
+        )
+        
+        st.caption(f"*{len(front_df)} frontier setups out of {len(frontier['recipe']):,} | {elapsed_ms:.0f} ms*")
+
+
+    
+    # Tab 12: Simulator
+    with tabs[11]:
+        st.header("Trip Simulator")
+        st.caption("Tick-level Monte Carlo of banking trips: per-action Smiths' Uniform saves, tick-aligned banking with random delays and partial last trips. Checks the GP/hr model's averages.")
+        
+        timed_recipes = [r for r in catalog.recipes if r.get_timing_key(config)]
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            sim_chain = st.selectbox("Chain", [r.name for r in timed_recipes], key="sim_chain")
+        with col2:
+            sim_hours = st.selectbox("Simulated hours", [1_000, 5_000, 20_000], index=1, key="sim_hours")
+        with col3:
+            sim_delay = st.number_input("Bank delay (ticks/trip)", min_value=0.0, max_value=10.0, value=1.0, step=0.5, key="sim_delay", help="Mean extra ticks lost per bank trip")
+        
+        sim_recipe = catalog.get_recipe(sim_chain)
+        sim_timing_key = sim_recipe.get_timing_key(config)
+        
+        if st.button("Run Simulation", key="sim_run", use_container_width=True):
+            with st.spinner("Simulating..."):
+                start = time.perf_counter()
+                simulation = run_trip_simulation(sim_timing_key, config, sim_hours, sim_delay)
+                elapsed_ms = (time.perf_counter() - start) * 1000
+            
+            if simulation is None:
+                st.warning("No trip model for this chain under current settings.")
+            else:
+                col1, col2, col3, col4 = st.columns(4)
+                with col1:
+                    st.metric("Analytic Items/hr", f"{simulation['analytic']:,.0f}")
+                with col2:
+                    st.metric("Simulated Mean", f"{simulation['mean']:,.0f}", delta=f"{simulation['difference_pct']:+.1f}%")
+                with col3:
+                    st.metric("Std Dev", f"{simulation['std']:,.1f}")
+                with col4:
+                    st.metric("P5 – P95", f"{simulation['p5']:,.0f} – {simulation['p95']:,.0f}")
+                
+                st.plotly_chart(
+                    create_simulation_histogram(simulation["samples"].tolist(), simulation["analytic"]),
+                    use_container_width=True
+                )
+                st.caption(f"*{sim_timing_key} | {elapsed_ms:.0f} ms*")
+
+
+    
+    # Tab 13: Locations
+    with tabs[12]:
+        st.header("Best Locations")
+        st.caption("Every chain at every bank location with the facility it needs (furnace, anvil, shipwright or sawmill), ranked by items/hr.")
+        
+        met_requirements = st.multiselect(
+            "Requirements you have",
+            location_requirements(),
+            key="met_requirements",
+            help="Locations with unmet quest or skill requirements are left out of Reachable"
+        )
+        
+        start = time.perf_counter()
+        location_search = best_locations(catalog, high, low, config, met_requirements)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        
+        location_names = location_search["locations"]
+        current_idx = location_names.index(config["bank_location"]) if config["bank_location"] in location_names else None
+        has_location = location_search["best"] >= 0
+        
+        location_df = pd.DataFrame({
+            "Icon": [get_item_icon_url(r.output.item_name) for r in catalog.recipes],
+            "Category": [r.category for r in catalog.recipes],
+            "Item": [r.name for r in catalog.recipes],
+            "Best": [location_names[i] if i >= 0 else "" for i in location_search["best"]],
+            "Best Items/hr": location_search["best_items_per_hour"],
+            "Best GP/hr": location_search["best_gp_per_hour"],
+            "Reachable": [location_names[i] if i >= 0 else "None reachable" for i in location_search["reachable"]],
+            "Reachable Items/hr": location_search["reachable_items_per_hour"],
+            "Reachable GP/hr": location_search["reachable_gp_per_hour"],
+            "Current GP/hr": location_search["gp_per_hour"][:, current_idx] if current_idx is not None else np.nan,
+        })[has_location].sort_values("Reachable GP/hr", ascending=False, na_position="last")
+        
+        st.dataframe(
+            location_df,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "Icon": st.column_config.ImageColumn("Icon", width="small"),
+                "Category": st.column_config.TextColumn("Category"),
+                "Item": st.column_config.TextColumn("Item", width="medium"),
+                "Best": st.column_config.TextColumn("Best Location"),
+                "Best Items/hr": st.column_config.NumberColumn("Items/hr", format="%.0f"),
+                "Best GP/hr": st.column_config.NumberColumn("GP/hr", format="%.0f"),
+                "Reachable": st.column_config.TextColumn("Best Reachable"),
+                "Reachable Items/hr": st.column_config.NumberColumn("Reachable Items/hr", format="%.0f"),
+                "Reachable GP/hr": st.column_config.NumberColumn("Reachable GP/hr", format="%.0f"),
+                "Current GP/hr": st.column_config.NumberColumn(f"GP/hr at {config['bank_location']}", format="%.0f", help="Blank where the selected location lacks the facility"),
+            }
+        )
+        
+        st.caption(f"*{int(has_location.sum())} chains with timing data across {len(location_names)} locations | {elapsed_ms:.1f} ms*")
+
+    
+    # Tab 14: Equipment
+    with tabs[13]:
+        st.header("Equipment Payback")
+        st.caption("GP/hr each equipment item adds on every chain with your other settings unchanged, and hours to earn back its GE price.")
+        
+        payback = equipment_payback(catalog, high, low, config, prices)
+        
+        summary_df = pd.DataFrame({
+            "Equipment": payback["names"],
+            "Owned": [bool(config.get(flag, False)) for flag in payback["flags"]],
+            "GE Price": payback["prices"],
+            "Best Chain": [catalog.recipes[r].name if r >= 0 else "" for r in payback["best_recipe"]],
+            "GP/hr Gain": payback["best_delta"],
+            "Payback": [
+                payback["payback_hours"][r, f] if r >= 0 else np.nan
+                for f, r in enumerate(payback["best_recipe"])
+            ],
+        })
+        
+        st.dataframe(
+            summary_df,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "Equipment": st.column_config.TextColumn("Equipment"),
+                "Owned": st.column_config.CheckboxColumn("Owned"),
+                "GE Price": st.column_config.NumberColumn("GE Price", format="%.0f", help="Blank for untradeable items"),
+                "Best Chain": st.column_config.TextColumn("Best Chain", width="medium"),
+                "GP/hr Gain": st.column_config.NumberColumn("GP/hr Gain", format="%.0f"),
+                "Payback": st.column_config.NumberColumn("Payback (hrs)", format="%.2f", help="GE price / GP/hr gain on the best chain"),
+            }
+        )
+        
+        st.subheader("Gain by Chain")
+        delta = payback["gp_per_hour_delta"]
+        affected = np.nan_to_num(np.abs(delta)).max(axis=1) > 0
+        chain_df = pd.DataFrame(delta, columns=list(payback["names"]))
+        chain_df.insert(0, "Item", [r.name for r in catalog.recipes])
+        chain_df.insert(0, "Category", [r.category for r in catalog.recipes])
+        chain_df = chain_df[affected].sort_values(list(payback["names"]), ascending=False)
+        
+        st.dataframe(
+            chain_df,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                name: st.column_config.NumberColumn(name, format="%.0f") for name in payback["names"]
+            }
+        )
+        
+        st.caption(f"*{int(affected.sum())} chains affected by at least one item*")
+    
+    # Tab 15: Production Lines
+    with tabs[14]:
+        st.header("Production Lines")
+        st.caption("Crafting every stage yourself (e.g. logs → planks → hull parts → large hull parts) vs buying the intermediates and crafting only the last stage.")
+        
+        start = time.perf_counter()
+        lines = production_lines(catalog, high, low, config)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        
+        multi_stage = lines["n_stages"] > 1
+        upstream_first = np.argsort(lines["n_stages"], kind="stable")
+        
+        line_df = pd.DataFrame({
+            "Category": [r.category for r in catalog.recipes],
+            "Item": [r.name for r in catalog.recipes],
+            "Line": [describe_line(catalog, lines["stages"], upstream_first, r) if multi_stage[r] else "" for r in range(len(catalog))],
+            "Line Items/hr": lines["line_items_per_hour"],
+            "Line GP/hr": lines["line_gp_per_hour"],
+            "Buy GP/hr": lines["buy_gp_per_hour"],
+            "Best": np.where(lines["line_gp_per_hour"] > lines["buy_gp_per_hour"], "Craft all", "Buy intermediates"),
+            "Bottleneck": [catalog.recipes[b].name if b >= 0 else "" for b in lines["bottleneck"]],
+            "Bottleneck Share": lines["bottleneck_share"] * 100,
+        })[multi_stage & np.isfinite(lines["line_items_per_hour"])].sort_values("Line GP/hr", ascending=False)
+        
+        st.dataframe(
+            line_df,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "Category": st.column_config.TextColumn("Category"),
+                "Item": st.column_config.TextColumn("Item", width="medium"),
+                "Line": st.column_config.TextColumn("Stages", width="large"),
+                "Line Items/hr": st.column_config.NumberColumn("Line Items/hr", format="%.0f"),
+                "Line GP/hr": st.column_config.NumberColumn("Line GP/hr", format="%.0f", help="Crafting every stage, buying only raw materials"),
+                "Buy GP/hr": st.column_config.NumberColumn("Buy GP/hr", format="%.0f", help="Buying intermediates, crafting the last stage only"),
+                "Best": st.column_config.TextColumn("Best"),
+                "Bottleneck": st.column_config.TextColumn("Bottleneck Stage"),
+                "Bottleneck Share": st.column_config.ProgressColumn("Time Share", format="%.0f%%", min_value=0, max_value=100),
+            }
+        )
+        
+        st.caption(f"*{len(line_df)} multi-stage lines at {config['bank_location']} | {elapsed_ms:.1f} ms*")
+    
+    # Tab 16: Backtest
+    with tabs[15]:
+        st.header("Backtest")
+        st.caption("Every chain replayed at stored historical prices. Windows the app fetches are kept on disk; backfill to fill the rest of the period.")
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            bt_timestep = st.selectbox("History", ["1h", "5m"], key="bt_timestep")
+        with col2:
+            bt_days = st.selectbox("Period", [1, 7, 30], index=1, format_func=lambda d: f"Last {d} day{'s' if d > 1 else ''}", key="bt_days")
+        with col3:
+            bt_metric = st.selectbox("Metric", ["Profit per item", "GP/hr", "ROI %"], key="bt_metric")
+        
+        store = get_price_store(conn, bt_timestep)
+        if store is None:
+            st.info("Price history store unavailable (read-only filesystem).")
+        else:
+            step = TIMESTEP_SECONDS[bt_timestep]
+            now = int(time.time())
+            period_start = now - bt_days * 86400
+            store.refresh()
+            
+            # Gap up to now is appended; the rest of the period goes before the first stored window
+            first, last = store.first_timestamp, store.last_timestamp
+            if last is None or last < period_start:
+                newer, older = bt_days * 86400 // step, 0
+            else:
+                newer = max(0, (now - last) // step - 1)
+                older = max(0, -(-(first - period_start) // step))
+            newer = min(newer, MAX_BACKFILL_WINDOWS)
+            older = min(older, MAX_BACKFILL_WINDOWS - newer)
+            if newer + older > 0 and st.button(f"Backfill {newer + older} windows from the API", key="bt_backfill"):
+                with st.spinner("Fetching price history..."):
+                    if newer:
+                        store.append(fetch_price_history(conn, bt_timestep, newer))
+                    if older:
+                        store.prepend(fetch_price_history(conn, bt_timestep, older, end=first))
+                st.rerun()
+            
+            history = store.slice(period_start, None, item_ids=resolve_item_ids(catalog, id_lookup))
+            if len(history["timestamps"]) < 2:
+                st.info("Not enough stored windows in this period yet.")
+            else:
+                start = time.perf_counter()
+                replay = backtest(catalog, history, config)
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                
+                summary_df = pd.DataFrame({
+                    "Category": [r.category for r in catalog.recipes],
+                    "Item": [r.name for r in catalog.recipes],
+                    "Profitable": replay["profitable_fraction"] * 100,
+                    "Mean Profit": replay["mean_profit_per_item"],
+                    "Median Profit": replay["median_profit_per_item"],
+                    "Mean GP/hr": replay["mean_gp_per_hour"],
+                    "Windows": replay["valid"].sum(axis=0),
+                }).sort_values("Mean Profit", ascending=False, na_position="last")
+                
+                metric_key = {"Profit per item": "profit_per_item", "GP/hr": "gp_per_hour", "ROI %": "roi"}[bt_metric]
+                chart_chains = st.multiselect(
+                    "Chains",
+                    [r.name for r in catalog.recipes],
+                    default=list(summary_df["Item"].head(3)),
+                    key="bt_chains"
+                )
+                if chart_chains:
+                    series = {name: replay[metric_key][:, catalog.recipe_index(name)] for name in chart_chains}
+                    st.plotly_chart(create_profit_over_time(replay["timestamps"], series, bt_metric), use_container_width=True)
+                
+                st.dataframe(
+                    summary_df,
+                    use_container_width=True,
+                    hide_index=True,
+                    column_config={
+                        "Category": st.column_config.TextColumn("Category"),
+                        "Item": st.column_config.TextColumn("Item", width="medium"),
+                        "Profitable": st.column_config.ProgressColumn("Profitable", format="%.0f%%", min_value=0, max_value=100, help="Share of windows with positive profit"),
+                        "Mean Profit": st.column_config.NumberColumn("Mean Profit/Item", format="%.0f"),
+                        "Median Profit": st.column_config.NumberColumn("Median Profit/Item", format="%.0f"),
+                        "Mean GP/hr": st.column_config.NumberColumn("Mean GP/hr", format="%.0f"),
+                        "Windows": st.column_config.NumberColumn("Windows", format="%d"),
+                    }
+                )
+                
+                st.caption(f"*{len(replay['timestamps'])} {bt_timestep} windows x {len(catalog)} chains | {elapsed_ms:.1f} ms*")
+                
+                st.subheader("Best Setup per Chain")
+                st.caption("Replays the period under every plank method, bank location, stamina and equipment combination across all CPU cores.")
+                sweep_cancel = st.session_state.setdefault("bt_sweep_cancel", threading.Event())
+                sweep_key = (bt_timestep, bt_days, repr(sorted(config.items())))
+                swept = st.button("Sweep all setups", key="bt_sweep")
+                if swept:
+                    sweep_cancel.clear()
+                    st.button("Stop sweep", key="bt_sweep_stop", on_click=sweep_cancel.set, help="Keeps the windows swept so far")
+                    progress = st.progress(0.0, text="Sweeping...")
+                    start = time.perf_counter()
+                    st.session_state.pop("bt_sweep_result", None)
+                    sweeps = iter_sweep(catalog, history, config, cancel=sweep_cancel)
+                    try:
+                        for sweep in sweeps:
+                            # Stop reruns the script, so partial results are shown from session state
+                            st.session_state["bt_sweep_result"] = (sweep_key, sweep, (time.perf_counter() - start) * 1000)
+                            progress.progress(sweep["windows_done"] / sweep["windows_total"], text=f"{sweep['windows_done']:,} / {sweep['windows_total']:,} windows")
+                    finally:
+                        # A rerun interrupting the loop still stops the worker pool
+                        sweeps.close()
+                
+                saved_key, sweep, elapsed_ms = st.session_state.get("bt_sweep_result", (None, None, 0.0))
+                if saved_key != sweep_key:
+                    if swept:
+                        st.info("Sweep stopped before any windows finished.")
+                else:
+                    best = sweep["best_config"]
+                    has_best = best >= 0
+                    columns = np.arange(len(catalog))
+                    sweep_df = pd.DataFrame({
+                        "Category": [r.category for r in catalog.recipes],
+                        "Item": [r.name for r in catalog.recipes],
+                        "Setup": [describe_setup(catalog, r, sweep["configs"][c]) if c >= 0 else "" for r, c in enumerate(best)],
+                        "Mean GP/hr": sweep["mean_gp_per_hour"][np.maximum(best, 0), columns],
+                        "Profitable": sweep["profitable_fraction"][np.maximum(best, 0), columns] * 100,
+                        "Current GP/hr": replay["mean_gp_per_hour"],
+                    })[has_best].sort_values("Mean GP/hr", ascending=False)
+                    
+                    st.dataframe(
+                        sweep_df,
+                        use_container_width=True,
+                        hide_index=True,
+                        column_config={
+                            "Category": st.column_config.TextColumn("Category"),
+                            "Item": st.column_config.TextColumn("Item", width="medium"),
+                            "Setup": st.column_config.TextColumn("Best Setup", width="large"),
+                            "Mean GP/hr": st.column_config.NumberColumn("Mean GP/hr", format="%.0f"),
+                            "Profitable": st.column_config.ProgressColumn("Profitable", format="%.0f%%", min_value=0, max_value=100),
+                            "Current GP/hr": st.column_config.NumberColumn("Your Setup GP/hr", format="%.0f"),
+                        }
+                    )
+                    stopped = "" if sweep["complete"] else f" | stopped after {sweep['windows_done']:,} windows"
+                    st.caption(f"*{len(sweep['configs']):,} setups x {sweep['windows_total']:,} windows | {elapsed_ms:.0f} ms{stopped}*")
 
 if __name__ == "__main__":
     main()
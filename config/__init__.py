@@ -7,6 +7,12 @@ from .settings import (
     CACHE_TTL_PRICES,
     CACHE_TTL_MAPPING,
     CACHE_TTL_CHAINS,
+    CACHE_TTL_HISTORY,
+    HISTORY_STORE_DIR,
+    MAX_BACKFILL_WINDOWS,
+    PROFIT_BAND_WINDOWS,
+    FORECAST_HORIZONS,
+    MAX_QUANTITY,
     DEFAULT_CONFIG,
     URL_PARAMS,
 )
@@ -18,6 +24,12 @@ __all__ = [
     'CACHE_TTL_PRICES',
     'CACHE_TTL_MAPPING',
     'CACHE_TTL_CHAINS',
+    'CACHE_TTL_HISTORY',
+    'HISTORY_STORE_DIR',
+    'MAX_BACKFILL_WINDOWS',
+    'PROFIT_BAND_WINDOWS',
+    'FORECAST_HORIZONS',
+    'MAX_QUANTITY',
     'DEFAULT_CONFIG',
     'URL_PARAMS',
 ]
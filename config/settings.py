@@ -1,5 +1,7 @@
 """Application settings."""
 
+import os
+
 APP_VERSION = "4.6"
 APP_TITLE = "OSRS Sailing Materials Tracker"
 APP_ICON = "https://oldschool.runescape.wiki/images/Sailing_icon.png"
@@ -8,6 +10,22 @@ APP_ICON = "https://oldschool.runescape.wiki/images/Sailing_icon.png"
 CACHE_TTL_PRICES = 60
 CACHE_TTL_MAPPING = 300
 CACHE_TTL_CHAINS = 3600
+CACHE_TTL_HISTORY = 300
+
+# Price history windows are appended here, one store per timestep
+HISTORY_STORE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "history")
+
+# Most windows one backfill may request (one API call each)
+MAX_BACKFILL_WINDOWS = 720
+
+# Windows offered for profit percentile bands (seconds)
+PROFIT_BAND_WINDOWS = {"24h": 86_400, "7d": 7 * 86_400, "30d": 30 * 86_400}
+
+# Horizons offered for projected profit (seconds)
+FORECAST_HORIZONS = {"1h": 3_600, "4h": 4 * 3_600}
+
+# Upper bound for the batch quantity input
+MAX_QUANTITY = 100_000
 
 DEFAULT_CONFIG = {
     "quantity": 1,
@@ -15,7 +15,9 @@ from .items import (
     AMMO_MOULDS,
     MISC_ITEMS,
     RUNE_IDS,
+    EQUIPMENT_ITEMS,
     ALL_ITEMS,
+    ITEM_CATEGORIES,
 )
 
 from .costs import (
@@ -29,8 +31,11 @@ from .costs import (
 
 from .timings import (
     ActivityTiming,
+    TripInput,
     ACTIVITY_TIMINGS,
     SMITHING_OUTFIT_TICK_SAVE_CHANCE,
+    TICK_SECONDS,
+    XP_PER_MATERIAL,
 )
 
 from .locations import (
@@ -38,13 +43,22 @@ from .locations import (
     BANK_LOCATIONS,
 )
 
+from .calibration import (
+    CALIBRATION_PATH,
+    apply_calibration,
+)
+
+TIMINGS_CALIBRATED = apply_calibration()
+
 __all__ = [
     'ALL_LOGS', 'ALL_PLANKS', 'HULL_PARTS', 'LARGE_HULL_PARTS',
     'HULL_REPAIR_KITS', 'ALL_ORES', 'ALL_BARS', 'KEEL_PARTS',
     'LARGE_KEEL_PARTS', 'ALL_NAILS', 'ALL_CANNONBALLS',
-    'AMMO_MOULDS', 'MISC_ITEMS', 'RUNE_IDS', 'ALL_ITEMS',
+    'AMMO_MOULDS', 'MISC_ITEMS', 'RUNE_IDS', 'EQUIPMENT_ITEMS', 'ALL_ITEMS', 'ITEM_CATEGORIES',
     'SAWMILL_COSTS', 'PLANK_MAKE_COSTS', 'PLANK_SACK_CAPACITY',
     'GE_TAX_RATE', 'GE_TAX_CAP', 'GE_TAX_THRESHOLD',
-    'ActivityTiming', 'ACTIVITY_TIMINGS', 'SMITHING_OUTFIT_TICK_SAVE_CHANCE',
+    'ActivityTiming', 'TripInput', 'ACTIVITY_TIMINGS', 'SMITHING_OUTFIT_TICK_SAVE_CHANCE',
+    'TICK_SECONDS', 'XP_PER_MATERIAL',
     'BankLocation', 'BANK_LOCATIONS',
+    'CALIBRATION_PATH', 'apply_calibration', 'TIMINGS_CALIBRATED',
 ]
@@ -0,0 +1,35 @@
+"""
+Calibrated timings written by services.calibration.
+
+When the file exists its values replace the hard-coded ticks_per_action,
+bank_time and travel_time. Keys not in ACTIVITY_TIMINGS or
+BANK_LOCATIONS are ignored.
+"""
+
+import json
+import os
+from dataclasses import replace
+
+from .locations import BANK_LOCATIONS
+from .timings import ACTIVITY_TIMINGS
+
+CALIBRATION_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "calibrated_timings.json")
+
+
+def apply_calibration(path: str = CALIBRATION_PATH) -> bool:
+    """Update ACTIVITY_TIMINGS and BANK_LOCATIONS in place. False if no file."""
+    if not os.path.exists(path):
+        return False
+    with open(path, "r", encoding="utf-8") as f:
+        calibration = json.load(f)
+
+    for key, fitted in calibration.get("activities", {}).items():
+        if key in ACTIVITY_TIMINGS and "ticks_per_action" in fitted:
+            ACTIVITY_TIMINGS[key] = replace(ACTIVITY_TIMINGS[key], ticks_per_action=round(fitted["ticks_per_action"]))
+
+    for name, fitted in calibration.get("locations", {}).items():
+        if name in BANK_LOCATIONS:
+            BANK_LOCATIONS[name] = replace(BANK_LOCATIONS[name], **{
+                field: float(fitted[field]) for field in ("bank_time", "travel_time") if field in fitted
+            })
+    return True
@@ -152,6 +152,16 @@ RUNE_IDS = {
     "Earth rune": 557,
 }
 
+# GP/hr equipment toggles: config flag -> (display name, GE item ID or None
+# if untradeable / not an item)
+EQUIPMENT_ITEMS = {
+    "has_imcando_hammer": ("Imcando hammer", None),
+    "has_amys_saw": ("Amy's saw", None),
+    "has_plank_sack": ("Plank sack", 25580),
+    "has_smithing_outfit": ("Smiths' uniform", None),
+    "ancient_furnace": ("Ancient Furnace", None),
+}
+
 ALL_ITEMS = {
     **ALL_LOGS, 
     **ALL_PLANKS, 
@@ -167,3 +177,19 @@ ALL_ITEMS = {
     **AMMO_MOULDS,
     **MISC_ITEMS
 }
+
+# Item groups for category-wide price adjustments
+ITEM_CATEGORIES = {
+    "Logs": ALL_LOGS,
+    "Planks": ALL_PLANKS,
+    "Hull Parts": HULL_PARTS,
+    "Large Hull Parts": LARGE_HULL_PARTS,
+    "Hull Repair Kits": HULL_REPAIR_KITS,
+    "Bars": ALL_BARS,
+    "Keel Parts": KEEL_PARTS,
+    "Large Keel Parts": LARGE_KEEL_PARTS,
+    "Nails": ALL_NAILS,
+    "Cannonballs": ALL_CANNONBALLS,
+    "Runes": {item_id: name for name, item_id in RUNE_IDS.items()},
+    "Misc": MISC_ITEMS,
+}
@@ -15,10 +15,20 @@ class BankLocation:
     has_sawmill: bool
     requirements: str
     stamina_dependent: bool
+    is_preset: bool = False
     
     @property
     def total_overhead(self) -> float:
         return self.bank_time + self.travel_time
+    
+    @property
+    def is_unrestricted(self) -> bool:
+        """No quest or skill needed (presets describe setups, not places)."""
+        return self.is_preset or self.requirements.startswith("None")
+    
+    def has_facility(self, facility: str) -> bool:
+        """True if the location has the facility ("" needs none)."""
+        return not facility or getattr(self, f"has_{facility}", False)
 
 
 BANK_LOCATIONS = {
@@ -139,7 +149,8 @@ BANK_LOCATIONS = {
         has_shipwright=True,
         has_sawmill=True,
         requirements="Best available setup",
-        stamina_dependent=False
+        stamina_dependent=False,
+        is_preset=True
     ),
     
     "Medium (Typical)": BankLocation(
@@ -151,7 +162,8 @@ BANK_LOCATIONS = {
         has_shipwright=True,
         has_sawmill=True,
         requirements="Typical efficient banking",
-        stamina_dependent=False
+        stamina_dependent=False,
+        is_preset=True
     ),
     
     "Slow (Suboptimal)": BankLocation(
@@ -163,6 +175,7 @@ BANK_LOCATIONS = {
         has_shipwright=True,
         has_sawmill=True,
         requirements="Suboptimal setup",
-        stamina_dependent=True
+        stamina_dependent=True,
+        is_preset=True
     ),
 }
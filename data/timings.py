@@ -7,9 +7,22 @@ Sources:
 - Smithing: https://oldschool.runescape.wiki/w/Smithing
 - Cannonballs: https://oldschool.runescape.wiki/w/Cannonball
 - Plank Make: https://oldschool.runescape.wiki/w/Plank_Make
+
+XP values are approximate: bars use standard Smithing XP per bar and
+planks standard Construction XP per plank. Repair kit timings are
+estimates.
 """
 
 from dataclasses import dataclass
+from typing import Tuple
+
+
+@dataclass(frozen=True)
+class TripInput:
+    """One input of a multi-input activity, per action."""
+    quantity: int
+    stackable: bool = False  # One inventory slot whatever the amount
+    sackable: bool = False  # Can go in the plank sack
 
 
 @dataclass
@@ -24,12 +37,37 @@ class ActivityTiming:
     activity_name: str
     is_smithing: bool = False
     uses_planks: bool = False
+    skill: str = ""
+    xp_per_action: float = 0.0
+    facility: str = ""  # BankLocation has_<facility> needed nearby
+    trip_inputs: Tuple[TripInput, ...] = ()  # Multi-input recipes only
     notes: str = ""
 
 
+TICK_SECONDS = 0.6
+
 # Smiths' Uniform: 15% chance to save 1 tick
 SMITHING_OUTFIT_TICK_SAVE_CHANCE = 0.15
 
+# XP per material consumed, keyed by material. Added to the activity's
+# flat xp_per_action; materials not listed give no material XP.
+XP_PER_MATERIAL = {
+    "Bronze bar": 12.5,
+    "Iron bar": 25.0,
+    "Steel bar": 37.5,
+    "Mithril bar": 50.0,
+    "Adamantite bar": 62.5,
+    "Runite bar": 75.0,
+    "Dragon metal sheet": 100.0,
+    "Plank": 29.0,
+    "Oak plank": 60.0,
+    "Teak plank": 90.0,
+    "Mahogany plank": 140.0,
+    "Camphor plank": 170.0,
+    "Ironwood plank": 200.0,
+    "Rosewood plank": 240.0,
+}
+
 ACTIVITY_TIMINGS = {
     "Cannonballs_Single": ActivityTiming(
         ticks_per_action=9,
@@ -40,6 +78,8 @@ ACTIVITY_TIMINGS = {
         other_tool_slots=1,
         activity_name="Cannonball Smelting (Single)",
         is_smithing=True,
+        skill="Smithing",
+        facility="furnace",
         notes="1 bar → 4 cannonballs"
     ),
     
@@ -52,6 +92,8 @@ ACTIVITY_TIMINGS = {
         other_tool_slots=1,
         activity_name="Cannonball Smelting (Double)",
         is_smithing=True,
+        skill="Smithing",
+        facility="furnace",
         notes="2 bars → 8 cannonballs"
     ),
     
@@ -64,6 +106,8 @@ ACTIVITY_TIMINGS = {
         other_tool_slots=0,
         activity_name="Keel Parts Smithing",
         is_smithing=True,
+        skill="Smithing",
+        facility="anvil",
         notes="5 bars → 1 part"
     ),
     
@@ -76,6 +120,8 @@ ACTIVITY_TIMINGS = {
         other_tool_slots=0,
         activity_name="Dragon Keel Smithing",
         is_smithing=True,
+        skill="Smithing",
+        facility="anvil",
         notes="2 sheets → 1 part. Requires 92 Smithing."
     ),
     
@@ -88,6 +134,8 @@ ACTIVITY_TIMINGS = {
         other_tool_slots=0,
         activity_name="Large Keel Assembly",
         is_smithing=True,
+        skill="Smithing",
+        facility="anvil",
         notes="5 parts → 1 large"
     ),
     
@@ -100,6 +148,8 @@ ACTIVITY_TIMINGS = {
         other_tool_slots=0,
         activity_name="Large Dragon Keel Assembly",
         is_smithing=True,
+        skill="Smithing",
+        facility="anvil",
         notes="2 dragon parts → 1 large"
     ),
     
@@ -113,6 +163,8 @@ ACTIVITY_TIMINGS = {
         activity_name="Hull Parts Crafting",
         is_smithing=False,
         uses_planks=True,
+        skill="Construction",
+        facility="shipwright",
         notes="5 planks → 1 part"
     ),
     
@@ -125,9 +177,51 @@ ACTIVITY_TIMINGS = {
         other_tool_slots=0,
         activity_name="Large Hull Assembly",
         is_smithing=False,
+        skill="Construction",
+        facility="shipwright",
         notes="5 parts → 1 large"
     ),
     
+    "Hull Repair Kits": ActivityTiming(
+        ticks_per_action=4,
+        items_per_action=2,
+        materials_per_action=2,
+        needs_hammer=True,
+        needs_saw=True,
+        other_tool_slots=0,
+        activity_name="Repair Kit Crafting",
+        is_smithing=False,
+        uses_planks=True,
+        skill="Construction",
+        facility="shipwright",
+        trip_inputs=(
+            TripInput(2, sackable=True),
+            TripInput(10, stackable=True),
+            TripInput(5),
+        ),
+        notes="2 planks + 10 nails + 5 swamp paste → 2 kits"
+    ),
+    
+    "Hull Repair Kits (Single Plank)": ActivityTiming(
+        ticks_per_action=4,
+        items_per_action=3,
+        materials_per_action=1,
+        needs_hammer=True,
+        needs_saw=True,
+        other_tool_slots=0,
+        activity_name="Repair Kit Crafting",
+        is_smithing=False,
+        uses_planks=True,
+        skill="Construction",
+        facility="shipwright",
+        trip_inputs=(
+            TripInput(1, sackable=True),
+            TripInput(10, stackable=True),
+            TripInput(5),
+        ),
+        notes="1 plank + nails + 5 swamp paste → 3 kits (ironwood, rosewood)"
+    ),
+    
     "Nails": ActivityTiming(
         ticks_per_action=4,
         items_per_action=15,
@@ -137,6 +231,8 @@ ACTIVITY_TIMINGS = {
         other_tool_slots=0,
         activity_name="Nail Smithing",
         is_smithing=True,
+        skill="Smithing",
+        facility="anvil",
         notes="1 bar → 15 nails"
     ),
     
@@ -149,6 +245,7 @@ ACTIVITY_TIMINGS = {
         other_tool_slots=0,
         activity_name="Sawmill Conversion",
         is_smithing=False,
+        facility="sawmill",
         notes="Travel-dominated. Uses coin pouch."
     ),
     
@@ -161,6 +258,8 @@ ACTIVITY_TIMINGS = {
         other_tool_slots=3,  # Rune slots (2 with Earth staff)
         activity_name="Plank Make Spell",
         is_smithing=False,
+        skill="Magic",
+        xp_per_action=90.0,
         notes="Earth staff reduces rune slots."
     ),
 }
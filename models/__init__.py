@@ -2,9 +2,18 @@
 
 from .dataclasses import ChainStep, ProcessingChain
 from .chains import generate_all_chains
+from .graph import ChainGraph, build_chain_graph
+from .catalog import CatalogError, CompiledCatalog, Recipe, RecipeItem, load_catalog
 
 __all__ = [
     'ChainStep',
     'ProcessingChain',
     'generate_all_chains',
+    'ChainGraph',
+    'build_chain_graph',
+    'CatalogError',
+    'CompiledCatalog',
+    'Recipe',
+    'RecipeItem',
+    'load_catalog',
 ]
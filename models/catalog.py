@@ -0,0 +1,320 @@
+"""
+Declarative recipe catalog.
+
+Recipes live in data/chains.json. The catalog is validated, compiled once
+into an immutable indexed structure and cached as a pickle in __pycache__
+next to the source file, keyed by a hash of the source and of the data
+modules (timings, item ids) it is validated against.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "chains.json")
+CATALOG_VERSION = 1
+
+PROCESSING_METHODS = ("Sawmill", "Plank Make", "Smithing", "Dragon Forge")
+
+
+class CatalogError(ValueError):
+    """Raised when the recipe catalog fails schema validation."""
+
+
+@dataclass(frozen=True)
+class RecipeItem:
+    """An item and quantity in a recipe."""
+    item_id: Optional[int]
+    item_name: str
+    quantity: float
+
+
+@dataclass(frozen=True)
+class Recipe:
+    """One recipe: inputs -> output."""
+    name: str
+    category: str
+    inputs: Tuple[RecipeItem, ...]
+    output: RecipeItem
+    processing_method: Optional[str] = None
+    # Plain key, or (plank_method, key) pairs when the activity depends on it
+    timing_key: Union[None, str, Tuple[Tuple[str, str], ...]] = None
+
+    def get_timing_key(self, config: Dict) -> Optional[str]:
+        """Resolve the ActivityTiming key for the given settings."""
+        if self.timing_key is None or isinstance(self.timing_key, str):
+            return self.timing_key
+        return dict(self.timing_key).get(config.get("plank_method", "Sawmill"))
+
+
+@dataclass(frozen=True, eq=False)
+class CompiledCatalog:
+    """
+    Immutable, indexed recipe catalog.
+
+    Items are indexed once. Recipe inputs are stored in CSR form: recipe r
+    consumes input_qty[k] of item input_items[k] for k in
+    input_indptr[r]:input_indptr[r + 1], and yields output_qty[r] units of
+    item output_index[r]. Arrays are read-only.
+    """
+    source_hash: str
+    categories: Tuple[str, ...]
+    recipes: Tuple[Recipe, ...]
+    item_ids: Tuple[Optional[int], ...]
+    item_names: Tuple[str, ...]
+    input_indptr: np.ndarray
+    input_items: np.ndarray
+    input_qty: np.ndarray
+    output_index: np.ndarray
+    output_qty: np.ndarray
+    _by_name: Dict[str, int]
+    _by_category: Dict[str, Tuple[int, ...]]
+    _item_index: Dict[str, int]
+
+    def __len__(self) -> int:
+        return len(self.recipes)
+
+    def recipe_index(self, name: str) -> Optional[int]:
+        return self._by_name.get(name)
+
+    def get_recipe(self, name: str) -> Optional[Recipe]:
+        idx = self._by_name.get(name)
+        return self.recipes[idx] if idx is not None else None
+
+    def category_indices(self, category: str) -> Tuple[int, ...]:
+        return self._by_category.get(category, ())
+
+    def item_index(self, item_name: str) -> Optional[int]:
+        return self._item_index.get(item_name)
+
+    @property
+    def input_rows(self) -> np.ndarray:
+        """Recipe index of each CSR input entry."""
+        return np.repeat(np.arange(len(self.recipes)), np.diff(self.input_indptr))
+
+    def _freeze(self) -> None:
+        for arr in (self.input_indptr, self.input_items, self.input_qty, self.output_index, self.output_qty):
+            arr.setflags(write=False)
+
+
+def _check_item(value, where: str, errors: List[str]) -> None:
+    if not isinstance(value, dict):
+        errors.append(f"{where}: expected object")
+        return
+    if not isinstance(value.get("item"), str) or not value["item"]:
+        errors.append(f"{where}.item: expected non-empty string")
+    item_id = value.get("item_id")
+    if item_id is not None and (not isinstance(item_id, int) or isinstance(item_id, bool) or item_id <= 0):
+        errors.append(f"{where}.item_id: expected positive integer or null")
+    qty = value.get("quantity")
+    if not isinstance(qty, (int, float)) or isinstance(qty, bool) or qty <= 0:
+        errors.append(f"{where}.quantity: expected positive number")
+    unknown = set(value) - {"item", "item_id", "quantity"}
+    if unknown:
+        errors.append(f"{where}: unknown keys {sorted(unknown)}")
+
+
+def validate_catalog(raw: Dict, timing_keys=None) -> List[str]:
+    """Return a list of schema errors (empty if valid)."""
+    errors = []
+    if not isinstance(raw, dict):
+        return ["catalog: expected object"]
+    if raw.get("version") != CATALOG_VERSION:
+        errors.append(f"version: expected {CATALOG_VERSION}")
+
+    categories = raw.get("categories")
+    if not isinstance(categories, list) or not all(isinstance(c, str) for c in categories):
+        errors.append("categories: expected list of strings")
+        categories = []
+
+    recipes = raw.get("recipes")
+    if not isinstance(recipes, list):
+        return errors + ["recipes: expected list"]
+
+    seen = set()
+    for i, recipe in enumerate(recipes):
+        where = f"recipes[{i}]"
+        if not isinstance(recipe, dict):
+            errors.append(f"{where}: expected object")
+            continue
+        name = recipe.get("name")
+        if not isinstance(name, str) or not name:
+            errors.append(f"{where}.name: expected non-empty string")
+        elif name in seen:
+            errors.append(f"{where}.name: duplicate recipe '{name}'")
+        else:
+            seen.add(name)
+            where = f"recipes[{i}] ({name})"
+
+        if recipe.get("category") not in categories:
+            errors.append(f"{where}.category: not in categories")
+
+        inputs = recipe.get("inputs")
+        if not isinstance(inputs, list) or not inputs:
+            errors.append(f"{where}.inputs: expected non-empty list")
+        else:
+            for j, item in enumerate(inputs):
+                _check_item(item, f"{where}.inputs[{j}]", errors)
+        _check_item(recipe.get("output"), f"{where}.output", errors)
+
+        method = recipe.get("processing_method")
+        if method is not None and method not in PROCESSING_METHODS:
+            errors.append(f"{where}.processing_method: unknown method '{method}'")
+
+        timing_key = recipe.get("timing_key")
+        if isinstance(timing_key, dict):
+            keys = list(timing_key.values())
+        elif timing_key is None or isinstance(timing_key, str):
+            keys = [timing_key] if timing_key else []
+        else:
+            errors.append(f"{where}.timing_key: expected string, object or null")
+            keys = []
+        for key in keys:
+            if not isinstance(key, str) or (timing_keys is not None and key not in timing_keys):
+                errors.append(f"{where}.timing_key: unknown activity '{key}'")
+
+        unknown = set(recipe) - {"name", "category", "inputs", "output", "processing_method", "timing_key"}
+        if unknown:
+            errors.append(f"{where}: unknown keys {sorted(unknown)}")
+
+    return errors
+
+
+def _to_item(value: Dict) -> RecipeItem:
+    return RecipeItem(value.get("item_id"), value["item"], float(value["quantity"]))
+
+
+def compile_catalog(raw: Dict, source_hash: str = "") -> CompiledCatalog:
+    """Validate and compile a raw catalog dict. Raises CatalogError."""
+    try:
+        from ..data import ACTIVITY_TIMINGS, RUNE_IDS
+    except ImportError:
+        from data import ACTIVITY_TIMINGS, RUNE_IDS
+
+    errors = validate_catalog(raw, ACTIVITY_TIMINGS)
+    if errors:
+        raise CatalogError("Invalid recipe catalog:\n" + "\n".join(errors))
+
+    recipes = []
+    for entry in raw["recipes"]:
+        timing_key = entry.get("timing_key")
+        if isinstance(timing_key, dict):
+            timing_key = tuple(sorted(timing_key.items()))
+        recipes.append(Recipe(
+            name=entry["name"],
+            category=entry["category"],
+            inputs=tuple(_to_item(i) for i in entry["inputs"]),
+            output=_to_item(entry["output"]),
+            processing_method=entry.get("processing_method"),
+            timing_key=timing_key,
+        ))
+
+    item_ids: List[Optional[int]] = []
+    item_names: List[str] = []
+    item_index: Dict[str, int] = {}
+
+    def index_of(item_id: Optional[int], item_name: str) -> int:
+        if item_name not in item_index:
+            item_index[item_name] = len(item_names)
+            item_ids.append(item_id)
+            item_names.append(item_name)
+        return item_index[item_name]
+
+    indptr = [0]
+    cols, qtys = [], []
+    output_index = np.empty(len(recipes), dtype=np.intp)
+    output_qty = np.empty(len(recipes))
+    for r, recipe in enumerate(recipes):
+        for item in recipe.inputs:
+            cols.append(index_of(item.item_id, item.item_name))
+            qtys.append(item.quantity)
+        indptr.append(len(cols))
+        output_index[r] = index_of(recipe.output.item_id, recipe.output.item_name)
+        output_qty[r] = recipe.output.quantity
+
+    # Processing runes are priced alongside recipe items
+    for rune_name, rune_id in RUNE_IDS.items():
+        index_of(rune_id, rune_name)
+
+    by_category: Dict[str, List[int]] = {cat: [] for cat in raw["categories"]}
+    for r, recipe in enumerate(recipes):
+        by_category[recipe.category].append(r)
+
+    catalog = CompiledCatalog(
+        source_hash=source_hash,
+        categories=tuple(raw["categories"]),
+        recipes=tuple(recipes),
+        item_ids=tuple(item_ids),
+        item_names=tuple(item_names),
+        input_indptr=np.asarray(indptr, dtype=np.intp),
+        input_items=np.asarray(cols, dtype=np.intp),
+        input_qty=np.asarray(qtys, dtype=float),
+        output_index=output_index,
+        output_qty=output_qty,
+        _by_name={recipe.name: r for r, recipe in enumerate(recipes)},
+        _by_category={cat: tuple(idx) for cat, idx in by_category.items()},
+        _item_index=item_index,
+    )
+    catalog._freeze()
+    return catalog
+
+
+def _cache_path(path: str) -> str:
+    directory, filename = os.path.split(path)
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(directory, "__pycache__", f"{stem}.catalog.pickle")
+
+
+def _data_sources() -> Tuple[str, ...]:
+    """Files of the data modules compile_catalog reads besides the JSON."""
+    try:
+        from ..data import items, timings
+    except ImportError:
+        from data import items, timings
+    return (items.__file__, timings.__file__)
+
+
+@lru_cache(maxsize=None)
+def load_catalog(path: str = CATALOG_PATH) -> CompiledCatalog:
+    """
+    Load the compiled catalog, using the binary cache when it is current.
+
+    Compiled once per process; subsequent calls return the same object.
+    """
+    with open(path, "rb") as f:
+        source = f.read()
+    digest = hashlib.sha256(source)
+    # New timings or facilities must re-run validation, not reuse the pickle
+    for data_path in _data_sources():
+        with open(data_path, "rb") as f:
+            digest.update(f.read())
+    source_hash = digest.hexdigest()
+
+    cache_path = _cache_path(path)
+    try:
+        with open(cache_path, "rb") as f:
+            cached = pickle.load(f)
+        if isinstance(cached, CompiledCatalog) and cached.source_hash == source_hash:
+            cached._freeze()
+            return cached
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        pass
+
+    catalog = compile_catalog(json.loads(source), source_hash)
+
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(catalog, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+    return catalog
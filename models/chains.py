@@ -1,214 +1,34 @@
 """Processing chain generation."""
 
 from typing import Dict, List
+from .catalog import Recipe, load_catalog
 from .dataclasses import ProcessingChain, ChainStep
 
 
+def recipe_to_chain(recipe: Recipe) -> ProcessingChain:
+    """Build a ProcessingChain from a catalog recipe."""
+    chain = ProcessingChain(
+        name=recipe.name,
+        category=recipe.category,
+        timing_key=recipe.timing_key,
+    )
+    chain.steps = [
+        ChainStep(item.item_id, item.item_name, item.quantity)
+        for item in recipe.inputs
+    ]
+    chain.steps.append(ChainStep(
+        recipe.output.item_id,
+        recipe.output.item_name,
+        recipe.output.quantity,
+        processing_method=recipe.processing_method
+    ))
+    return chain
+
+
 def generate_all_chains() -> Dict[str, List[ProcessingChain]]:
-    """Generate all processing chains. Returns category -> chain list."""
-    chains = {
-        "Planks": [],
-        "Hull Parts": [],
-        "Large Hull Parts": [],
-        "Hull Repair Kits": [],
-        "Keel Parts": [],
-        "Large Keel Parts": [],
-        "Nails": [],
-        "Cannonballs": [],
+    """Generate all processing chains from the recipe catalog. Returns category -> chain list."""
+    catalog = load_catalog()
+    return {
+        category: [recipe_to_chain(catalog.recipes[r]) for r in catalog.category_indices(category)]
+        for category in catalog.categories
     }
-    
-    # Planks: log -> plank
-    plank_mappings = [
-        (1511, "Logs", 960, "Plank"),
-        (1521, "Oak logs", 8778, "Oak plank"),
-        (6333, "Teak logs", 8780, "Teak plank"),
-        (6332, "Mahogany logs", 8782, "Mahogany plank"),
-        (32904, "Camphor logs", 31432, "Camphor plank"),
-        (32907, "Ironwood logs", 31435, "Ironwood plank"),
-        (32910, "Rosewood logs", 31438, "Rosewood plank"),
-    ]
-    
-    for log_id, log_name, plank_id, plank_name in plank_mappings:
-        chain = ProcessingChain(
-            name=f"{plank_name} processing",
-            category="Planks"
-        )
-        chain.steps = [
-            ChainStep(log_id, log_name, 1),
-            ChainStep(plank_id, plank_name, 1, processing_method="Sawmill")
-        ]
-        chains["Planks"].append(chain)
-    
-    # Hull Parts: 5 planks -> 1 part
-    hull_mappings = [
-        (960, "Plank", 32041, "Wooden hull parts"),
-        (8778, "Oak plank", 32044, "Oak hull parts"),
-        (8780, "Teak plank", 32047, "Teak hull parts"),
-        (8782, "Mahogany plank", 32050, "Mahogany hull parts"),
-        (31432, "Camphor plank", 32053, "Camphor hull parts"),
-        (31435, "Ironwood plank", 32056, "Ironwood hull parts"),
-        (31438, "Rosewood plank", 32059, "Rosewood hull parts"),
-    ]
-    
-    for plank_id, plank_name, hull_id, hull_name in hull_mappings:
-        chain = ProcessingChain(
-            name=hull_name,
-            category="Hull Parts"
-        )
-        chain.steps = [
-            ChainStep(plank_id, plank_name, 5),
-            ChainStep(hull_id, hull_name, 1)
-        ]
-        chains["Hull Parts"].append(chain)
-    
-    # Large Hull Parts: 5 parts -> 1 large
-    large_hull_mappings = [
-        (32041, "Wooden hull parts", 32062, "Large wooden hull parts"),
-        (32044, "Oak hull parts", 32065, "Large oak hull parts"),
-        (32047, "Teak hull parts", 32068, "Large teak hull parts"),
-        (32050, "Mahogany hull parts", 32071, "Large mahogany hull parts"),
-        (32053, "Camphor hull parts", 32074, "Large camphor hull parts"),
-        (32056, "Ironwood hull parts", 32077, "Large ironwood hull parts"),
-        (32059, "Rosewood hull parts", 32080, "Large rosewood hull parts"),
-    ]
-    
-    for hull_id, hull_name, large_id, large_name in large_hull_mappings:
-        chain = ProcessingChain(
-            name=large_name,
-            category="Large Hull Parts"
-        )
-        chain.steps = [
-            ChainStep(hull_id, hull_name, 5),
-            ChainStep(large_id, large_name, 1)
-        ]
-        chains["Large Hull Parts"].append(chain)
-    
-    # Hull Repair Kits: planks + nails + swamp paste -> kits
-    # (plank_id, plank_name, nail_id, nail_name, paste_qty, plank_qty, nail_qty, output_qty, kit_id, kit_name)
-    repair_kit_mappings = [
-        (960, "Plank", 4819, "Bronze nails", 5, 2, 10, 2, 31964, "Repair kit"),
-        (8778, "Oak plank", 4820, "Iron nails", 5, 2, 10, 2, 31967, "Oak repair kit"),
-        (8780, "Teak plank", 1539, "Steel nails", 5, 2, 10, 2, 31970, "Teak repair kit"),
-        (8782, "Mahogany plank", 4822, "Mithril nails", 5, 2, 10, 2, 31973, "Mahogany repair kit"),
-        (31432, "Camphor plank", 4823, "Adamantite nails", 5, 2, 10, 2, 31976, "Camphor repair kit"),
-        (31435, "Ironwood plank", 4824, "Rune nails", 5, 1, 10, 3, 31979, "Ironwood repair kit"),
-        (31438, "Rosewood plank", 31406, "Dragon nails", 5, 1, 5, 3, 31982, "Rosewood repair kit"),
-    ]
-    
-    for plank_id, plank_name, nail_id, nail_name, paste_qty, plank_qty, nail_qty, output_qty, kit_id, kit_name in repair_kit_mappings:
-        chain = ProcessingChain(
-            name=kit_name,
-            category="Hull Repair Kits"
-        )
-        chain.steps = [
-            ChainStep(plank_id, plank_name, plank_qty),
-            ChainStep(nail_id, nail_name, nail_qty),
-            ChainStep(1941, "Swamp paste", paste_qty),
-            ChainStep(kit_id, kit_name, output_qty)
-        ]
-        chains["Hull Repair Kits"].append(chain)
-    
-    # Keel Parts: 5 bars -> 1 part (dragon: 2 sheets -> 1)
-    keel_mappings = [
-        (2349, "Bronze bar", 31999, "Bronze keel parts", 5),
-        (2351, "Iron bar", 32002, "Iron keel parts", 5),
-        (2353, "Steel bar", 32005, "Steel keel parts", 5),
-        (2359, "Mithril bar", 32008, "Mithril keel parts", 5),
-        (2361, "Adamantite bar", 32011, "Adamant keel parts", 5),
-        (2363, "Runite bar", 32014, "Rune keel parts", 5),
-        (31996, "Dragon metal sheet", 32017, "Dragon keel parts", 2),
-    ]
-    
-    for bar_id, bar_name, keel_id, keel_name, qty in keel_mappings:
-        chain = ProcessingChain(
-            name=keel_name,
-            category="Keel Parts"
-        )
-        chain.steps = [
-            ChainStep(bar_id, bar_name, qty),
-            ChainStep(keel_id, keel_name, 1)
-        ]
-        chains["Keel Parts"].append(chain)
-    
-    # Large Keel Parts: 5 parts -> 1 large (dragon: 2 -> 1)
-    large_keel_mappings = [
-        (31999, "Bronze keel parts", 32020, "Large bronze keel parts", 5),
-        (32002, "Iron keel parts", 32023, "Large iron keel parts", 5),
-        (32005, "Steel keel parts", 32026, "Large steel keel parts", 5),
-        (32008, "Mithril keel parts", 32029, "Large mithril keel parts", 5),
-        (32011, "Adamant keel parts", 32032, "Large adamant keel parts", 5),
-        (32014, "Rune keel parts", 32035, "Large rune keel parts", 5),
-        (32017, "Dragon keel parts", 32038, "Large dragon keel parts", 2),
-    ]
-    
-    for keel_id, keel_name, large_id, large_name, qty in large_keel_mappings:
-        chain = ProcessingChain(
-            name=large_name,
-            category="Large Keel Parts"
-        )
-        chain.steps = [
-            ChainStep(keel_id, keel_name, qty),
-            ChainStep(large_id, large_name, 1)
-        ]
-        if qty == 2:
-            chain.special_ratio = {"conversion_ratio": 2}
-        chains["Large Keel Parts"].append(chain)
-    
-    # Nails: 1 bar -> 15 nails
-    nail_mappings = [
-        (2349, "Bronze bar", 4819, "Bronze nails"),
-        (2351, "Iron bar", 4820, "Iron nails"),
-        (2353, "Steel bar", 1539, "Steel nails"),
-        (2359, "Mithril bar", 4822, "Mithril nails"),
-        (2361, "Adamantite bar", 4823, "Adamantite nails"),
-        (2363, "Runite bar", 4824, "Rune nails"),
-        (31996, "Dragon metal sheet", 31406, "Dragon nails"),
-    ]
-    
-    for bar_id, bar_name, nail_id, nail_name in nail_mappings:
-        chain = ProcessingChain(
-            name=f"{nail_name} smithing",
-            category="Nails"
-        )
-        processing = "Dragon Forge" if "Dragon" in nail_name else "Smithing"
-        chain.steps = [
-            ChainStep(bar_id, bar_name, 1),
-            ChainStep(nail_id, nail_name, 15, processing_method=processing)
-        ]
-        chains["Nails"].append(chain)
-    
-    # Cannonballs: 1 bar -> 4 balls (double: 2 bars -> 8)
-    # Dragon cannonballs are drop-only
-    cannonball_mappings = [
-        (2349, "Bronze bar", 31906, "Bronze cannonball"),
-        (2351, "Iron bar", 31908, "Iron cannonball"),
-        (2353, "Steel bar", 2, "Steel cannonball"),
-        (2359, "Mithril bar", 31910, "Mithril cannonball"),
-        (2361, "Adamantite bar", 31912, "Adamant cannonball"),
-        (2363, "Runite bar", 31914, "Rune cannonball"),
-    ]
-    
-    for bar_id, bar_name, ball_id, ball_name in cannonball_mappings:
-        # Single mould
-        chain = ProcessingChain(
-            name=f"{ball_name} (Regular)",
-            category="Cannonballs"
-        )
-        chain.steps = [
-            ChainStep(bar_id, bar_name, 1),
-            ChainStep(ball_id, ball_name, 4)
-        ]
-        chains["Cannonballs"].append(chain)
-        
-        # Double mould
-        chain_double = ProcessingChain(
-            name=f"{ball_name} (Double)",
-            category="Cannonballs"
-        )
-        chain_double.steps = [
-            ChainStep(bar_id, bar_name, 2),
-            ChainStep(ball_id, ball_name, 8)
-        ]
-        chains["Cannonballs"].append(chain_double)
-    
-    return chains
@@ -1,7 +1,7 @@
 """Processing chain data structures."""
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+from typing import Dict, List, Optional, Tuple, Union, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from ..services.lookup import ItemIDLookup
@@ -24,7 +24,13 @@ class ProcessingChain:
     name: str
     category: str
     steps: List[ChainStep] = field(default_factory=list)
-    special_ratio: Optional[Dict] = field(default_factory=dict)
+    timing_key: Union[None, str, Tuple[Tuple[str, str], ...]] = None
+    
+    def get_timing_key(self, config: Dict) -> Optional[str]:
+        """Resolve the ActivityTiming key (plank chains depend on plank_method)."""
+        if self.timing_key is None or isinstance(self.timing_key, str):
+            return self.timing_key
+        return dict(self.timing_key).get(config.get("plank_method", "Sawmill"))
     
     def get_output_item_name(self) -> str:
         """Return the output item name (last step)."""
@@ -34,7 +40,13 @@ class ProcessingChain:
         clean = clean.replace(" (Regular)", "").replace(" (Double)", "")
         return clean
     
-    def calculate(self, prices: Dict, config: Dict, id_lookup: 'ItemIDLookup') -> Dict:
+    def calculate(
+        self,
+        prices: Dict,
+        config: Dict,
+        id_lookup: 'ItemIDLookup',
+        include_steps: bool = True
+    ) -> Dict:
         """
         Calculate profitability.
         
@@ -42,6 +54,8 @@ class ProcessingChain:
             prices: item_id -> price data from Wiki API
             config: User settings (quantity, self_collected, plank_method, etc.)
             id_lookup: ItemIDLookup for resolving names to IDs
+            include_steps: Build the per-step breakdown in 'steps'. Table
+                and chart paths pass False and leave 'steps' empty.
             
         Returns:
             Dict with costs, profit, ROI. Contains 'error' key on failure.
@@ -79,11 +93,6 @@ class ProcessingChain:
         
         final_quantity = config.get("quantity", 1)
         
-        if self.special_ratio and "dragon" in self.name.lower():
-            ratio = self.special_ratio.get("conversion_ratio", 5)
-        else:
-            ratio = 5
-        
         # Calculate needed quantities (backward from output)
         num_steps = len(self.steps)
         needed = [0.0] * num_steps
@@ -135,6 +144,9 @@ class ProcessingChain:
                 )
                 results["processing_costs"] += processing_cost
 
+            if not include_steps:
+                continue
+
             results["steps"].append({
                 "name": step.item_name,
                 "quantity": step_qty,
@@ -160,7 +172,28 @@ class ProcessingChain:
             results["roi"] = float('inf')
         
         return results
-    
+
+    def processing_cost_per_item(self, prices: Dict, config: Dict, id_lookup: 'ItemIDLookup') -> float:
+        """Processing cost (sawmill fees, runes) per output item."""
+        try:
+            from ..data import SAWMILL_COSTS, PLANK_MAKE_COSTS, RUNE_IDS
+        except ImportError:
+            from data import SAWMILL_COSTS, PLANK_MAKE_COSTS, RUNE_IDS
+
+        if not self.steps or not self.steps[-1].quantity:
+            return 0
+
+        output_qty = self.steps[-1].quantity
+        total = 0
+        for step in self.steps:
+            if step.processing_method:
+                cost, _ = self._calculate_processing_cost(
+                    step, step.quantity / output_qty, prices, config, id_lookup,
+                    SAWMILL_COSTS, PLANK_MAKE_COSTS, RUNE_IDS
+                )
+                total += cost
+        return total
+
     def _calculate_processing_cost(
         self, 
         step: ChainStep, 
@@ -0,0 +1,105 @@
+"""Item graph built from processing chains."""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .dataclasses import ProcessingChain
+
+
+@dataclass
+class ChainGraph:
+    """
+    Items as nodes, recipes as edges.
+
+    recipe[i, j] is how many units of item j are consumed to craft one unit
+    of item i. Rows of raw materials are all zero.
+    """
+    item_names: List[str]
+    item_ids: List[Optional[int]]
+    index: Dict[str, int]
+    producers: Dict[str, ProcessingChain]
+    recipe: np.ndarray
+    _totals_cache: Dict[frozenset, np.ndarray] = field(default_factory=dict, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.item_names)
+
+    def find(self, item_name: str) -> Optional[int]:
+        """Return the node index for an item name (case-insensitive)."""
+        idx = self.index.get(item_name)
+        if idx is None:
+            idx = self.index.get(item_name.strip().lower())
+        return idx
+
+    def is_craftable(self, idx: int) -> bool:
+        return self.item_names[idx] in self.producers
+
+    def total_requirements(self, buy_items: Iterable[str] = ()) -> np.ndarray:
+        """
+        Matrix of total units of each item needed per unit of each item.
+
+        Row i of (I - R)^-1 lists every item, including i itself, that flows
+        through the tree when one unit of i is crafted. Items in buy_items are
+        treated as raw materials (bought instead of crafted).
+        """
+        key = frozenset(buy_items)
+        if key not in self._totals_cache:
+            recipe = self.recipe.copy()
+            for name in key:
+                idx = self.find(name)
+                if idx is not None:
+                    recipe[idx, :] = 0
+            totals = np.linalg.inv(np.eye(len(self)) - recipe)
+            totals[np.abs(totals) < 1e-9] = 0
+            totals.setflags(write=False)
+            self._totals_cache[key] = totals
+        return self._totals_cache[key]
+
+
+def build_chain_graph(all_chains: Dict[str, List[ProcessingChain]]) -> ChainGraph:
+    """
+    Build the item graph from all chains.
+
+    When several chains produce the same item (single/double cannonball
+    moulds) the first one is used; they share the same input ratio.
+    """
+    item_names: List[str] = []
+    item_ids: List[Optional[int]] = []
+    index: Dict[str, int] = {}
+    producers: Dict[str, ProcessingChain] = {}
+
+    def add_item(step) -> int:
+        if step.item_name not in index:
+            index[step.item_name] = len(item_names)
+            index[step.item_name.lower()] = len(item_names)
+            item_names.append(step.item_name)
+            item_ids.append(step.item_id)
+        return index[step.item_name]
+
+    edges = []
+    for cat_chains in all_chains.values():
+        for chain in cat_chains:
+            if len(chain.steps) < 2:
+                continue
+            output = chain.steps[-1]
+            out_idx = add_item(output)
+            if output.item_name in producers or not output.quantity:
+                continue
+            producers[output.item_name] = chain
+            for step in chain.steps[:-1]:
+                edges.append((out_idx, add_item(step), step.quantity / output.quantity))
+
+    recipe = np.zeros((len(item_names), len(item_names)))
+    for out_idx, in_idx, qty in edges:
+        recipe[out_idx, in_idx] += qty
+    recipe.setflags(write=False)
+
+    return ChainGraph(
+        item_names=item_names,
+        item_ids=item_ids,
+        index=index,
+        producers=producers,
+        recipe=recipe,
+    )
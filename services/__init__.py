@@ -2,11 +2,78 @@
 
 from .api import OSRSWikiConnection, API_BASE
 from .lookup import ItemIDLookup
-from .calculations import calculate_gp_per_hour
+from .calculations import calculate_gp_per_hour, gp_hour_table, items_per_hour_array
+from .planner import explode_order
+from .evaluation import PROFIT_CONFIG_KEYS, catalog_price_arrays, evaluate_catalog, resolve_item_ids
+from .history import TIMESTEP_SECONDS, fetch_price_history, build_price_matrix
+from .risk import estimate_return_covariance, simulate_profit_risk
+from .breakeven import solve_break_even
+from .sandbox import apply_price_overrides, run_what_if
+from .session_planner import plan_session
+from .arbitrage import ArbitrageDetector, arbitrage_config_key, cheapest_routes, find_opportunities
+from .liquidity import hourly_volumes, liquidity_caps
+from .pareto import pareto_frontier, xp_per_item_array
+from .quantity_curves import profit_curves, quantity_grid
+from .simulator import simulate_items_per_hour
+from .location_search import best_locations, location_requirements
+from .equipment import equipment_payback
+from .production_line import production_lines
+from .price_store import PriceStore, open_price_store
+from .backtest import backtest
+from .sweep import iter_sweep, sweep_backtest
+from .rolling_stats import ROLLING_WINDOW, RollingStats, chain_trends
+from .profit_sketch import QuantileSketch, ProfitBands
+from .forecast import holt_forecast, projected_profit
+from .comovement import CoMovement, leg_correlation
 
 __all__ = [
     'OSRSWikiConnection',
     'API_BASE',
     'ItemIDLookup',
     'calculate_gp_per_hour',
+    'gp_hour_table',
+    'items_per_hour_array',
+    'explode_order',
+    'PROFIT_CONFIG_KEYS',
+    'catalog_price_arrays',
+    'evaluate_catalog',
+    'resolve_item_ids',
+    'TIMESTEP_SECONDS',
+    'fetch_price_history',
+    'build_price_matrix',
+    'estimate_return_covariance',
+    'simulate_profit_risk',
+    'solve_break_even',
+    'apply_price_overrides',
+    'run_what_if',
+    'plan_session',
+    'ArbitrageDetector',
+    'arbitrage_config_key',
+    'cheapest_routes',
+    'find_opportunities',
+    'hourly_volumes',
+    'liquidity_caps',
+    'pareto_frontier',
+    'xp_per_item_array',
+    'profit_curves',
+    'quantity_grid',
+    'simulate_items_per_hour',
+    'best_locations',
+    'location_requirements',
+    'equipment_payback',
+    'production_lines',
+    'PriceStore',
+    'open_price_store',
+    'backtest',
+    'iter_sweep',
+    'sweep_backtest',
+    'ROLLING_WINDOW',
+    'RollingStats',
+    'chain_trends',
+    'QuantileSketch',
+    'ProfitBands',
+    'holt_forecast',
+    'projected_profit',
+    'CoMovement',
+    'leg_correlation',
 ]
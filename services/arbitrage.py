@@ -0,0 +1,198 @@
+"""
+Conversion-cycle arbitrage detection over the item graph.
+
+Nodes are items plus GP. Buying on the GE is an edge GP -> item, selling is
+item -> GP (after tax), and each recipe is a hyperedge from its inputs to
+its output. Recipes take several inputs and charge flat GP fees, so route
+costs add rather than multiply; instead of Bellman-Ford on log exchange
+rates we run the same relaxation directly on unit costs (min-plus). A
+profitable cycle is GP -> cheapest route to an item -> GP.
+"""
+
+import threading
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+import numpy as np
+
+from .evaluation import _unit_terms, ge_tax, processing_cost_per_item
+
+if TYPE_CHECKING:
+    from ..models.catalog import CompiledCatalog
+
+BUY = -1
+
+# Settings find_opportunities reads besides prices
+ARBITRAGE_CONFIG_KEYS = ("use_earth_staff", "ge_tax_rate", "ge_tax_cap", "ge_tax_threshold")
+
+
+def cheapest_routes(
+    catalog: 'CompiledCatalog',
+    high: np.ndarray,
+    config: Dict
+) -> Dict[str, np.ndarray]:
+    """
+    Cheapest unit cost of every item via buying or crafting.
+
+    Bellman-Ford relaxation: start from GE buy prices and repeatedly
+    replace an item's cost with a recipe's (inputs + processing) cost when
+    cheaper. Converges within |items| rounds unless recipes form a cycle
+    that creates value, in which case 'has_cycle' is set.
+
+    Returns dict with 'cost' (n_items,), 'recipe' (n_items,) best recipe
+    index or BUY, 'recipe_cost' (n_recipes,) and 'has_cycle'.
+    """
+    terms = _unit_terms(catalog)
+    processing = processing_cost_per_item(catalog, high, config)
+
+    cost = np.where(high > 0, high, np.inf)
+    best_recipe = np.full(len(cost), BUY, dtype=np.intp)
+    recipe_cost = np.full(len(catalog), np.inf)
+
+    has_cycle = True
+    for _ in range(len(cost)):
+        weighted = cost[catalog.input_items] * terms["unit_qty"]
+        recipe_cost = np.add.reduceat(weighted, catalog.input_indptr[:-1]) + processing
+
+        candidate = cost.copy()
+        np.minimum.at(candidate, catalog.output_index, recipe_cost)
+        improved = candidate < cost - 1e-9
+        if not improved.any():
+            has_cycle = False
+            break
+
+        cost = candidate
+        # Reversed so the first recipe in catalog order wins ties
+        for r in np.flatnonzero(recipe_cost <= cost[catalog.output_index] + 1e-9)[::-1]:
+            if improved[catalog.output_index[r]]:
+                best_recipe[catalog.output_index[r]] = r
+
+    return {
+        "cost": cost,
+        "recipe": best_recipe,
+        "recipe_cost": recipe_cost,
+        "has_cycle": has_cycle,
+    }
+
+
+def route_recipes(catalog: 'CompiledCatalog', best_recipe: np.ndarray, item: int) -> List[int]:
+    """Recipes crafted on the cheapest route to an item, inputs first."""
+    order = []
+    seen = set()
+
+    def visit(i: int) -> None:
+        r = best_recipe[i]
+        if r == BUY or r in seen:
+            return
+        seen.add(r)
+        start, end = catalog.input_indptr[r], catalog.input_indptr[r + 1]
+        for j in catalog.input_items[start:end]:
+            visit(j)
+        order.append(int(r))
+
+    visit(item)
+    return order
+
+
+def find_opportunities(
+    catalog: 'CompiledCatalog',
+    high: np.ndarray,
+    low: np.ndarray,
+    config: Dict
+) -> Dict:
+    """
+    Profitable GP -> craft -> GP cycles and cheaper-than-GE routes.
+
+    Returns dict with 'opportunities' (profitable cycles, best first),
+    'routes' (items where crafting beats buying) and 'has_cycle'.
+    """
+    routes = cheapest_routes(catalog, high, config)
+    cost = routes["cost"]
+    best_recipe = routes["recipe"]
+
+    sell_net = low - ge_tax(low, config)
+    crafted = best_recipe != BUY
+
+    opportunities = []
+    for i in np.flatnonzero(crafted & (low > 0) & (sell_net > cost)):
+        path = route_recipes(catalog, best_recipe, i)
+        opportunities.append({
+            "item": catalog.item_names[i],
+            "route": [catalog.recipes[r].name for r in path],
+            "route_cost": float(cost[i]),
+            "sell_net": float(sell_net[i]),
+            "gain": float(sell_net[i] - cost[i]),
+            "gain_pct": float((sell_net[i] - cost[i]) / cost[i] * 100) if cost[i] > 0 else float("inf"),
+        })
+    opportunities.sort(key=lambda o: o["gain_pct"], reverse=True)
+
+    cheaper_routes = []
+    for i in np.flatnonzero(crafted & (high > 0)):
+        cheaper_routes.append({
+            "item": catalog.item_names[i],
+            "ge_price": float(high[i]),
+            "route_cost": float(cost[i]),
+            "saving": float(high[i] - cost[i]),
+            "route": [catalog.recipes[r].name for r in route_recipes(catalog, best_recipe, i)],
+        })
+    cheaper_routes.sort(key=lambda r: r["saving"], reverse=True)
+
+    return {
+        "opportunities": opportunities,
+        "routes": cheaper_routes,
+        "has_cycle": routes["has_cycle"],
+    }
+
+
+def arbitrage_config_key(config: Dict) -> str:
+    """Hashable summary of the settings that change find_opportunities."""
+    return repr(sorted((k, config.get(k)) for k in ARBITRAGE_CONFIG_KEYS))
+
+
+class ArbitrageDetector:
+    """
+    Tracks opportunities across snapshots and flags new ones.
+
+    The last evaluation is shared and safe to use from several threads;
+    which opportunities a viewer has already seen lives in the `seen` dict
+    each caller passes to update.
+    """
+
+    def __init__(self, catalog: 'CompiledCatalog'):
+        self.catalog = catalog
+        self._last_key: Optional[bytes] = None
+        self._last_result: Optional[Dict] = None
+        self._lock = threading.Lock()
+
+    def _evaluate(self, key: bytes, high: np.ndarray, low: np.ndarray, config: Dict) -> Dict:
+        with self._lock:
+            if key != self._last_key or self._last_result is None:
+                self._last_result = find_opportunities(self.catalog, high, low, config)
+                self._last_key = key
+            return self._last_result
+
+    def update(self, high: np.ndarray, low: np.ndarray, config: Dict, seen: Dict) -> Dict:
+        """
+        Evaluate a snapshot for one viewer. Unchanged snapshots reuse the
+        last result.
+
+        Each opportunity gets an 'is_new' flag; 'closed' lists items that
+        were profitable on the viewer's previous snapshot but no longer are.
+        seen (empty on first use, e.g. kept in st.session_state per
+        arbitrage_config_key) is updated in place.
+        """
+        key = high.tobytes() + low.tobytes() + arbitrage_config_key(config).encode()
+        if seen.get("key") == key:
+            return seen["result"]
+
+        shared = self._evaluate(key, high, low, config)
+        known = seen.get("known")
+        current = {o["item"] for o in shared["opportunities"]}
+        result = dict(shared)
+        result["opportunities"] = [
+            {**opportunity, "is_new": known is not None and opportunity["item"] not in known}
+            for opportunity in shared["opportunities"]
+        ]
+        result["closed"] = sorted((known or set()) - current)
+
+        seen.update(key=key, known=current, result=result)
+        return result
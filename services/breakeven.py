@@ -0,0 +1,84 @@
+"""Closed-form break-even prices for every chain."""
+
+from typing import Dict, TYPE_CHECKING
+
+import numpy as np
+
+try:
+    from ..data import GE_TAX_RATE, GE_TAX_CAP, GE_TAX_THRESHOLD
+except ImportError:
+    from data import GE_TAX_RATE, GE_TAX_CAP, GE_TAX_THRESHOLD
+
+from .evaluation import _unit_terms, evaluate_catalog
+
+if TYPE_CHECKING:
+    from ..models.catalog import CompiledCatalog
+
+
+def break_even_output_value(cost: np.ndarray, config: Dict) -> np.ndarray:
+    """
+    Smallest sale value V with V - tax(V) >= cost.
+
+    Piecewise inverse of the GE tax: untaxed below the threshold, then
+    V(1 - rate) until the cap is reached, then V - cap.
+    """
+    rate = config.get("ge_tax_rate", GE_TAX_RATE)
+    cap = config.get("ge_tax_cap", GE_TAX_CAP)
+    threshold = config.get("ge_tax_threshold", GE_TAX_THRESHOLD)
+
+    if rate >= 1:
+        uncapped = np.full_like(cost, np.inf)
+    else:
+        uncapped = cost / (1 - rate)
+    taxed = np.where(uncapped * rate <= cap, uncapped, cost + cap)
+    return np.where(cost < threshold, cost, taxed)
+
+
+def solve_break_even(
+    catalog: 'CompiledCatalog',
+    high: np.ndarray,
+    low: np.ndarray,
+    config: Dict
+) -> Dict[str, np.ndarray]:
+    """
+    Break-even prices for every recipe in one pass.
+
+    min_output_price: lowest sell price that still breaks even, with all
+        input and processing costs at current prices.
+    max_input_price: highest buy price for the primary (first) input that
+        still breaks even, with the output and other inputs at current
+        prices. Infinite when materials are self-collected.
+    output_margin / input_margin: percentage the current price can move
+        against you before the chain stops breaking even (margin of safety).
+
+    Returns dict of (..., n_recipes) arrays.
+    """
+    results = evaluate_catalog(catalog, high, low, config)
+    quantity = config.get("quantity", 1)
+    terms = _unit_terms(catalog)
+
+    min_output_value = break_even_output_value(results["total_input_cost"], config)
+    min_output_price = min_output_value / quantity
+    output_price = low[..., catalog.output_index]
+
+    primary = catalog.input_indptr[:-1]
+    primary_qty = quantity * terms["unit_qty"][primary]
+    primary_price = high[..., catalog.input_items[primary]]
+
+    proceeds = results["output_value"] - results["ge_tax"]
+    if config.get("self_collected", False):
+        max_input_price = np.full_like(proceeds, np.inf)
+    else:
+        other_costs = results["total_input_cost"] - primary_qty * primary_price
+        max_input_price = (proceeds - other_costs) / primary_qty
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        output_margin = np.where(output_price > 0, (output_price - min_output_price) / output_price * 100, np.nan)
+        input_margin = np.where(primary_price > 0, (max_input_price - primary_price) / primary_price * 100, np.nan)
+
+    return {
+        "min_output_price": min_output_price,
+        "max_input_price": max_input_price,
+        "output_margin": output_margin,
+        "input_margin": input_margin,
+    }
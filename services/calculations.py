@@ -1,6 +1,10 @@
 """GP/hr calculation service."""
 
-from typing import Dict, Optional
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
 
 try:
     from ..data import (
@@ -8,43 +12,88 @@ try:
         BANK_LOCATIONS,
         PLANK_SACK_CAPACITY,
         SMITHING_OUTFIT_TICK_SAVE_CHANCE,
+        TripInput,
     )
+    from ..models.catalog import load_catalog
 except ImportError:
     from data import (
         ACTIVITY_TIMINGS,
         BANK_LOCATIONS,
         PLANK_SACK_CAPACITY,
         SMITHING_OUTFIT_TICK_SAVE_CHANCE,
+        TripInput,
     )
+    from models.catalog import load_catalog
 
+if TYPE_CHECKING:
+    from ..models.catalog import CompiledCatalog
 
-def calculate_gp_per_hour(
-    profit_per_item: float,
-    category: str,
-    chain_name: str,
-    config: Dict
-) -> Optional[Dict]:
+# Config flags that change trip timing, in bitmask order
+EQUIPMENT_FLAGS = (
+    "has_imcando_hammer",
+    "has_amys_saw",
+    "has_plank_sack",
+    "has_smithing_outfit",
+    "ancient_furnace",
+    "use_earth_staff",
+)
+
+DEFAULT_BANK_LOCATION = "Medium (Typical)"
+
+
+def equipment_mask(config: Dict) -> int:
+    """Bitmask of the EQUIPMENT_FLAGS enabled in config."""
+    return sum(1 << bit for bit, flag in enumerate(EQUIPMENT_FLAGS) if config.get(flag, False))
+
+
+@lru_cache(maxsize=None)
+def _pack_inventory(
+    inputs: Tuple[TripInput, ...],
+    free_slots: int,
+    sack_capacity: int = 0
+) -> Tuple[int, Tuple[int, ...]]:
     """
-    Calculate GP/hr for a processing activity.
-    
-    Returns None if activity timing not found.
+    Most actions per trip for a multi-input recipe, and units of each input
+    carried. Memoized per input set and tool/sack setup.
+
+    Stackable inputs take one slot each. Sackable units go in the sack
+    first, so n actions need max(S*n - sack, 0) + N*n slots beyond the
+    stacks (S, N: sackable and other non-stackable units per action).
+    That rises with n, so the largest feasible n is exact in closed form.
     """
-    timing_key = _get_timing_key(category, chain_name, config)
-    
-    if not timing_key or timing_key not in ACTIVITY_TIMINGS:
+    slots = free_slots - sum(1 for i in inputs if i.stackable)
+    sackable = sum(i.quantity for i in inputs if i.sackable and not i.stackable)
+    loose = sum(i.quantity for i in inputs if not i.sackable and not i.stackable)
+    if slots <= 0 or sackable + loose == 0:
+        return 0, tuple(0 for _ in inputs)
+
+    actions = (slots + sack_capacity) // (sackable + loose)
+    if loose:
+        actions = min(actions, slots // loose)
+    return actions, tuple(i.quantity * actions for i in inputs)
+
+
+def _trip_model(timing_key: str, config: Dict) -> Optional[Dict]:
+    """
+    Inventory, items and seconds per banking trip for an activity.
+
+    Returns None if the timing key is unknown, the bank location lacks the
+    activity's facility, or a trip yields nothing.
+    """
+    timing = ACTIVITY_TIMINGS.get(timing_key)
+    if timing is None:
         return None
     
-    timing = ACTIVITY_TIMINGS[timing_key]
-    is_double_mould_chain = "(Double)" in chain_name
-    
     has_imcando_hammer = config.get("has_imcando_hammer", False)
     has_amys_saw = config.get("has_amys_saw", False)
     has_smithing_outfit = config.get("has_smithing_outfit", False)
     has_plank_sack = config.get("has_plank_sack", False)
     use_stamina = config.get("use_stamina", True)
     
-    bank_location_name = config.get("bank_location", "Medium (Typical)")
-    bank_location = BANK_LOCATIONS.get(bank_location_name, BANK_LOCATIONS["Medium (Typical)"])
+    bank_location_name = config.get("bank_location", DEFAULT_BANK_LOCATION)
+    bank_location = BANK_LOCATIONS.get(bank_location_name, BANK_LOCATIONS[DEFAULT_BANK_LOCATION])
+    if not bank_location.has_facility(timing.facility):
+        return None
     
     # Smithing outfit: 15% chance to save 1 tick
     effective_ticks = timing.ticks_per_action
@@ -79,7 +128,12 @@ def calculate_gp_per_hour(
     if has_plank_sack and timing.uses_planks:
         materials_per_trip = effective_inventory + plank_sack_bonus
     
-    actions_per_trip = materials_per_trip // materials_per_action
+    inputs_per_trip: Tuple[int, ...] = ()
+    if timing.trip_inputs:
+        actions_per_trip, inputs_per_trip = _pack_inventory(timing.trip_inputs, effective_inventory, plank_sack_bonus)
+        materials_per_trip = actions_per_trip * materials_per_action
+    else:
+        actions_per_trip = materials_per_trip // materials_per_action
     items_per_trip = actions_per_trip * items_per_action
     
     if items_per_trip <= 0:
@@ -108,6 +162,52 @@ def calculate_gp_per_hour(
         seconds_per_trip = craft_time_seconds + trip_overhead
         ancient_furnace_active = True
     
+    return {
+        "timing": timing,
+        "bank_location": bank_location,
+        "effective_ticks": effective_ticks,
+        "effective_inventory": effective_inventory,
+        "materials_per_trip": materials_per_trip,
+        "actions_per_trip": actions_per_trip,
+        "inputs_per_trip": inputs_per_trip,
+        "items_per_trip": items_per_trip,
+        "seconds_per_trip": seconds_per_trip,
+        "trip_overhead": trip_overhead,
+        "plank_sack_bonus": plank_sack_bonus,
+        "ancient_furnace_active": ancient_furnace_active,
+    }
+
+
+def calculate_gp_per_hour(
+    profit_per_item: float,
+    category: str,
+    chain_name: str,
+    config: Dict
+) -> Optional[Dict]:
+    """
+    Calculate GP/hr for a processing activity.
+    
+    Returns None if activity timing not found. For whole catalogs use
+    items_per_hour_array, which reads the precomputed GPHourTable.
+    """
+    timing_key = _get_timing_key(category, chain_name, config)
+    
+    trip = _trip_model(timing_key, config) if timing_key else None
+    if trip is None:
+        return None
+    
+    timing = trip["timing"]
+    bank_location = trip["bank_location"]
+    is_double_mould_chain = timing_key == "Cannonballs_Double"
+    
+    has_imcando_hammer = config.get("has_imcando_hammer", False)
+    has_amys_saw = config.get("has_amys_saw", False)
+    has_smithing_outfit = config.get("has_smithing_outfit", False)
+    has_plank_sack = config.get("has_plank_sack", False)
+    plank_sack_bonus = trip["plank_sack_bonus"]
+    
+    items_per_trip = trip["items_per_trip"]
+    seconds_per_trip = trip["seconds_per_trip"]
     trips_per_hour = 3600.0 / seconds_per_trip
     items_per_hour = trips_per_hour * items_per_trip
     gp_per_hour = items_per_hour * profit_per_item
@@ -123,7 +223,7 @@ def calculate_gp_per_hour(
     bonus_notes = []
     if has_smithing_outfit and timing.is_smithing:
         bonus_notes.append("Smithing outfit: -15% avg ticks")
-    if ancient_furnace_active:
+    if trip["ancient_furnace_active"]:
         bonus_notes.append("Ancient Furnace: 2x speed")
     if is_double_mould_chain:
         bonus_notes.append("Double mould: 2 bars/action")
@@ -135,8 +235,9 @@ def calculate_gp_per_hour(
         "items_per_hour": items_per_hour,
         "trips_per_hour": trips_per_hour,
         "items_per_trip": items_per_trip,
-        "materials_per_trip": materials_per_trip,
-        "effective_inventory": effective_inventory,
+        "materials_per_trip": trip["materials_per_trip"],
+        "inputs_per_trip": trip["inputs_per_trip"],
+        "effective_inventory": trip["effective_inventory"],
         "seconds_per_trip": seconds_per_trip,
         "timing_key": timing_key,
         "timing": timing,
@@ -147,42 +248,127 @@ def calculate_gp_per_hour(
                            (1 if timing.needs_saw and has_amys_saw else 0),
         "bank_location": bank_location.name,
         "bank_requirements": bank_location.requirements,
-        "effective_ticks": effective_ticks,
+        "effective_ticks": trip["effective_ticks"],
         "is_double_mould": is_double_mould_chain,
         "plank_sack_active": has_plank_sack and timing.uses_planks,
     }
 
 
 def _get_timing_key(category: str, chain_name: str, config: Dict) -> Optional[str]:
-    """Map category and chain name to activity timing key."""
-    is_double_mould = "(Double)" in chain_name
-    
-    if category == "Cannonballs":
-        return "Cannonballs_Double" if is_double_mould else "Cannonballs_Single"
-    
-    elif category == "Keel Parts":
-        if "dragon" in chain_name.lower():
-            return "Dragon Keel Parts"
-        return "Keel Parts"
-    
-    elif category == "Large Keel Parts":
-        if "dragon" in chain_name.lower():
-            return "Large Dragon Keel Parts"
-        return "Large Keel Parts"
-    
-    elif category == "Hull Parts":
-        return "Hull Parts"
-    
-    elif category == "Large Hull Parts":
-        return "Large Hull Parts"
-    
-    elif category == "Nails":
-        return "Nails"
-    
-    elif category == "Planks":
-        plank_method = config.get("plank_method", "Sawmill")
-        if "Plank Make" in plank_method:
-            return "Planks_PlankMake"
-        return "Planks_Sawmill"
-    
-    return None
+    """Look up the activity timing key declared for the chain in the catalog."""
+    recipe = load_catalog().get_recipe(chain_name)
+    if recipe is None:
+        return None
+    return recipe.get_timing_key(config)
+
+
+@dataclass(frozen=True, eq=False)
+class GPHourTable:
+    """
+    Items and seconds per trip for every timing key x equipment bitmask x
+    bank location x stamina, shape (n_keys, 2**len(EQUIPMENT_FLAGS),
+    n_locations, 2). NaN where a trip yields nothing.
+    """
+    timing_keys: Tuple[str, ...]
+    locations: Tuple[str, ...]
+    items_per_trip: np.ndarray
+    seconds_per_trip: np.ndarray
+
+    def items_per_hour(self, config: Dict) -> np.ndarray:
+        """Items/hr per timing key for one configuration, shape (n_keys,)."""
+        bank_location = config.get("bank_location", DEFAULT_BANK_LOCATION)
+        if bank_location not in BANK_LOCATIONS:
+            bank_location = DEFAULT_BANK_LOCATION
+        index = (
+            slice(None),
+            equipment_mask(config),
+            self.locations.index(bank_location),
+            int(bool(config.get("use_stamina", True))),
+        )
+        return 3600.0 * self.items_per_trip[index] / self.seconds_per_trip[index]
+
+    def items_per_hour_by_mask(self, config: Dict, masks: np.ndarray) -> np.ndarray:
+        """Items/hr per timing key for several equipment masks, shape (n_keys, len(masks))."""
+        bank_location = config.get("bank_location", DEFAULT_BANK_LOCATION)
+        if bank_location not in BANK_LOCATIONS:
+            bank_location = DEFAULT_BANK_LOCATION
+        index = (
+            slice(None),
+            np.asarray(masks, dtype=np.intp),
+            self.locations.index(bank_location),
+            int(bool(config.get("use_stamina", True))),
+        )
+        return 3600.0 * self.items_per_trip[index] / self.seconds_per_trip[index]
+
+    def items_per_hour_by_location(self, config: Dict) -> np.ndarray:
+        """Items/hr per timing key at every location, shape (n_keys, n_locations)."""
+        index = (
+            slice(None),
+            equipment_mask(config),
+            slice(None),
+            int(bool(config.get("use_stamina", True))),
+        )
+        return 3600.0 * self.items_per_trip[index] / self.seconds_per_trip[index]
+
+
+@lru_cache(maxsize=1)
+def gp_hour_table() -> GPHourTable:
+    """Build the trip table once from ACTIVITY_TIMINGS and BANK_LOCATIONS."""
+    timing_keys = tuple(ACTIVITY_TIMINGS)
+    locations = tuple(BANK_LOCATIONS)
+    shape = (len(timing_keys), 1 << len(EQUIPMENT_FLAGS), len(locations), 2)
+    items_per_trip = np.full(shape, np.nan)
+    seconds_per_trip = np.full(shape, np.nan)
+
+    for k, timing_key in enumerate(timing_keys):
+        for mask in range(shape[1]):
+            flags = {flag: bool(mask >> bit & 1) for bit, flag in enumerate(EQUIPMENT_FLAGS)}
+            for loc, bank_location in enumerate(locations):
+                for stamina in (0, 1):
+                    trip = _trip_model(timing_key, {
+                        **flags,
+                        "bank_location": bank_location,
+                        "use_stamina": bool(stamina),
+                    })
+                    if trip is not None:
+                        items_per_trip[k, mask, loc, stamina] = trip["items_per_trip"]
+                        seconds_per_trip[k, mask, loc, stamina] = trip["seconds_per_trip"]
+
+    for arr in (items_per_trip, seconds_per_trip):
+        arr.setflags(write=False)
+    return GPHourTable(timing_keys, locations, items_per_trip, seconds_per_trip)
+
+
+@lru_cache(maxsize=16)
+def recipe_timing_index(catalog: 'CompiledCatalog', plank_method: str) -> np.ndarray:
+    """Row of gp_hour_table per recipe (-1 if no timing data), resolved once."""
+    table = gp_hour_table()
+    config = {"plank_method": plank_method}
+    index = np.array([
+        table.timing_keys.index(key) if key in table.timing_keys else -1
+        for key in (recipe.get_timing_key(config) for recipe in catalog.recipes)
+    ], dtype=np.intp)
+    index.setflags(write=False)
+    return index
+
+
+def items_per_hour_array(catalog: 'CompiledCatalog', config: Dict) -> np.ndarray:
+    """
+    Items/hr for every recipe, shape (n_recipes,). NaN where no timing data.
+
+    Independent of prices, so GP/hr for any price snapshot is
+    items_per_hour * profit_per_item. A gather from gp_hour_table.
+    """
+    table = gp_hour_table()
+    index = recipe_timing_index(catalog, config.get("plank_method", "Sawmill"))
+    per_key = table.items_per_hour(config)
+
+    if "sawmill_travel_time" in config and "Planks_Sawmill" in table.timing_keys:
+        # Custom travel time is continuous, so it bypasses the table
+        trip = _trip_model("Planks_Sawmill", config)
+        per_key = per_key.copy()
+        per_key[table.timing_keys.index("Planks_Sawmill")] = (
+            3600.0 * trip["items_per_trip"] / trip["seconds_per_trip"] if trip else np.nan
+        )
+
+    return np.where(index >= 0, per_key[index], np.nan)
@@ -0,0 +1,226 @@
+"""
+Calibrate activity and bank timings from recorded gameplay tick logs.
+
+Logs are CSV or NDJSON (optionally gzipped), one event per row:
+
+    tick, event, activity, location[, session]
+
+event is "action" (an action completed), "bank_open" or "bank_close";
+activity is an ACTIVITY_TIMINGS key and location a BANK_LOCATIONS name.
+Rows must be in tick order within each session. Log without the Smiths'
+Uniform or Ancient Furnace, which the GP/hr model applies on top.
+
+Rows stream through generators into integer tick histograms, so memory
+stays constant however long the log. Run as:
+
+    python -m services.calibration logs.csv [more.ndjson ...] [-o PATH]
+"""
+
+import argparse
+import csv
+import gzip
+import io
+import json
+import math
+import os
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+try:
+    from ..data import CALIBRATION_PATH, TICK_SECONDS
+except ImportError:
+    from data import CALIBRATION_PATH, TICK_SECONDS
+
+# Fewer samples than this leave the hard-coded value in place
+MIN_CALIBRATION_SAMPLES = 30
+
+CALIBRATION_PERCENTILES = (5, 50, 95)
+
+
+class LogEvent(NamedTuple):
+    tick: int
+    event: str
+    activity: str
+    location: str
+    session: str
+
+
+class TickHistogram:
+    """Counts of integer tick durations; exact stats in bounded memory."""
+
+    def __init__(self) -> None:
+        self.counts: Counter = Counter()
+
+    def add(self, ticks: int) -> None:
+        self.counts[ticks] += 1
+
+    @property
+    def n(self) -> int:
+        return sum(self.counts.values())
+
+    def mean(self) -> float:
+        return sum(t * c for t, c in self.counts.items()) / self.n
+
+    def std(self) -> float:
+        mean = self.mean()
+        return math.sqrt(sum(c * (t - mean) ** 2 for t, c in self.counts.items()) / self.n)
+
+    def percentile(self, q: float) -> int:
+        """Smallest duration with at least q% of samples at or below it."""
+        target = q / 100 * self.n
+        seen = 0
+        for ticks in sorted(self.counts):
+            seen += self.counts[ticks]
+            if seen >= target:
+                return ticks
+        return max(self.counts)
+
+    def summary(self) -> Dict:
+        """Sample count, mean, std and percentiles in ticks."""
+        stats = {"samples": self.n, "mean": self.mean(), "std": self.std()}
+        for q in CALIBRATION_PERCENTILES:
+            stats[f"p{q}"] = self.percentile(q)
+        return stats
+
+
+def _open_text(path: str) -> io.TextIOBase:
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", newline="", encoding="utf-8")
+    return open(path, "r", newline="", encoding="utf-8")
+
+
+def read_rows(path: str) -> Iterator[Dict]:
+    """Yield raw rows from a CSV or NDJSON log, one at a time."""
+    stem = path[:-3] if path.endswith(".gz") else path
+    with _open_text(path) as f:
+        if stem.endswith(".csv"):
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def parse_events(rows: Iterable[Dict]) -> Iterator[LogEvent]:
+    """Typed events; rows missing a tick or event are skipped."""
+    for row in rows:
+        try:
+            tick = int(row["tick"])
+            event = str(row["event"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        yield LogEvent(
+            tick,
+            event,
+            str(row.get("activity") or ""),
+            str(row.get("location") or ""),
+            str(row.get("session") or ""),
+        )
+
+
+def durations(events: Iterable[LogEvent]) -> Iterator[Tuple[str, Tuple[str, ...], int]]:
+    """
+    Yield ("action", (activity,), ticks), ("bank", (location,), ticks) and
+    ("gap", (location, activity), ticks) per completed interval.
+
+    A gap runs from the last action before the bank to bank_open plus from
+    bank_close to the next action; it still includes that action's ticks,
+    which fit_calibration takes off.
+    """
+    last_action: Dict[str, int] = {}
+    bank_open: Dict[str, int] = {}
+    pending: Dict[str, Tuple[str, int]] = {}  # session -> (location, walk-to-bank ticks + bank_close tick)
+
+    for e in events:
+        if e.event == "action":
+            if e.session in pending:
+                location, partial = pending.pop(e.session)
+                yield "gap", (location, e.activity), e.tick + partial
+            elif e.session in last_action:
+                yield "action", (e.activity,), e.tick - last_action[e.session]
+            last_action[e.session] = e.tick
+        elif e.event == "bank_open":
+            bank_open[e.session] = e.tick
+        elif e.event == "bank_close" and e.session in bank_open:
+            opened = bank_open.pop(e.session)
+            yield "bank", (e.location,), e.tick - opened
+            if e.session in last_action:
+                pending[e.session] = (e.location, (opened - last_action.pop(e.session)) - e.tick)
+
+
+def fit_calibration(intervals: Iterable[Tuple[str, Tuple[str, ...], int]]) -> Dict:
+    """
+    Fit per-activity ticks/action and per-location bank and travel time.
+
+    Returns {"activities": {key: stats}, "locations": {name: stats}} with
+    stats in ticks plus the calibrated values ('ticks_per_action', and
+    'bank_time'/'travel_time' in seconds). Entries under
+    MIN_CALIBRATION_SAMPLES are left out.
+    """
+    hists: Dict[Tuple[str, Tuple[str, ...]], TickHistogram] = defaultdict(TickHistogram)
+    for kind, key, ticks in intervals:
+        if ticks >= 0 and all(key):
+            hists[kind, key].add(ticks)
+
+    activities = {}
+    action_means = {}
+    for (kind, key), hist in hists.items():
+        if kind != "action":
+            continue
+        activity = key[0]
+        action_means[activity] = hist.mean()
+        if hist.n >= MIN_CALIBRATION_SAMPLES:
+            activities[activity] = {**hist.summary(), "ticks_per_action": hist.percentile(50)}
+
+    locations = {}
+    for (kind, key), hist in hists.items():
+        if kind != "bank" or hist.n < MIN_CALIBRATION_SAMPLES:
+            continue
+        location = key[0]
+        # Travel: each activity's gaps less one action, pooled by sample count
+        travel_ticks, travel_n = 0.0, 0
+        for (gap_kind, gap_key), gap in hists.items():
+            if gap_kind == "gap" and gap_key[0] == location and gap_key[1] in action_means:
+                travel_ticks += gap.n * (gap.mean() - action_means[gap_key[1]])
+                travel_n += gap.n
+        entry = {"bank": hist.summary(), "bank_time": hist.mean() * TICK_SECONDS}
+        if travel_n >= MIN_CALIBRATION_SAMPLES:
+            entry["travel_samples"] = travel_n
+            entry["travel_time"] = max(travel_ticks / travel_n, 0.0) * TICK_SECONDS
+        locations[location] = entry
+
+    return {"activities": activities, "locations": locations}
+
+
+def calibrate(paths: Iterable[str]) -> Dict:
+    """Stream every log through the pipeline and fit in one pass."""
+    def rows() -> Iterator[Dict]:
+        for path in paths:
+            yield from read_rows(path)
+    return fit_calibration(durations(parse_events(rows())))
+
+
+def write_calibration(calibration: Dict, path: str = CALIBRATION_PATH) -> None:
+    """Write atomically so the app never reads a half-written file."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(calibration, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("logs", nargs="+", help="CSV or NDJSON tick logs (.gz ok)")
+    parser.add_argument("-o", "--output", default=CALIBRATION_PATH, help="calibrated timings JSON")
+    args = parser.parse_args(argv)
+
+    calibration = calibrate(args.logs)
+    write_calibration(calibration, args.output)
+    print(
+        f"Calibrated {len(calibration['activities'])} activities and "
+        f"{len(calibration['locations'])} locations -> {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Co-movement of chain item prices.
+
+An exponentially weighted covariance of per-window mid log returns,
+updated in O(n_items^2) per window, so it tracks recent regimes without
+re-reading history. Windows where an item didn't trade count as a zero
+return, matching forward-filled log_returns.
+"""
+
+import os
+import threading
+from typing import Dict, Optional, Sequence, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from .evaluation import _unit_terms
+from .history import build_price_matrix, mid_prices
+
+if TYPE_CHECKING:
+    from ..models.catalog import CompiledCatalog
+
+COMOVEMENT_SPAN = 48
+
+
+class CoMovement:
+    """
+    Rolling EW covariance and correlation of log returns across items.
+    Safe to share between threads (the app keeps one per timestep).
+    """
+
+    def __init__(self, item_ids: Sequence[Optional[int]], span: int = COMOVEMENT_SPAN):
+        n_items = len(item_ids)
+        self.item_ids: Tuple[int, ...] = tuple(int(i) if i else 0 for i in item_ids)
+        self.span = span
+        self.alpha = 2.0 / (span + 1)
+        self.updates = 0
+        self.last_timestamp: Optional[int] = None
+        self.mean = np.zeros(n_items)
+        self.cov = np.zeros((n_items, n_items))
+        self._last_mid = np.full(n_items, np.nan)
+        self._lock = threading.Lock()
+
+    def update(self, timestamp: int, high: np.ndarray, low: np.ndarray) -> bool:
+        """Fold in one window of (n_items,) prices, NaN where untraded. False if not newer."""
+        with self._lock:
+            return self._update(timestamp, high, low)
+
+    def _update(self, timestamp: int, high: np.ndarray, low: np.ndarray) -> bool:
+        if self.last_timestamp is not None and timestamp <= self.last_timestamp:
+            return False
+
+        mid = mid_prices({"high": high[None], "low": low[None]})[0]
+        moved = ~np.isnan(mid) & ~np.isnan(self._last_mid)
+        returns = np.zeros(len(mid))
+        returns[moved] = np.log(mid[moved] / self._last_mid[moved])
+        self._last_mid = np.where(np.isnan(mid), self._last_mid, mid)
+
+        if self.last_timestamp is not None:
+            diff = returns - self.mean
+            step = self.alpha * diff
+            self.mean += step
+            self.cov = (1 - self.alpha) * (self.cov + np.outer(diff, step))
+            self.updates += 1
+        self.last_timestamp = int(timestamp)
+        return True
+
+    def ingest(self, snapshots: Sequence[Tuple[int, Dict]]) -> int:
+        """Fold in [(timestamp, {item_id: window})] newer than the last; returns windows used."""
+        with self._lock:
+            new = sorted(
+                (snap for snap in snapshots if self.last_timestamp is None or snap[0] > self.last_timestamp),
+                key=lambda snap: snap[0],
+            )
+            if not new:
+                return 0
+            matrix = build_price_matrix(new, self.item_ids)
+            return sum(
+                self._update(timestamp, high, low)
+                for timestamp, high, low in zip(matrix["timestamps"], matrix["high"], matrix["low"])
+            )
+
+    def covariance(self) -> np.ndarray:
+        """Copy of the (n_items, n_items) EW covariance of log returns."""
+        with self._lock:
+            return self.cov.copy()
+
+    def correlation(self) -> np.ndarray:
+        """(n_items, n_items) correlation; NaN for items that haven't moved or before two returns."""
+        with self._lock, np.errstate(invalid="ignore", divide="ignore"):
+            std = np.sqrt(np.diag(self.cov))
+            corr = self.cov / np.outer(std, std)
+            if self.updates < 2:
+                corr[:] = np.nan
+        return np.clip(corr, -1.0, 1.0)
+
+    def save(self, path: str) -> None:
+        """Write state atomically."""
+        with self._lock:
+            tmp_path = f"{path}.tmp.npz"
+            np.savez(
+                tmp_path,
+                item_ids=np.asarray(self.item_ids, dtype=np.int64),
+                settings=np.array([self.span, self.updates, -1 if self.last_timestamp is None else self.last_timestamp]),
+                mean=self.mean,
+                cov=self.cov,
+                last_mid=self._last_mid,
+            )
+            os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, item_ids: Sequence[Optional[int]], span: int = COMOVEMENT_SPAN) -> 'CoMovement':
+        """Restore saved state, or start fresh if missing or saved for other items/span."""
+        comovement = cls(item_ids, span)
+        if not os.path.exists(path):
+            return comovement
+        with np.load(path) as saved:
+            saved_span, updates, last_timestamp = (int(v) for v in saved["settings"])
+            if tuple(saved["item_ids"]) != comovement.item_ids or saved_span != span:
+                return comovement
+            comovement.mean = saved["mean"].copy()
+            comovement.cov = saved["cov"].copy()
+            comovement._last_mid = saved["last_mid"].copy()
+            comovement.updates = updates
+            comovement.last_timestamp = None if last_timestamp < 0 else last_timestamp
+        return comovement
+
+
+def leg_correlation(catalog: 'CompiledCatalog', cov: np.ndarray, high: np.ndarray) -> np.ndarray:
+    """
+    Per recipe, correlation between the returns of its input basket (inputs
+    weighted by their cost share at high prices) and of its output. Near 1
+    means the margin is naturally hedged. NaN without data.
+    """
+    weights = np.zeros((len(catalog), len(catalog.item_names)))
+    cost = _unit_terms(catalog)["unit_qty"] * high[catalog.input_items]
+    np.add.at(weights, (catalog.input_rows, catalog.input_items), cost)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        weights /= weights.sum(axis=1, keepdims=True)
+
+    recipes = np.arange(len(catalog))
+    output = catalog.output_index
+    input_var = np.einsum("ri,ij,rj->r", weights, cov, weights)
+    cross = (weights @ cov)[recipes, output]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr = cross / np.sqrt(input_var * cov[output, output])
+    return np.clip(corr, -1.0, 1.0)
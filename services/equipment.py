@@ -0,0 +1,74 @@
+"""Equipment upgrade value: GP/hr gained per item and hours to pay it back."""
+
+from typing import Dict, TYPE_CHECKING
+
+import numpy as np
+
+try:
+    from ..data import EQUIPMENT_ITEMS
+except ImportError:
+    from data import EQUIPMENT_ITEMS
+
+from .calculations import EQUIPMENT_FLAGS, equipment_mask, gp_hour_table, recipe_timing_index
+from .evaluation import evaluate_catalog
+
+if TYPE_CHECKING:
+    from ..models.catalog import CompiledCatalog
+
+
+def equipment_payback(
+    catalog: 'CompiledCatalog',
+    high: np.ndarray,
+    low: np.ndarray,
+    config: Dict,
+    prices: Dict
+) -> Dict:
+    """
+    GP/hr delta of each equipment toggle on every chain.
+
+    Each item in EQUIPMENT_ITEMS is compared on vs off with every other
+    setting taken from config, all read from the GP/hr table in one
+    gather. Tradeable items get a payback time at the GE buy price.
+
+    Returns dict with 'flags', 'names', 'prices' (NaN if untradeable),
+    (n_recipes, n_flags) 'items_per_hour_delta', 'gp_per_hour_delta' and
+    'payback_hours' (inf where the item doesn't pay), and per flag
+    'best_recipe' (-1 if it helps nothing) and 'best_delta'.
+    """
+    flags = tuple(EQUIPMENT_ITEMS)
+    base = equipment_mask(config)
+    bits = np.array([1 << EQUIPMENT_FLAGS.index(flag) for flag in flags])
+    masks = np.concatenate([base | bits, base & ~bits])
+
+    table = gp_hour_table()
+    rates = table.items_per_hour_by_mask(config, masks)
+    index = recipe_timing_index(catalog, config.get("plank_method", "Sawmill"))
+    per_recipe = np.where((index >= 0)[:, None], rates[index], np.nan)
+    rate_on, rate_off = per_recipe[:, :len(flags)], per_recipe[:, len(flags):]
+
+    profit_per_item = evaluate_catalog(catalog, high, low, config)["profit_per_item"]
+    items_delta = rate_on - rate_off
+    gp_delta = items_delta * profit_per_item[:, None]
+
+    item_prices = np.array([
+        (prices.get(str(item_id), {}).get("high") or np.nan) if item_id else np.nan
+        for _, item_id in (EQUIPMENT_ITEMS[flag] for flag in flags)
+    ], dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        payback = np.where(gp_delta > 0, item_prices / gp_delta, np.inf)
+
+    filled = np.where(np.isnan(gp_delta), -np.inf, gp_delta)
+    best_recipe = filled.argmax(axis=0)
+    best_delta = filled[best_recipe, np.arange(len(flags))]
+    helps = best_delta > 0
+
+    return {
+        "flags": flags,
+        "names": tuple(EQUIPMENT_ITEMS[flag][0] for flag in flags),
+        "prices": item_prices,
+        "items_per_hour_delta": items_delta,
+        "gp_per_hour_delta": gp_delta,
+        "payback_hours": payback,
+        "best_recipe": np.where(helps, best_recipe, -1),
+        "best_delta": np.where(helps, best_delta, 0.0),
+    }
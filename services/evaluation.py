@@ -0,0 +1,177 @@
+"""
+Vectorized chain evaluation over the compiled catalog.
+
+Mirrors ProcessingChain.calculate for every recipe at once. Price arrays may
+carry leading batch dimensions (samples, timestamps); results broadcast.
+"""
+
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+try:
+    from ..data import (
+        SAWMILL_COSTS, PLANK_MAKE_COSTS,
+        GE_TAX_RATE, GE_TAX_CAP, GE_TAX_THRESHOLD,
+    )
+except ImportError:
+    from data import (
+        SAWMILL_COSTS, PLANK_MAKE_COSTS,
+        GE_TAX_RATE, GE_TAX_CAP, GE_TAX_THRESHOLD,
+    )
+
+if TYPE_CHECKING:
+    from ..models.catalog import CompiledCatalog
+    from .lookup import ItemIDLookup
+
+# Plank Make: 2 Astral + 1 Nature + 15 Earth per cast
+PLANK_MAKE_RUNES = {"Astral rune": 2, "Nature rune": 1, "Earth rune": 15}
+
+# Config keys that change profit per item (the rest only affect rates)
+PROFIT_CONFIG_KEYS = (
+    "quantity", "self_collected", "use_earth_staff", "plank_method",
+    "ge_tax_rate", "ge_tax_cap", "ge_tax_threshold",
+)
+
+
+@lru_cache(maxsize=8)
+def _unit_terms(catalog: 'CompiledCatalog') -> Dict[str, np.ndarray]:
+    """Per-output-item coefficients, computed once per catalog."""
+    n_recipes = len(catalog)
+    unit_qty = catalog.input_qty / catalog.output_qty[catalog.input_rows]
+
+    sawmill_fee = np.zeros(n_recipes)
+    plank_make_fee = np.zeros(n_recipes)
+    is_plank_make = np.zeros(n_recipes, dtype=bool)
+    for r, recipe in enumerate(catalog.recipes):
+        output_name = recipe.output.item_name
+        if recipe.processing_method == "Sawmill":
+            sawmill_fee[r] = SAWMILL_COSTS.get(output_name, 0)
+        elif recipe.processing_method == "Plank Make" and output_name in PLANK_MAKE_COSTS:
+            plank_make_fee[r] = PLANK_MAKE_COSTS[output_name]
+            is_plank_make[r] = True
+
+    terms = {
+        "unit_qty": unit_qty,
+        "sawmill_fee": sawmill_fee,
+        "plank_make_fee": plank_make_fee,
+        "is_plank_make": is_plank_make,
+        "rune_index": np.array([catalog.item_index(name) for name in PLANK_MAKE_RUNES], dtype=np.intp),
+        "rune_qty": np.array(list(PLANK_MAKE_RUNES.values()), dtype=float),
+    }
+    for arr in terms.values():
+        arr.setflags(write=False)
+    return terms
+
+
+def resolve_item_ids(
+    catalog: 'CompiledCatalog',
+    id_lookup: Optional['ItemIDLookup'] = None
+) -> List[Optional[int]]:
+    """GE item IDs aligned with catalog.item_names (None if unresolved)."""
+    if id_lookup is None:
+        return list(catalog.item_ids)
+    return [
+        id_lookup.get_or_find_id(item_id, name)
+        for item_id, name in zip(catalog.item_ids, catalog.item_names)
+    ]
+
+
+def catalog_price_arrays(
+    catalog: 'CompiledCatalog',
+    prices: Dict,
+    id_lookup: Optional['ItemIDLookup'] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (high, low) price arrays aligned with catalog.item_names. Missing prices are 0."""
+    n_items = len(catalog.item_names)
+    high = np.zeros(n_items)
+    low = np.zeros(n_items)
+
+    for i, resolved_id in enumerate(resolve_item_ids(catalog, id_lookup)):
+        price_data = prices.get(str(resolved_id), {}) if resolved_id else {}
+        high[i] = price_data.get("high") or 0
+        low[i] = price_data.get("low") or 0
+
+    return high, low
+
+
+def input_cost_per_item(catalog: 'CompiledCatalog', high: np.ndarray) -> np.ndarray:
+    """Cost of all inputs per output item, shape (..., n_recipes)."""
+    terms = _unit_terms(catalog)
+    weighted = high[..., catalog.input_items] * terms["unit_qty"]
+    # Every recipe has at least one input, so no reduceat segment is empty
+    return np.add.reduceat(weighted, catalog.input_indptr[:-1], axis=-1)
+
+
+def processing_cost_per_item(catalog: 'CompiledCatalog', high: np.ndarray, config: Dict) -> np.ndarray:
+    """Sawmill fees and Plank Make runes per output item, shape (..., n_recipes)."""
+    terms = _unit_terms(catalog)
+    rune_qty = terms["rune_qty"].copy()
+    if config.get("use_earth_staff", False):
+        rune_qty[list(PLANK_MAKE_RUNES).index("Earth rune")] = 0
+    rune_cost = high[..., terms["rune_index"]] @ rune_qty
+
+    plank_make = terms["is_plank_make"] * (terms["plank_make_fee"] + rune_cost[..., None])
+    return terms["sawmill_fee"] + plank_make
+
+
+def ge_tax(output_value: np.ndarray, config: Dict) -> np.ndarray:
+    """GE tax on a sale of the given total value."""
+    rate = config.get("ge_tax_rate", GE_TAX_RATE)
+    cap = config.get("ge_tax_cap", GE_TAX_CAP)
+    threshold = config.get("ge_tax_threshold", GE_TAX_THRESHOLD)
+    return np.where(output_value >= threshold, np.minimum(output_value * rate, cap), 0.0)
+
+
+def evaluate_catalog(
+    catalog: 'CompiledCatalog',
+    high: np.ndarray,
+    low: np.ndarray,
+    config: Dict
+) -> Dict[str, np.ndarray]:
+    """
+    Evaluate every recipe in one pass.
+
+    Args:
+        catalog: CompiledCatalog from load_catalog
+        high: Buy prices, shape (..., n_items)
+        low: Sell prices, shape (..., n_items)
+        config: User settings (quantity, self_collected, use_earth_staff,
+            optional ge_tax_rate / ge_tax_cap / ge_tax_threshold overrides).
+            quantity may be an array broadcasting against the results.
+
+    Returns:
+        Dict of arrays shaped (..., n_recipes) with the same keys and
+        semantics as ProcessingChain.calculate.
+    """
+    quantity = config.get("quantity", 1)
+
+    if config.get("self_collected", False):
+        raw_material_cost = np.zeros(np.broadcast_shapes(np.shape(quantity), high.shape[:-1] + (len(catalog),)))
+    else:
+        raw_material_cost = quantity * input_cost_per_item(catalog, high)
+
+    processing_costs = quantity * processing_cost_per_item(catalog, high, config)
+    total_input_cost = raw_material_cost + processing_costs
+    output_value = quantity * low[..., catalog.output_index]
+    tax = ge_tax(output_value, config)
+    net_profit = output_value - total_input_cost - tax
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        roi = np.where(
+            total_input_cost > 0,
+            net_profit / total_input_cost * 100,
+            np.where(raw_material_cost == 0, np.inf, 0.0)
+        )
+
+    return {
+        "raw_material_cost": raw_material_cost,
+        "processing_costs": processing_costs,
+        "total_input_cost": total_input_cost,
+        "output_value": output_value,
+        "ge_tax": tax,
+        "net_profit": net_profit,
+        "profit_per_item": np.divide(net_profit, quantity, out=np.zeros_like(net_profit), where=quantity > 0),
+        "roi": roi,
+    }
@@ -0,0 +1,115 @@
+"""
+Short-horizon price forecasts for every item at once.
+
+Holt's linear trend on log prices, run over the (T, n_items) history with
+time as the only loop. Each item keeps whichever (alpha, beta) from a
+small grid had the lowest one-step error, and that error sets lognormal
+bands that widen with the horizon. Windows where an item didn't trade
+advance its level by the trend without a correction.
+"""
+
+from typing import Dict, Sequence, TYPE_CHECKING
+
+import numpy as np
+
+from .backtest import replay_prices
+
+if TYPE_CHECKING:
+    from ..models.catalog import CompiledCatalog
+
+HOLT_ALPHAS = (0.2, 0.5, 0.8)
+HOLT_BETAS = (0.05, 0.2)
+
+# ~90% two-sided band
+FORECAST_Z = 1.645
+
+
+def holt_forecast(values: np.ndarray, horizons: Sequence[int], z: float = FORECAST_Z) -> Dict[str, np.ndarray]:
+    """
+    Forecast (T, n_items) prices (NaN where untraded) horizons windows past
+    the last row. Returns (len(horizons), n_items) 'forecast', 'lower' and
+    'upper', and per item 'alpha', 'beta' and 'sigma' (one-step log error).
+    Items with fewer than two prices are NaN.
+    """
+    alpha_grid, beta_grid = np.meshgrid(HOLT_ALPHAS, HOLT_BETAS, indexing="ij")
+    alpha = alpha_grid.reshape(-1, 1)
+    beta = beta_grid.reshape(-1, 1)
+    n_params, n_items = len(alpha), values.shape[1]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_values = np.log(np.where(values > 0, values, np.nan))
+    observed_rows = ~np.isnan(log_values)
+    log_values = np.where(observed_rows, log_values, 0.0)
+    level = np.zeros((n_params, n_items))
+    trend = np.zeros((n_params, n_items))
+    sq_error = np.zeros((n_params, n_items))
+    n_errors = np.zeros(n_items)
+    started = np.zeros(n_items, dtype=bool)
+    alpha_beta = alpha * beta
+
+    for row, observed in zip(log_values, observed_rows):
+        level += trend
+        scored = observed & started
+        error = (row - level) * scored
+        sq_error += error * error
+        n_errors += scored
+        level += alpha * error
+        trend += alpha_beta * error
+        first = observed & ~started
+        if first.any():
+            level[:, first] = row[first]
+            started |= first
+
+    fitted = n_errors > 0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mse = sq_error / n_errors
+    best = np.argmin(np.where(fitted, mse, np.inf), axis=0)
+    pick = (best, np.arange(n_items))
+    level, trend = np.where(fitted, level[pick], np.nan), trend[pick]
+    best_alpha, best_beta = alpha[best, 0], beta[best, 0]
+    sigma = np.where(fitted, np.sqrt(mse[pick]), np.nan)
+
+    steps = np.asarray(horizons, dtype=np.intp)
+    # h-step error variance of Holt's method: sigma^2 (1 + sum_{0<j<h} (alpha (1 + j beta))^2)
+    j = np.arange(steps.max())[:, None]
+    terms = np.where(j > 0, (best_alpha * (1 + j * best_beta)) ** 2, 0.0)
+    spread = np.sqrt(1 + np.cumsum(terms, axis=0)[steps - 1])
+    centre = level + steps[:, None] * trend
+    return {
+        "forecast": np.exp(centre),
+        "lower": np.exp(centre - z * sigma * spread),
+        "upper": np.exp(centre + z * sigma * spread),
+        "alpha": np.where(fitted, best_alpha, np.nan),
+        "beta": np.where(fitted, best_beta, np.nan),
+        "sigma": sigma,
+    }
+
+
+def projected_profit(
+    catalog: 'CompiledCatalog',
+    history: Dict[str, np.ndarray],
+    horizons: Sequence[int],
+    config: Dict,
+    z: float = FORECAST_Z
+) -> Dict[str, np.ndarray]:
+    """
+    Profit per item at forecast prices for each horizon (in windows) from
+    a build_price_matrix dict aligned with catalog.item_names.
+
+    Returns (len(horizons), n_recipes) 'profit_per_item', 'low_profit_per_item'
+    (inputs at their upper band, output at its lower) and
+    'high_profit_per_item' (the reverse), NaN where an input or the output
+    can't be forecast, plus the per-item 'high' and 'low' holt_forecast dicts.
+    """
+    high = holt_forecast(history["high"], horizons, z)
+    low = holt_forecast(history["low"], horizons, z)
+
+    profits = {}
+    for key, buy, sell in (
+        ("profit_per_item", "forecast", "forecast"),
+        ("low_profit_per_item", "upper", "lower"),
+        ("high_profit_per_item", "lower", "upper"),
+    ):
+        results, valid = replay_prices(catalog, high[buy], low[sell], config)
+        profits[key] = np.where(valid, results["profit_per_item"], np.nan)
+    return {**profits, "high": high, "low": low}
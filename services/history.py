@@ -0,0 +1,108 @@
+"""Price history from the /5m and /1h endpoints."""
+
+import time
+from typing import Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .api import OSRSWikiConnection
+
+TIMESTEP_SECONDS = {
+    "5m": 300,
+    "1h": 3600,
+}
+
+HISTORY_FIELDS = ("avgHighPrice", "avgLowPrice", "highPriceVolume", "lowPriceVolume")
+
+
+def fetch_price_history(
+    conn: 'OSRSWikiConnection',
+    timestep: str = "1h",
+    count: int = 24,
+    end: Optional[int] = None
+) -> List[Tuple[int, Dict]]:
+    """
+    Fetch the last `count` completed windows of averaged prices.
+
+    Returns [(timestamp, {item_id: {avgHighPrice, avgLowPrice, ...}})],
+    oldest first.
+    """
+    step = TIMESTEP_SECONDS[timestep]
+    fetch = conn.fetch_5m_prices if timestep == "5m" else conn.fetch_1h_prices
+
+    if end is None:
+        end = int(time.time())
+    # Window starting at `last` is the most recent one that has closed
+    last = (end // step) * step - step
+
+    snapshots = []
+    for k in range(count - 1, -1, -1):
+        timestamp = last - k * step
+        snapshots.append((timestamp, fetch(timestamp)))
+    return snapshots
+
+
+def build_price_matrix(
+    snapshots: Sequence[Tuple[int, Dict]],
+    item_ids: Sequence[Optional[int]]
+) -> Dict[str, np.ndarray]:
+    """
+    Arrange snapshots as time x item arrays.
+
+    Returns dict with 'timestamps' (T,) and 'high', 'low', 'high_volume',
+    'low_volume' (T, n_items). Prices missing from a window are NaN;
+    missing volumes are 0.
+    """
+    n_times = len(snapshots)
+    n_items = len(item_ids)
+    high = np.full((n_times, n_items), np.nan)
+    low = np.full((n_times, n_items), np.nan)
+    high_volume = np.zeros((n_times, n_items))
+    low_volume = np.zeros((n_times, n_items))
+    timestamps = np.zeros(n_times, dtype=np.int64)
+
+    for t, (timestamp, data) in enumerate(snapshots):
+        timestamps[t] = timestamp
+        for i, item_id in enumerate(item_ids):
+            entry = data.get(str(item_id)) if item_id else None
+            if not entry:
+                continue
+            high[t, i] = entry.get("avgHighPrice") or np.nan
+            low[t, i] = entry.get("avgLowPrice") or np.nan
+            high_volume[t, i] = entry.get("highPriceVolume") or 0
+            low_volume[t, i] = entry.get("lowPriceVolume") or 0
+
+    return {
+        "timestamps": timestamps,
+        "high": high,
+        "low": low,
+        "high_volume": high_volume,
+        "low_volume": low_volume,
+    }
+
+
+def mid_prices(history: Dict[str, np.ndarray]) -> np.ndarray:
+    """Mid price per window, falling back to whichever side traded."""
+    high = history["high"]
+    low = history["low"]
+    mid = np.where(np.isnan(high), low, np.where(np.isnan(low), high, (high + low) / 2))
+    return mid
+
+
+def forward_fill(values: np.ndarray) -> np.ndarray:
+    """Carry the last seen value forward over NaN gaps along time (axis 0)."""
+    valid = ~np.isnan(values)
+    idx = np.where(valid, np.arange(values.shape[0])[:, None], 0)
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    return values[idx, np.arange(values.shape[1])]
+
+
+def log_returns(history: Dict[str, np.ndarray]) -> np.ndarray:
+    """Log returns of mid prices, shape (T - 1, n_items). Gaps are 0."""
+    filled = forward_fill(mid_prices(history))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.diff(np.log(filled), axis=0)
+    returns[~np.isfinite(returns)] = 0
+    return returns
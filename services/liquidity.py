@@ -0,0 +1,105 @@
+"""Realistic throughput capped by GE buy limits and traded volume."""
+
+from typing import Dict, Optional, Sequence, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from .calculations import items_per_hour_array
+from .evaluation import _unit_terms, evaluate_catalog
+from .history import TIMESTEP_SECONDS
+from .session_planner import BUY_LIMIT_WINDOW_HOURS
+
+if TYPE_CHECKING:
+    from ..models.catalog import CompiledCatalog
+
+# Fraction of an item's hourly traded volume one player can realistically take
+DEFAULT_MARKET_SHARE = 0.25
+
+
+def hourly_volumes(history: Dict[str, np.ndarray], timestep: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Average units traded per hour from a build_price_matrix history.
+
+    Returns (buy_volume, sell_volume). Buys fill against highPriceVolume
+    (instant-buy trades) and sales against lowPriceVolume.
+    """
+    windows_per_hour = 3600 / TIMESTEP_SECONDS[timestep]
+    buy_volume = history["high_volume"].mean(axis=0) * windows_per_hour
+    sell_volume = history["low_volume"].mean(axis=0) * windows_per_hour
+    return buy_volume, sell_volume
+
+
+def buy_limit_quantity(catalog: 'CompiledCatalog', buy_limits: Sequence[Optional[int]]) -> np.ndarray:
+    """Most output items whose inputs fit in one buy-limit window, (n_recipes,)."""
+    limits = np.array([limit if limit else np.inf for limit in buy_limits], dtype=float)
+    per_input = limits[catalog.input_items] / _unit_terms(catalog)["unit_qty"]
+    return np.minimum.reduceat(per_input, catalog.input_indptr[:-1])
+
+
+def liquidity_caps(
+    catalog: 'CompiledCatalog',
+    high: np.ndarray,
+    low: np.ndarray,
+    config: Dict,
+    buy_limits: Sequence[Optional[int]],
+    buy_volume: Optional[np.ndarray] = None,
+    sell_volume: Optional[np.ndarray] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Effective items/hr and GP/hr for every chain under market constraints.
+
+    Each input caps output at min(buy limit / 4h, share of buy volume)
+    divided by units needed per item; the output caps at a share of its
+    sell volume. Self-collected materials skip the input caps. Missing
+    volumes (no history) leave only the buy-limit caps.
+
+    Returns dict of (n_recipes,) arrays: items_per_hour, gp_per_hour,
+    capped_items_per_hour, capped_gp_per_hour, market_items_per_hour (the
+    market ceiling alone), max_batch (items per buy-limit window) and
+    bottleneck (catalog item index of the binding constraint, -1 if none).
+    """
+    share = config.get("market_share", DEFAULT_MARKET_SHARE)
+    terms = _unit_terms(catalog)
+
+    limits = np.array([limit if limit else np.inf for limit in buy_limits], dtype=float)
+    item_rate = limits / BUY_LIMIT_WINDOW_HOURS
+    if buy_volume is not None:
+        item_rate = np.minimum(item_rate, share * buy_volume)
+
+    if config.get("self_collected", False):
+        input_cap = np.full(len(catalog), np.inf)
+        input_bottleneck = np.full(len(catalog), -1, dtype=np.intp)
+        window_cap = np.full(len(catalog), np.inf)
+    else:
+        per_input = item_rate[catalog.input_items] / terms["unit_qty"]
+        input_cap = np.minimum.reduceat(per_input, catalog.input_indptr[:-1])
+        window_cap = buy_limit_quantity(catalog, buy_limits)
+        # Input row with the smallest cap within each recipe's segment
+        is_min = per_input == input_cap[catalog.input_rows]
+        first = np.full(len(catalog), len(per_input) - 1)
+        np.minimum.at(first, catalog.input_rows[is_min], np.flatnonzero(is_min))
+        input_bottleneck = np.where(np.isfinite(input_cap), catalog.input_items[first], -1)
+
+    output_cap = np.full(len(catalog), np.inf)
+    if sell_volume is not None:
+        output_cap = share * sell_volume[catalog.output_index]
+
+    market_cap = np.minimum(input_cap, output_cap)
+    bottleneck = np.where(output_cap < input_cap, catalog.output_index, input_bottleneck)
+
+    items_per_hour = items_per_hour_array(catalog, config)
+    capped = np.minimum(items_per_hour, market_cap)
+    bottleneck = np.where(market_cap < items_per_hour, bottleneck, -1)
+
+    profit_per_item = evaluate_catalog(catalog, high, low, config)["profit_per_item"]
+    max_batch = np.floor(np.minimum(window_cap, market_cap * BUY_LIMIT_WINDOW_HOURS))
+
+    return {
+        "items_per_hour": items_per_hour,
+        "gp_per_hour": items_per_hour * profit_per_item,
+        "capped_items_per_hour": capped,
+        "capped_gp_per_hour": capped * profit_per_item,
+        "market_items_per_hour": market_cap,
+        "max_batch": max_batch,
+        "bottleneck": bottleneck,
+    }
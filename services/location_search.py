@@ -0,0 +1,82 @@
+"""Best bank location per chain, respecting facilities and requirements."""
+
+from typing import Dict, Iterable, List, Optional, TYPE_CHECKING
+
+import numpy as np
+
+try:
+    from ..data import BANK_LOCATIONS
+except ImportError:
+    from data import BANK_LOCATIONS
+
+from .calculations import gp_hour_table, recipe_timing_index
+from .evaluation import evaluate_catalog
+
+if TYPE_CHECKING:
+    from ..models.catalog import CompiledCatalog
+
+
+def location_requirements() -> List[str]:
+    """Distinct quest/skill requirements of real (non-preset) locations."""
+    return sorted({
+        location.requirements for location in BANK_LOCATIONS.values()
+        if not location.is_unrestricted
+    })
+
+
+def _best_column(values: np.ndarray, allowed: np.ndarray) -> np.ndarray:
+    """Index of the largest allowed, non-NaN value per row (-1 if none)."""
+    masked = np.where(allowed & ~np.isnan(values), values, -np.inf)
+    best = masked.argmax(axis=1)
+    return np.where(np.isfinite(masked[np.arange(len(best)), best]), best, -1)
+
+
+def best_locations(
+    catalog: 'CompiledCatalog',
+    high: np.ndarray,
+    low: np.ndarray,
+    config: Dict,
+    met_requirements: Optional[Iterable[str]] = None,
+    include_presets: bool = False
+) -> Dict:
+    """
+    Evaluate every chain at every location with the right facility.
+
+    Locations are ranked by items/hr (for a profitable chain that is also
+    the GP/hr ranking; for a losing one, the fastest place to train).
+    Equipment, stamina and plank method come from config. Generic presets
+    ("Fast (Optimal)" etc.) are skipped unless include_presets is set.
+
+    Returns dict with 'locations' (names), (n_recipes, n_locations)
+    'items_per_hour' / 'gp_per_hour' (NaN where the facility is missing),
+    and per recipe 'best' / 'reachable' location indices (-1 if none)
+    with matching '*_items_per_hour' and '*_gp_per_hour'. 'reachable'
+    only considers locations whose requirements are in met_requirements
+    or that have none.
+    """
+    table = gp_hour_table()
+    index = recipe_timing_index(catalog, config.get("plank_method", "Sawmill"))
+    rates = table.items_per_hour_by_location(config)
+    items_per_hour = np.where((index >= 0)[:, None], rates[index], np.nan)
+
+    profit_per_item = evaluate_catalog(catalog, high, low, config)["profit_per_item"]
+    gp_per_hour = items_per_hour * profit_per_item[:, None]
+
+    met = set(met_requirements or ())
+    locations = [BANK_LOCATIONS[name] for name in table.locations]
+    candidate = np.array([include_presets or not loc.is_preset for loc in locations])
+    reachable = candidate & np.array([loc.is_unrestricted or loc.requirements in met for loc in locations])
+
+    rows = np.arange(len(catalog))
+    result = {
+        "locations": table.locations,
+        "items_per_hour": items_per_hour,
+        "gp_per_hour": gp_per_hour,
+    }
+    for name, allowed in (("best", candidate), ("reachable", reachable)):
+        best = _best_column(items_per_hour, allowed[None, :])
+        found = best >= 0
+        result[name] = best
+        result[f"{name}_items_per_hour"] = np.where(found, items_per_hour[rows, best], np.nan)
+        result[f"{name}_gp_per_hour"] = np.where(found, gp_per_hour[rows, best], np.nan)
+    return result
@@ -0,0 +1,180 @@
+"""Pareto frontier of GP/hr, XP/hr and capital over chains and setups."""
+
+import itertools
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+try:
+    from ..data import ACTIVITY_TIMINGS, BANK_LOCATIONS, XP_PER_MATERIAL
+except ImportError:
+    from data import ACTIVITY_TIMINGS, BANK_LOCATIONS, XP_PER_MATERIAL
+
+from .calculations import items_per_hour_array
+from .evaluation import evaluate_catalog
+
+if TYPE_CHECKING:
+    from ..models.catalog import CompiledCatalog
+
+PLANK_METHODS = ("Sawmill", "Plank Make", "Plank Make (Earth Staff)")
+
+EQUIPMENT_KEYS = (
+    "has_imcando_hammer",
+    "has_amys_saw",
+    "has_plank_sack",
+    "has_smithing_outfit",
+    "ancient_furnace",
+)
+
+PARETO_CHUNK_SIZE = 2048
+
+
+def xp_per_item_array(catalog: 'CompiledCatalog', config: Dict) -> Tuple[np.ndarray, List[str]]:
+    """
+    XP per output item for every recipe, and the skill trained.
+
+    XP per action is the activity's flat xp_per_action plus XP_PER_MATERIAL
+    for the recipe's primary input times materials per action.
+    """
+    xp = np.zeros(len(catalog))
+    skills = [""] * len(catalog)
+    for r, recipe in enumerate(catalog.recipes):
+        timing = ACTIVITY_TIMINGS.get(recipe.get_timing_key(config))
+        if timing is None:
+            continue
+        material_xp = XP_PER_MATERIAL.get(recipe.inputs[0].item_name, 0.0)
+        xp_per_action = timing.xp_per_action + material_xp * timing.materials_per_action
+        xp[r] = xp_per_action / timing.items_per_action
+        skills[r] = timing.skill
+    return xp, skills
+
+
+def configuration_space() -> List[Dict]:
+    """
+    Every plank method x bank location x stamina x equipment combination.
+
+    Stamina only varies for stamina-dependent locations.
+    """
+    configs = []
+    for plank_method, (location_name, location) in itertools.product(PLANK_METHODS, BANK_LOCATIONS.items()):
+        stamina_options = (True, False) if location.stamina_dependent else (True,)
+        for use_stamina, equipment in itertools.product(
+            stamina_options, itertools.product((False, True), repeat=len(EQUIPMENT_KEYS))
+        ):
+            configs.append({
+                "plank_method": plank_method,
+                "use_earth_staff": "Earth Staff" in plank_method,
+                "bank_location": location_name,
+                "use_stamina": use_stamina,
+                **dict(zip(EQUIPMENT_KEYS, equipment)),
+            })
+    return configs
+
+
+@lru_cache(maxsize=4)
+def _rate_grid(catalog: 'CompiledCatalog') -> Tuple[Tuple[Dict, ...], np.ndarray, np.ndarray]:
+    """Price-independent (configs, items/hr, XP/item) grids, (n_configs, n_recipes)."""
+    configs = tuple(configuration_space())
+    items_per_hour = np.vstack([items_per_hour_array(catalog, config) for config in configs])
+    xp_by_method = {method: xp_per_item_array(catalog, {"plank_method": method})[0] for method in PLANK_METHODS}
+    xp_per_item = np.vstack([xp_by_method[config["plank_method"]] for config in configs])
+    for arr in (items_per_hour, xp_per_item):
+        arr.setflags(write=False)
+    return configs, items_per_hour, xp_per_item
+
+
+def pareto_mask(points: np.ndarray, maximize: Sequence[bool]) -> np.ndarray:
+    """
+    Non-dominated rows of an (n, k) objective matrix.
+
+    Points are sorted lexicographically (best first on every objective), so
+    a point can only be dominated by one before it. Each chunk is compared
+    against the frontier found so far and against earlier points in the
+    same chunk, all as array operations.
+    """
+    signs = np.where(maximize, -1.0, 1.0)
+    values = points * signs  # minimize everything
+    order = np.lexsort(values.T[::-1])
+    values = values[order]
+
+    on_front = np.zeros(len(values), dtype=bool)
+    front = values[:0]
+    for start in range(0, len(values), PARETO_CHUNK_SIZE):
+        chunk = values[start:start + PARETO_CHUNK_SIZE]
+
+        # Dominated by a frontier point from an earlier chunk
+        le = (front[:, None, :] <= chunk[None, :, :]).all(axis=2)
+        lt = (front[:, None, :] < chunk[None, :, :]).any(axis=2)
+        keep = ~(le & lt).any(axis=0)
+
+        # Dominated by an earlier point within this chunk
+        le = (chunk[:, None, :] <= chunk[None, :, :]).all(axis=2)
+        lt = (chunk[:, None, :] < chunk[None, :, :]).any(axis=2)
+        dominated = np.triu(le & lt, k=1) & keep[:, None]
+        keep &= ~dominated.any(axis=0)
+
+        on_front[start:start + len(chunk)] = keep
+        front = np.concatenate([front, chunk[keep]])
+
+    mask = np.zeros(len(values), dtype=bool)
+    mask[order] = on_front
+    return mask
+
+
+def pareto_frontier(
+    catalog: 'CompiledCatalog',
+    high: np.ndarray,
+    low: np.ndarray,
+    config: Dict,
+    owned_only: bool = False
+) -> Dict:
+    """
+    GP/hr, XP/hr and capital/hr for every chain under every setup, with the
+    non-dominated set (max GP/hr, max XP/hr, min capital/hr) flagged.
+
+    Only quantity and self_collected are taken from config; the setup
+    dimensions come from configuration_space. With owned_only, setups
+    using equipment that config does not enable are skipped.
+
+    Returns dict with 'configs' and flat (n_points,) arrays: 'recipe',
+    'config' (index into configs), 'gp_per_hour', 'xp_per_hour',
+    'capital_per_hour' and 'on_front'.
+    """
+    configs, items_per_hour, xp_per_item = _rate_grid(catalog)
+
+    profit_per_item = np.empty(items_per_hour.shape)
+    cost_per_item = np.empty(items_per_hour.shape)
+    quantity = config.get("quantity", 1)
+    for method in PLANK_METHODS:
+        rows = [i for i, c in enumerate(configs) if c["plank_method"] == method]
+        results = evaluate_catalog(catalog, high, low, {**config, **configs[rows[0]]})
+        profit_per_item[rows] = results["profit_per_item"]
+        cost_per_item[rows] = results["total_input_cost"] / quantity
+
+    usable = np.isfinite(items_per_hour)
+    if owned_only:
+        lacking = [key for key in EQUIPMENT_KEYS if not config.get(key, False)]
+        allowed = np.array([not any(c[key] for key in lacking) for c in configs])
+        usable &= allowed[:, None]
+
+    config_idx, recipe_idx = np.nonzero(usable)
+    rate = items_per_hour[config_idx, recipe_idx]
+    gp_per_hour = rate * profit_per_item[config_idx, recipe_idx]
+    xp_per_hour = rate * xp_per_item[config_idx, recipe_idx]
+    capital_per_hour = rate * cost_per_item[config_idx, recipe_idx]
+
+    # Many setups give identical points (e.g. a saw for nails); test each once
+    points = np.column_stack([gp_per_hour, xp_per_hour, capital_per_hour])
+    unique_points, inverse = np.unique(points, axis=0, return_inverse=True)
+    on_front = pareto_mask(unique_points, (True, True, False))[inverse.ravel()]
+
+    return {
+        "configs": configs,
+        "recipe": recipe_idx,
+        "config": config_idx,
+        "gp_per_hour": gp_per_hour,
+        "xp_per_hour": xp_per_hour,
+        "capital_per_hour": capital_per_hour,
+        "on_front": on_front,
+    }
@@ -0,0 +1,122 @@
+"""Bill-of-materials explosion for mixed order lists."""
+
+from typing import Dict, Iterable, List, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from ..models.graph import ChainGraph
+    from .lookup import ItemIDLookup
+
+
+def explode_order(
+    order: List[Tuple[str, float]],
+    graph: 'ChainGraph',
+    prices: Dict,
+    config: Dict,
+    id_lookup: 'ItemIDLookup',
+    buy_items: Iterable[str] = ()
+) -> Dict:
+    """
+    Explode an order list into raw materials, intermediates and costs.
+
+    Args:
+        order: (item name, quantity) lines. Repeated items are summed.
+        graph: ChainGraph from build_chain_graph
+        prices: item_id -> price data from Wiki API
+        config: User settings (self_collected, use_earth_staff, etc.)
+        id_lookup: ItemIDLookup for resolving names to IDs
+        buy_items: Intermediate item names to buy instead of craft
+
+    Returns:
+        Dict with raw material shopping list, intermediates and totals.
+    """
+    results = {
+        "raw_materials": [],
+        "intermediates": [],
+        "raw_material_cost": 0,
+        "processing_costs": 0,
+        "total_cost": 0,
+        "output_value": 0,
+        "unknown_items": [],
+        "missing_prices": [],
+    }
+
+    n = len(graph)
+    indices = []
+    quantities = []
+    for name, qty in order:
+        idx = graph.find(name)
+        if idx is None:
+            results["unknown_items"].append(name)
+            continue
+        if qty and qty > 0:
+            indices.append(idx)
+            quantities.append(qty)
+
+    demand = np.zeros(n)
+    np.add.at(demand, np.asarray(indices, dtype=int), np.asarray(quantities, dtype=float))
+
+    if not demand.any():
+        return results
+
+    buy_items = frozenset(buy_items)
+    totals = demand @ graph.total_requirements(buy_items)
+
+    high = np.zeros(n)
+    low = np.zeros(n)
+    has_price = np.zeros(n, dtype=bool)
+    unit_processing = np.zeros(n)
+    crafted = np.zeros(n, dtype=bool)
+
+    for idx, (name, item_id) in enumerate(zip(graph.item_names, graph.item_ids)):
+        if totals[idx] <= 0:
+            continue
+        resolved_id = id_lookup.get_or_find_id(item_id, name)
+        price_data = prices.get(str(resolved_id), {}) if resolved_id else {}
+        high[idx] = price_data.get("high") or 0
+        low[idx] = price_data.get("low") or 0
+        has_price[idx] = bool(price_data)
+
+        if graph.is_craftable(idx) and name not in buy_items:
+            crafted[idx] = True
+            unit_processing[idx] = graph.producers[name].processing_cost_per_item(
+                prices, config, id_lookup
+            )
+
+    is_raw = (totals > 0) & ~crafted
+    if config.get("self_collected", False):
+        buy_price = np.where(is_raw, 0, high)
+    else:
+        buy_price = high
+
+    raw_cost = np.where(is_raw, totals * buy_price, 0)
+    processing = np.where(crafted, totals * unit_processing, 0)
+
+    for idx in np.flatnonzero(is_raw):
+        if not has_price[idx]:
+            results["missing_prices"].append(graph.item_names[idx])
+        results["raw_materials"].append({
+            "name": graph.item_names[idx],
+            "item_id": graph.item_ids[idx],
+            "quantity": float(totals[idx]),
+            "unit_price": float(buy_price[idx]),
+            "total_cost": float(raw_cost[idx]),
+        })
+
+    for idx in np.flatnonzero(crafted & (totals > 0)):
+        results["intermediates"].append({
+            "name": graph.item_names[idx],
+            "item_id": graph.item_ids[idx],
+            "quantity": float(totals[idx]),
+            "ordered": float(demand[idx]),
+            "processing_cost": float(processing[idx]),
+        })
+
+    results["raw_materials"].sort(key=lambda r: r["total_cost"], reverse=True)
+    results["raw_material_cost"] = float(raw_cost.sum())
+    results["processing_costs"] = float(processing.sum())
+    results["total_cost"] = results["raw_material_cost"] + results["processing_costs"]
+    results["output_value"] = float(demand @ low)
+
+    return results
@@ -0,0 +1,295 @@
+"""
+Append-only columnar store of price history on disk.
+
+One raw file per field, laid out time x item and memory-mapped, so a
+year of 5m windows for every GE item (~105k x 4k) is sliced without
+reading the rest into RAM, and readers in other processes share the OS
+page cache. Prices and volumes are int32 (0 = no trade in the window),
+timestamps int64.
+
+Appends write past the committed row count, flush, then atomically
+replace meta.json with the new count. A crash mid-append leaves the store
+at its last commit; readers only ever see committed rows. Timestamps are
+strictly increasing, so time ranges are two binary searches.
+
+Backfilled windows older than the first row can't go in place, so a
+prepend writes the merged rows to a new generation of files and commits
+meta.json pointing at them. Readers still mapping the old generation keep
+a consistent view until they refresh.
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: single writer process assumed
+    fcntl = None
+
+STORE_VERSION = 1
+
+# Store field -> /5m and /1h response key
+STORE_FIELDS = {
+    "high": "avgHighPrice",
+    "low": "avgLowPrice",
+    "high_volume": "highPriceVolume",
+    "low_volume": "lowPriceVolume",
+}
+
+# Files grow in steps of this many rows (~2 weeks of 5m windows)
+STORE_GROWTH_ROWS = 4096
+
+
+class PriceStore:
+    """Memory-mapped price history for a fixed set of items at one timestep."""
+
+    def __init__(self, directory: str, readonly: bool = True):
+        self.directory = directory
+        self.readonly = readonly
+        self._lock = threading.Lock()
+        with open(self._path("meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != STORE_VERSION:
+            raise ValueError(f"Unsupported price store version {meta.get('version')} in {directory}")
+        self.timestep: str = meta["timestep"]
+        self.item_ids: Tuple[int, ...] = tuple(meta["item_ids"])
+        self._columns = {item_id: c for c, item_id in enumerate(self.item_ids)}
+        self._rows = 0
+        self._capacity = -1
+        self._generation = -1
+        self._apply_meta(meta)
+
+    @classmethod
+    def create(cls, directory: str, item_ids: Sequence[int], timestep: str) -> 'PriceStore':
+        """Create an empty store. Fails if one already exists there."""
+        os.makedirs(directory, exist_ok=True)
+        meta_path = os.path.join(directory, "meta.json")
+        if os.path.exists(meta_path):
+            raise FileExistsError(meta_path)
+        for name, _, _ in cls._files(len(item_ids)):
+            open(os.path.join(directory, name), "wb").close()
+        _write_meta(meta_path, {
+            "version": STORE_VERSION,
+            "timestep": timestep,
+            "item_ids": [int(i) for i in item_ids],
+            "rows": 0,
+            "capacity": 0,
+            "generation": 0,
+        })
+        return cls(directory, readonly=False)
+
+    @staticmethod
+    def _files(n_items: int) -> Iterator[Tuple[str, np.dtype, Optional[int]]]:
+        yield "timestamps.i64", np.dtype(np.int64), None
+        for field in STORE_FIELDS:
+            yield f"{field}.i32", np.dtype(np.int32), n_items
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    @staticmethod
+    def _data_file(name: str, generation: int) -> str:
+        # Generation 0 keeps the original names
+        if generation == 0:
+            return name
+        stem, ext = name.split(".")
+        return f"{stem}.{generation}.{ext}"
+
+    def __len__(self) -> int:
+        return self._rows
+
+    @property
+    def first_timestamp(self) -> Optional[int]:
+        return int(self._timestamps[0]) if self._rows else None
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        return int(self._timestamps[self._rows - 1]) if self._rows else None
+
+    def _apply_meta(self, meta: Dict) -> None:
+        generation = meta.get("generation", 0)
+        if meta["capacity"] != self._capacity or generation != self._generation:
+            self._capacity = meta["capacity"]
+            self._generation = generation
+            self._maps = {}
+            mode = "r" if self.readonly else "r+"
+            for name, dtype, width in self._files(len(self.item_ids)):
+                shape = (self._capacity,) if width is None else (self._capacity, width)
+                key = name.split(".")[0]
+                # np.memmap rejects empty files; an empty store maps nothing
+                self._maps[key] = (
+                    np.memmap(self._path(self._data_file(name, generation)), dtype=dtype, mode=mode, shape=shape)
+                    if self._capacity else np.zeros(shape, dtype=dtype)
+                )
+            self._timestamps = self._maps["timestamps"]
+        self._rows = meta["rows"]
+
+    def refresh(self) -> None:
+        """Pick up rows committed by other processes."""
+        with open(self._path("meta.json"), "r", encoding="utf-8") as f:
+            self._apply_meta(json.load(f))
+
+    @contextmanager
+    def _writing(self) -> Iterator[None]:
+        if self.readonly:
+            raise PermissionError(f"Price store {self.directory} opened read-only")
+        with self._lock, open(self._path("lock"), "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self.refresh()
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _grow(self, rows: int) -> None:
+        capacity = -(-rows // STORE_GROWTH_ROWS) * STORE_GROWTH_ROWS
+        for name, dtype, width in self._files(len(self.item_ids)):
+            with open(self._path(self._data_file(name, self._generation)), "r+b") as f:
+                f.truncate(capacity * dtype.itemsize * (width or 1))
+        self._commit(self._rows, capacity)
+
+    def _commit(self, rows: int, capacity: Optional[int] = None, generation: Optional[int] = None) -> None:
+        meta = {
+            "version": STORE_VERSION,
+            "timestep": self.timestep,
+            "item_ids": list(self.item_ids),
+            "rows": rows,
+            "capacity": self._capacity if capacity is None else capacity,
+            "generation": self._generation if generation is None else generation,
+        }
+        _write_meta(self._path("meta.json"), meta)
+        self._apply_meta(meta)
+
+    def _write_rows(self, maps: Dict[str, np.ndarray], start: int, snapshots: Sequence[Tuple[int, Dict]]) -> None:
+        keys = [str(item_id) for item_id in self.item_ids]
+        for t, (timestamp, data) in enumerate(snapshots, start):
+            maps["timestamps"][t] = timestamp
+            entries = [data.get(key) or {} for key in keys]
+            for field, api_key in STORE_FIELDS.items():
+                maps[field][t] = [entry.get(api_key) or 0 for entry in entries]
+
+    def append(self, snapshots: Sequence[Tuple[int, Dict]]) -> int:
+        """
+        Append [(timestamp, {item_id: window})] as returned by
+        fetch_price_history, committing once. Windows at or before the last
+        stored timestamp are skipped; returns the number of rows added.
+        """
+        with self._writing():
+            last = self.last_timestamp
+            new = sorted((int(ts), data) for ts, data in snapshots if last is None or int(ts) > last)
+            new = [snap for k, snap in enumerate(new) if k == 0 or snap[0] != new[k - 1][0]]
+            if not new:
+                return 0
+
+            start = self._rows
+            if start + len(new) > self._capacity:
+                self._grow(start + len(new))
+
+            self._write_rows(self._maps, start, new)
+            for arr in self._maps.values():
+                arr.flush()
+            self._commit(start + len(new))
+            return len(new)
+
+    def prepend(self, snapshots: Sequence[Tuple[int, Dict]]) -> int:
+        """
+        Insert backfilled [(timestamp, {item_id: window})] older than the
+        first stored window, committing once into a new file generation.
+        Other windows are skipped; returns the number of rows added.
+        """
+        with self._writing():
+            first = self.first_timestamp
+            if first is None:
+                new = []
+            else:
+                new = sorted((int(ts), data) for ts, data in snapshots if int(ts) < first)
+                new = [snap for k, snap in enumerate(new) if k == 0 or snap[0] != new[k - 1][0]]
+            if not new:
+                return 0
+
+            rows = self._rows + len(new)
+            capacity = -(-rows // STORE_GROWTH_ROWS) * STORE_GROWTH_ROWS
+            old_generation, generation = self._generation, self._generation + 1
+            maps = {}
+            for name, dtype, width in self._files(len(self.item_ids)):
+                key = name.split(".")[0]
+                shape = (capacity,) if width is None else (capacity, width)
+                maps[key] = np.memmap(self._path(self._data_file(name, generation)), dtype=dtype, mode="w+", shape=shape)
+                maps[key][len(new):rows] = self._maps[key][:self._rows]
+            self._write_rows(maps, 0, new)
+            for arr in maps.values():
+                arr.flush()
+            del maps
+
+            self._commit(rows, capacity, generation)
+            for name, _, _ in self._files(len(self.item_ids)):
+                try:
+                    os.remove(self._path(self._data_file(name, old_generation)))
+                except OSError:
+                    pass  # Still mapped elsewhere (Windows); harmless
+            return len(new)
+
+    def index_range(self, start: Optional[int] = None, end: Optional[int] = None) -> Tuple[int, int]:
+        """Row bounds [i0, i1) of timestamps in [start, end)."""
+        timestamps = self._timestamps[:self._rows]
+        i0 = 0 if start is None else int(np.searchsorted(timestamps, start, side="left"))
+        i1 = self._rows if end is None else int(np.searchsorted(timestamps, end, side="left"))
+        return i0, max(i0, i1)
+
+    def slice(
+        self,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        item_ids: Optional[Sequence[Optional[int]]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Windows with timestamps in [start, end) as build_price_matrix
+        arrays (prices NaN where nothing traded). item_ids picks and orders
+        columns; ids not in the store come back empty.
+        """
+        i0, i1 = self.index_range(start, end)
+        if item_ids is None:
+            columns = np.arange(len(self.item_ids))
+        else:
+            columns = np.array([self._columns.get(i, -1) for i in item_ids], dtype=np.intp)
+        known = columns >= 0
+        picked = np.where(known, columns, 0)
+
+        result = {"timestamps": np.array(self._timestamps[i0:i1])}
+        for field in STORE_FIELDS:
+            values = self._maps[field][i0:i1][:, picked].astype(float)
+            values[:, ~known] = 0
+            if field in ("high", "low"):
+                values[values == 0] = np.nan
+            result[field] = values
+        return result
+
+
+def _write_meta(path: str, meta: Dict) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def open_price_store(
+    directory: str,
+    item_ids: Optional[Sequence[int]] = None,
+    timestep: str = "5m",
+    readonly: bool = False
+) -> PriceStore:
+    """Open the store in directory, creating it for item_ids if missing."""
+    if not os.path.exists(os.path.join(directory, "meta.json")):
+        if item_ids is None or readonly:
+            raise FileNotFoundError(f"No price store in {directory}")
+        return PriceStore.create(directory, item_ids, timestep)
+    return PriceStore(directory, readonly=readonly)
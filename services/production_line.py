@@ -0,0 +1,102 @@
+"""End-to-end throughput of crafting a whole production line yourself."""
+
+from functools import lru_cache
+from typing import Dict, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from .calculations import items_per_hour_array
+from .evaluation import _unit_terms, evaluate_catalog, ge_tax, processing_cost_per_item
+
+if TYPE_CHECKING:
+    from ..models.catalog import CompiledCatalog
+
+
+@lru_cache(maxsize=4)
+def _stage_matrices(catalog: 'CompiledCatalog') -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (stages, raw) for every line at once.
+
+    stages[r, s] is units of recipe s's output made per unit of recipe r's
+    output when every craftable input is crafted, (I - A)^-1 over the
+    recipe graph. raw[r, i] is units of uncraftable item i bought. When
+    several recipes make an item the first is the producer.
+    """
+    n_recipes = len(catalog)
+    producer = np.full(len(catalog.item_names), -1, dtype=np.intp)
+    for r in range(n_recipes)[::-1]:
+        producer[catalog.output_index[r]] = r
+
+    unit_qty = _unit_terms(catalog)["unit_qty"]
+    rows = catalog.input_rows
+    input_producer = producer[catalog.input_items]
+    crafted = input_producer >= 0
+
+    direct = np.zeros((n_recipes, n_recipes))
+    np.add.at(direct, (rows[crafted], input_producer[crafted]), unit_qty[crafted])
+    stages = np.linalg.inv(np.eye(n_recipes) - direct)
+    stages[np.abs(stages) < 1e-9] = 0
+
+    per_stage_raw = np.zeros((n_recipes, len(catalog.item_names)))
+    np.add.at(per_stage_raw, (rows[~crafted], catalog.input_items[~crafted]), unit_qty[~crafted])
+    raw = stages @ per_stage_raw
+
+    for arr in (stages, raw):
+        arr.setflags(write=False)
+    return stages, raw
+
+
+def production_lines(
+    catalog: 'CompiledCatalog',
+    high: np.ndarray,
+    low: np.ndarray,
+    config: Dict
+) -> Dict[str, np.ndarray]:
+    """
+    Whole-line items/hr and GP/hr for every recipe, crafting every stage.
+
+    Stages run one after another, each at its own items/hr including bank
+    trips, so hours per final item is the sum over stages of units needed
+    / stage rate. The bottleneck is the stage taking the largest share of
+    that time. Lines with a stage lacking timing data are NaN.
+
+    Returns dict with (n_recipes, n_recipes) 'stages' (units per final
+    item) and 'stage_hours', and per recipe 'n_stages', 'line_items_per_hour',
+    'line_profit_per_item', 'line_gp_per_hour', 'buy_gp_per_hour' (final
+    stage only, buying intermediates), 'bottleneck' (-1 if no line) and
+    'bottleneck_share'.
+    """
+    stages, raw = _stage_matrices(catalog)
+    rate = items_per_hour_array(catalog, config)
+    in_line = stages > 0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        stage_hours = np.where(in_line, stages / rate, 0.0)
+    hours_per_item = stage_hours.sum(axis=1)
+    line_items_per_hour = 1.0 / hours_per_item
+
+    quantity = config.get("quantity", 1)
+    output_price = low[catalog.output_index]
+    raw_cost = 0.0 if config.get("self_collected", False) else raw @ high
+    processing = stages @ processing_cost_per_item(catalog, high, config)
+    tax = ge_tax(quantity * output_price, config) / quantity
+    line_profit_per_item = output_price - tax - raw_cost - processing
+
+    profit_per_item = evaluate_catalog(catalog, high, low, config)["profit_per_item"]
+
+    timed = np.isfinite(hours_per_item)
+    bottleneck = np.where(timed, np.argmax(np.where(timed[:, None], stage_hours, 0.0), axis=1), -1)
+    with np.errstate(invalid="ignore"):
+        share = stage_hours[np.arange(len(catalog)), np.maximum(bottleneck, 0)] / hours_per_item
+
+    return {
+        "stages": stages,
+        "stage_hours": stage_hours,
+        "n_stages": in_line.sum(axis=1),
+        "line_items_per_hour": line_items_per_hour,
+        "line_profit_per_item": line_profit_per_item,
+        "line_gp_per_hour": line_items_per_hour * line_profit_per_item,
+        "buy_gp_per_hour": rate * profit_per_item,
+        "bottleneck": bottleneck,
+        "bottleneck_share": np.where(timed, share, np.nan),
+    }
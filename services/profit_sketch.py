@@ -0,0 +1,188 @@
+"""
+Streaming profit percentiles per chain.
+
+Each time bucket holds a KLL quantile sketch of profit per item for every
+chain at once: level h keeps a (m_h, n_chains) block of samples of
+weight 2^h, and an overfull level is sorted per chain and every other
+sample promoted. Sketches merge by stacking levels, so a window query
+merges its buckets and compacts once. Windows where a chain can't be
+priced are stored as NaN, which sorts last and carries no weight.
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, TYPE_CHECKING
+
+import numpy as np
+
+from .backtest import replay_prices
+from .history import forward_fill
+from .price_store import PriceStore
+
+if TYPE_CHECKING:
+    from ..models.catalog import CompiledCatalog
+
+SKETCH_K = 200
+BAND_QUANTILES = (0.1, 0.5, 0.9)
+
+# Daily buckets: a 30d query merges ~30 sketches. A day of 1h windows (24
+# values) would fit in a k=200 sketch uncompacted, so each bucket is
+# compacted to CLOSED_SKETCH_K once a newer day starts and only the open
+# day holds raw values
+BUCKET_SECONDS = 86_400
+CLOSED_SKETCH_K = 16
+
+
+class QuantileSketch:
+    """KLL sketch of n_series value streams that all receive one value per update."""
+
+    def __init__(self, n_series: int, k: int = SKETCH_K, seed: Optional[int] = None):
+        self.n_series = n_series
+        self.k = k
+        self.levels: List[np.ndarray] = [np.empty((0, n_series))]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        return max(2, int(np.ceil(self.k * (2 / 3) ** (len(self.levels) - 1 - level))))
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.levels):
+            block = self.levels[level]
+            if len(block) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty((0, self.n_series)))
+                block = np.sort(block, axis=0)
+                even = len(block) - len(block) % 2
+                promoted = block[self._rng.integers(2):even:2]
+                self.levels[level] = block[even:]
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+                level = 0  # Capacities shrink as levels are added
+            else:
+                level += 1
+
+    def update(self, rows: np.ndarray) -> None:
+        """Add (m, n_series) values, NaN for no value."""
+        self.levels[0] = np.concatenate([self.levels[0], np.atleast_2d(rows)])
+        self._compress()
+
+    @classmethod
+    def merged(cls, sketches: Iterable['QuantileSketch'], n_series: int, k: int = SKETCH_K) -> 'QuantileSketch':
+        """One sketch summarising all of sketches; the inputs are unchanged."""
+        result = cls(n_series, k)
+        blocks: List[List[np.ndarray]] = []
+        for sketch in sketches:
+            for level, block in enumerate(sketch.levels):
+                if level == len(blocks):
+                    blocks.append([])
+                blocks[level].append(block)
+        if blocks:
+            result.levels = [np.concatenate(level_blocks) for level_blocks in blocks]
+        result._compress()
+        return result
+
+    def quantiles(self, qs: Sequence[float]) -> Dict[str, np.ndarray]:
+        """(len(qs), n_series) 'quantiles' (NaN without data) and per series 'samples' weight."""
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(block), 2.0 ** level) for level, block in enumerate(self.levels)])
+        order = np.argsort(values, axis=0)
+        values = np.take_along_axis(values, order, axis=0)
+        cumulative = np.cumsum(weights[order] * ~np.isnan(values), axis=0)
+        total = cumulative[-1] if len(values) else np.zeros(self.n_series)
+
+        result = np.full((len(qs), self.n_series), np.nan)
+        has_data = total > 0
+        columns = np.arange(self.n_series)[has_data]
+        for i, q in enumerate(qs):
+            rank = (cumulative[:, has_data] >= q * total[has_data]).argmax(axis=0)
+            result[i, has_data] = values[rank, columns]
+        return {"quantiles": result, "samples": total}
+
+
+class ProfitBands:
+    """Per-chain profit sketches in fixed time buckets, kept for retention_seconds."""
+
+    def __init__(
+        self,
+        n_recipes: int,
+        retention_seconds: int,
+        bucket_seconds: int = BUCKET_SECONDS,
+        k: int = SKETCH_K,
+        closed_k: int = CLOSED_SKETCH_K
+    ):
+        self.n_recipes = n_recipes
+        self.retention_seconds = retention_seconds
+        self.bucket_seconds = bucket_seconds
+        self.k = k
+        self.closed_k = closed_k
+        self.buckets: Dict[int, QuantileSketch] = {}
+        self.last_timestamp: Optional[int] = None
+        self._last_high: Optional[np.ndarray] = None
+        self._last_low: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+    def ingest(self, catalog: 'CompiledCatalog', history: Dict[str, np.ndarray], config: Dict) -> int:
+        """
+        Evaluate new windows of a build_price_matrix / PriceStore.slice dict
+        and add their profit per item; windows at or before the last one are
+        skipped. Prices carry forward across calls. Returns windows added.
+        """
+        with self._lock:
+            timestamps = np.asarray(history["timestamps"], dtype=np.int64)
+            new = timestamps > (-np.inf if self.last_timestamp is None else self.last_timestamp)
+            if not new.any():
+                return 0
+            timestamps = timestamps[new]
+
+            filled = []
+            for carry, values in ((self._last_high, history["high"][new]), (self._last_low, history["low"][new])):
+                if carry is not None:
+                    values = np.vstack([carry, values])
+                filled.append(forward_fill(values)[-len(timestamps):])
+            high, low = filled
+            results, valid = replay_prices(catalog, high, low, config)
+            profit = np.where(valid, results["profit_per_item"], np.nan)
+
+            starts = timestamps - timestamps % self.bucket_seconds
+            for start in np.unique(starts):
+                sketch = self.buckets.setdefault(int(start), QuantileSketch(self.n_recipes, self.k))
+                sketch.update(profit[starts == start])
+            open_start = int(starts[-1])
+            for start, sketch in self.buckets.items():
+                if start < open_start and sketch.k != self.closed_k:
+                    self.buckets[start] = QuantileSketch.merged([sketch], self.n_recipes, self.closed_k)
+
+            self._last_high, self._last_low = high[-1:], low[-1:]
+            self.last_timestamp = int(timestamps[-1])
+            cutoff = self.last_timestamp - self.retention_seconds
+            for start in [s for s in self.buckets if s + self.bucket_seconds <= cutoff]:
+                del self.buckets[start]
+            return len(timestamps)
+
+    def ingest_store(
+        self,
+        catalog: 'CompiledCatalog',
+        store: PriceStore,
+        item_ids: Sequence[Optional[int]],
+        config: Dict
+    ) -> int:
+        """Ingest store windows newer than the last, or the retention period on first call."""
+        if self.last_timestamp is not None:
+            start = self.last_timestamp + 1
+        elif store.last_timestamp is not None:
+            start = store.last_timestamp - self.retention_seconds
+        else:
+            return 0
+        return self.ingest(catalog, store.slice(start, None, item_ids), config)
+
+    def percentiles(self, window_seconds: int, qs: Sequence[float] = BAND_QUANTILES) -> Dict[str, np.ndarray]:
+        """
+        QuantileSketch.quantiles over the last window_seconds, rounded out to
+        whole buckets (a 24h window merges yesterday's and today's).
+        """
+        with self._lock:
+            if self.last_timestamp is None:
+                sketches = []
+            else:
+                cutoff = self.last_timestamp - window_seconds
+                sketches = [s for start, s in self.buckets.items() if start + self.bucket_seconds > cutoff]
+            return QuantileSketch.merged(sketches, self.n_recipes, self.k).quantiles(qs)
@@ -0,0 +1,92 @@
+"""Profit as a function of batch size for every chain."""
+
+from typing import Dict, Optional, Sequence, TYPE_CHECKING
+
+import numpy as np
+
+try:
+    from ..data import GE_TAX_RATE, GE_TAX_CAP, GE_TAX_THRESHOLD
+except ImportError:
+    from data import GE_TAX_RATE, GE_TAX_CAP, GE_TAX_THRESHOLD
+
+from .evaluation import evaluate_catalog
+from .liquidity import buy_limit_quantity
+
+if TYPE_CHECKING:
+    from ..models.catalog import CompiledCatalog
+
+QUANTITY_GRID_POINTS = 200
+
+
+def quantity_grid(max_quantity: int, n_points: int = QUANTITY_GRID_POINTS) -> np.ndarray:
+    """Log-spaced integer quantities from 1 to max_quantity."""
+    return np.unique(np.round(np.geomspace(1, max_quantity, n_points)))
+
+
+def profit_curves(
+    catalog: 'CompiledCatalog',
+    high: np.ndarray,
+    low: np.ndarray,
+    config: Dict,
+    quantities: np.ndarray,
+    buy_limits: Optional[Sequence[Optional[int]]] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Net profit over a quantity grid for every chain in one pass.
+
+    Tax is charged on the whole batch, so per-item profit changes at the
+    tax threshold and again once the batch tax reaches the cap. Batches
+    beyond one buy-limit window of inputs are flagged as infeasible when
+    choosing the optimal quantity.
+
+    Returns dict with 'quantities' (Q,), 'net_profit' and 'profit_per_item'
+    (Q, n_recipes), and per-recipe breakpoints 'tax_threshold_quantity',
+    'tax_cap_quantity', 'buy_limit_quantity' plus 'optimal_quantity',
+    'optimal_profit' and 'min_profitable_quantity' (NaN if never).
+    """
+    quantities = np.asarray(quantities, dtype=float)
+    max_quantity = quantities.max()
+
+    rate = config.get("ge_tax_rate", GE_TAX_RATE)
+    cap = config.get("ge_tax_cap", GE_TAX_CAP)
+    threshold = config.get("ge_tax_threshold", GE_TAX_THRESHOLD)
+
+    output_price = low[catalog.output_index]
+    with np.errstate(divide="ignore"):
+        tax_threshold_quantity = np.ceil(threshold / output_price)
+        tax_cap_quantity = np.ceil(cap / (rate * output_price)) if rate > 0 else np.full(len(catalog), np.inf)
+
+    if buy_limits is None or config.get("self_collected", False):
+        limit_quantity = np.full(len(catalog), np.inf)
+    else:
+        limit_quantity = np.floor(buy_limit_quantity(catalog, buy_limits))
+
+    # Grid plus each chain's own breakpoints, evaluated together
+    extra = np.vstack([tax_cap_quantity, limit_quantity])
+    extra = np.clip(np.nan_to_num(extra, posinf=max_quantity), 1, max_quantity)
+    candidates = np.vstack([np.broadcast_to(quantities[:, None], (len(quantities), len(catalog))), extra])
+
+    results = evaluate_catalog(catalog, high, low, {**config, "quantity": candidates})
+    net_profit = results["net_profit"]
+
+    feasible = candidates <= limit_quantity
+    best = np.argmax(np.where(feasible, net_profit, -np.inf), axis=0)
+    columns = np.arange(len(catalog))
+
+    grid_profit = net_profit[:len(quantities)]
+    profitable = grid_profit > 0
+    min_profitable = np.where(
+        profitable.any(axis=0), quantities[np.argmax(profitable, axis=0)], np.nan
+    )
+
+    return {
+        "quantities": quantities,
+        "net_profit": grid_profit,
+        "profit_per_item": results["profit_per_item"][:len(quantities)],
+        "tax_threshold_quantity": tax_threshold_quantity,
+        "tax_cap_quantity": tax_cap_quantity,
+        "buy_limit_quantity": limit_quantity,
+        "optimal_quantity": candidates[best, columns],
+        "optimal_profit": net_profit[best, columns],
+        "min_profitable_quantity": min_profitable,
+    }
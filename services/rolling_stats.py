@@ -0,0 +1,200 @@
+"""
+Streaming per-item price statistics.
+
+Every ingested window updates, for all items at once and O(1) per item:
+a ring-buffer rolling mean of high, low and spread over the last
+`window` windows, EMAs of high and low, and the EW volatility of mid
+log returns. Items that didn't trade in a window keep their state.
+"""
+
+import os
+import threading
+from typing import Dict, Optional, Sequence, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from .backtest import replay_prices
+from .history import build_price_matrix, mid_prices
+
+if TYPE_CHECKING:
+    from ..models.catalog import CompiledCatalog
+
+ROLLING_WINDOW = 24
+EMA_SPAN = 12
+
+_BUFFERED = ("high", "low", "spread")
+
+
+class RollingStats:
+    """
+    Rolling mean, EMA, volatility and spread for a fixed list of items.
+    Safe to share between threads (the app keeps one per timestep).
+    """
+
+    def __init__(self, item_ids: Sequence[int], window: int = ROLLING_WINDOW, span: int = EMA_SPAN):
+        n_items = len(item_ids)
+        self.item_ids: Tuple[int, ...] = tuple(int(i) for i in item_ids)
+        self.window = window
+        self.span = span
+        self.alpha = 2.0 / (span + 1)
+        self.updates = 0
+        self.last_timestamp: Optional[int] = None
+        self._columns = {item_id: c for c, item_id in enumerate(self.item_ids)}
+        self._buffers = {name: np.full((window, n_items), np.nan) for name in _BUFFERED}
+        self._sums = {name: np.zeros(n_items) for name in _BUFFERED}
+        self._counts = {name: np.zeros(n_items, dtype=np.int64) for name in _BUFFERED}
+        self._ema = {name: np.full(n_items, np.nan) for name in ("high", "low")}
+        self._variance = np.full(n_items, np.nan)
+        self._last_mid = np.full(n_items, np.nan)
+        self._lock = threading.Lock()
+
+    def update(self, timestamp: int, high: np.ndarray, low: np.ndarray) -> bool:
+        """Fold in one window of (n_items,) prices, NaN where untraded. False if not newer."""
+        with self._lock:
+            return self._update(timestamp, high, low)
+
+    def _update(self, timestamp: int, high: np.ndarray, low: np.ndarray) -> bool:
+        if self.last_timestamp is not None and timestamp <= self.last_timestamp:
+            return False
+
+        slot = self.updates % self.window
+        values = {"high": high, "low": low, "spread": high - low}
+        for name in _BUFFERED:
+            buffer, new = self._buffers[name], values[name]
+            if slot == 0:
+                # Resync once per cycle so running sums don't drift
+                self._sums[name] = np.nansum(buffer, axis=0)
+                self._counts[name] = (~np.isnan(buffer)).sum(axis=0)
+            old = buffer[slot]
+            had, has = ~np.isnan(old), ~np.isnan(new)
+            self._sums[name] += np.where(has, new, 0.0) - np.where(had, old, 0.0)
+            self._counts[name] += has.astype(np.int64) - had
+            buffer[slot] = new
+
+        for name in ("high", "low"):
+            ema, new = self._ema[name], values[name]
+            has = ~np.isnan(new)
+            ema[has] = np.where(np.isnan(ema[has]), new[has], ema[has] + self.alpha * (new[has] - ema[has]))
+
+        mid = mid_prices({"high": high[None], "low": low[None]})[0]
+        moved = ~np.isnan(mid) & ~np.isnan(self._last_mid)
+        returns = np.log(mid[moved] / self._last_mid[moved])
+        previous = self._variance[moved]
+        self._variance[moved] = np.where(
+            np.isnan(previous), returns ** 2, (1 - self.alpha) * previous + self.alpha * returns ** 2
+        )
+        self._last_mid = np.where(np.isnan(mid), self._last_mid, mid)
+
+        self.updates += 1
+        self.last_timestamp = int(timestamp)
+        return True
+
+    def ingest(self, snapshots: Sequence[Tuple[int, Dict]]) -> int:
+        """Fold in [(timestamp, {item_id: window})] newer than the last; returns windows used."""
+        with self._lock:
+            new = sorted(
+                (snap for snap in snapshots if self.last_timestamp is None or snap[0] > self.last_timestamp),
+                key=lambda snap: snap[0],
+            )
+            if not new:
+                return 0
+            matrix = build_price_matrix(new, self.item_ids)
+            return sum(
+                self._update(timestamp, high, low)
+                for timestamp, high, low in zip(matrix["timestamps"], matrix["high"], matrix["low"])
+            )
+
+    def columns(self, item_ids: Sequence[Optional[int]]) -> Dict[str, np.ndarray]:
+        """
+        Current statistics aligned with item_ids (NaN for unknown ids or no
+        data): 'mean_high', 'mean_low', 'mean_spread' over the window,
+        'ema_high', 'ema_low', 'volatility' (std of log returns per window)
+        and 'samples' (windows in the rolling mean).
+        """
+        index = np.array([self._columns.get(i, -1) if i else -1 for i in item_ids], dtype=np.intp)
+        known = index >= 0
+
+        def pick(values: np.ndarray) -> np.ndarray:
+            return np.where(known, values[np.maximum(index, 0)], np.nan)
+
+        with self._lock, np.errstate(invalid="ignore", divide="ignore"):
+            means = {name: self._sums[name] / self._counts[name] for name in _BUFFERED}
+            return {
+                "mean_high": pick(means["high"]),
+                "mean_low": pick(means["low"]),
+                "mean_spread": pick(means["spread"]),
+                "ema_high": pick(self._ema["high"]),
+                "ema_low": pick(self._ema["low"]),
+                "volatility": pick(np.sqrt(self._variance)),
+                "samples": np.where(known, self._counts["high"][np.maximum(index, 0)], 0),
+            }
+
+    def save(self, path: str) -> None:
+        """Write state atomically."""
+        with self._lock:
+            arrays = {f"buffer_{name}": self._buffers[name] for name in _BUFFERED}
+            arrays.update({f"ema_{name}": ema for name, ema in self._ema.items()})
+            tmp_path = f"{path}.tmp.npz"
+            np.savez(
+                tmp_path,
+                item_ids=np.asarray(self.item_ids, dtype=np.int64),
+                settings=np.array([self.window, self.span, self.updates, -1 if self.last_timestamp is None else self.last_timestamp]),
+                variance=self._variance,
+                last_mid=self._last_mid,
+                **arrays,
+            )
+            os.replace(tmp_path, path)
+
+    @classmethod
+    def load(
+        cls,
+        path: str,
+        item_ids: Sequence[int],
+        window: int = ROLLING_WINDOW,
+        span: int = EMA_SPAN
+    ) -> 'RollingStats':
+        """Restore saved state, or start fresh if missing or saved for other items/settings."""
+        stats = cls(item_ids, window, span)
+        if not os.path.exists(path):
+            return stats
+        with np.load(path) as saved:
+            saved_window, saved_span, updates, last_timestamp = (int(v) for v in saved["settings"])
+            if tuple(saved["item_ids"]) != stats.item_ids or (saved_window, saved_span) != (window, span):
+                return stats
+            for name in _BUFFERED:
+                stats._buffers[name] = saved[f"buffer_{name}"].copy()
+                stats._sums[name] = np.nansum(stats._buffers[name], axis=0)
+                stats._counts[name] = (~np.isnan(stats._buffers[name])).sum(axis=0)
+            for name in stats._ema:
+                stats._ema[name] = saved[f"ema_{name}"].copy()
+            stats._variance = saved["variance"].copy()
+            stats._last_mid = saved["last_mid"].copy()
+            stats.updates = updates
+            stats.last_timestamp = None if last_timestamp < 0 else last_timestamp
+        return stats
+
+
+def chain_trends(catalog: 'CompiledCatalog', columns: Dict[str, np.ndarray], config: Dict) -> Dict[str, np.ndarray]:
+    """
+    Per-recipe view of RollingStats.columns aligned with catalog.item_names:
+    'rolling_profit_per_item' and 'ema_profit_per_item' at rolling-mean and
+    EMA prices (NaN without data for every input and the output), plus the
+    output's 'output_volatility' and 'output_spread_pct' (mean spread / mid).
+    """
+    profit = {}
+    for label, prefix in (("rolling", "mean"), ("ema", "ema")):
+        high, low = columns[f"{prefix}_high"][None], columns[f"{prefix}_low"][None]
+        results, valid = replay_prices(catalog, high, low, config)
+        profit[label] = np.where(valid, results["profit_per_item"], np.nan)[0]
+
+    output = catalog.output_index
+    mid = (columns["mean_high"][output] + columns["mean_low"][output]) / 2
+    with np.errstate(invalid="ignore", divide="ignore"):
+        spread_pct = columns["mean_spread"][output] / mid * 100
+
+    return {
+        "rolling_profit_per_item": profit["rolling"],
+        "ema_profit_per_item": profit["ema"],
+        "output_volatility": columns["volatility"][output],
+        "output_spread_pct": spread_pct,
+    }
@@ -0,0 +1,118 @@
+"""Play-session planner: linear program over the whole catalog."""
+
+import math
+from typing import Dict, Optional, Sequence, TYPE_CHECKING
+
+import numpy as np
+from scipy import sparse
+from scipy.optimize import linprog
+
+from .calculations import items_per_hour_array
+from .evaluation import _unit_terms, evaluate_catalog
+
+if TYPE_CHECKING:
+    from ..models.catalog import CompiledCatalog
+
+# GE buy limits reset every 4 hours
+BUY_LIMIT_WINDOW_HOURS = 4
+
+
+def plan_session(
+    catalog: 'CompiledCatalog',
+    high: np.ndarray,
+    low: np.ndarray,
+    config: Dict,
+    session_hours: float,
+    bankroll: float,
+    buy_limits: Sequence[Optional[int]]
+) -> Dict:
+    """
+    Decide how many hours to spend on each chain to maximize profit.
+
+    Variables are hours per recipe. Constraints:
+      - total hours <= session_hours
+      - GP spent on inputs and processing <= bankroll (no reinvestment of
+        sale proceeds, so the plan is always affordable up front)
+      - units bought of each item <= its GE buy limit per 4-hour window,
+        times the number of windows the session spans
+
+    Args:
+        catalog: CompiledCatalog from load_catalog
+        high, low: Price arrays aligned with catalog.item_names
+        config: User settings (equipment, bank location, etc.)
+        session_hours: Play session length
+        bankroll: Starting GP
+        buy_limits: GE buy limit per catalog item (None = no limit)
+
+    Returns:
+        Dict with per-recipe 'hours', 'items', 'profit' arrays, totals,
+        'limited_items' (names of binding buy limits) and solver status.
+    """
+    n_recipes = len(catalog)
+    results = evaluate_catalog(catalog, high, low, config)
+    quantity = config.get("quantity", 1)
+    items_per_hour = np.nan_to_num(items_per_hour_array(catalog, config), nan=0.0)
+
+    profit_per_hour = items_per_hour * results["profit_per_item"]
+    cost_per_hour = items_per_hour * results["total_input_cost"] / quantity
+
+    # Only chains with timing data and positive profit can be scheduled
+    usable = (items_per_hour > 0) & (profit_per_hour > 0)
+    bounds = [(0, None) if ok else (0, 0) for ok in usable]
+
+    A_ub = sparse.csr_matrix(np.vstack([np.ones(n_recipes), cost_per_hour]))
+    rhs = [session_hours, bankroll]
+
+    limit_items = []
+    if not config.get("self_collected", False):
+        windows = max(1, math.ceil(session_hours / BUY_LIMIT_WINDOW_HOURS))
+        terms = _unit_terms(catalog)
+        units_per_hour = sparse.csr_matrix(
+            (terms["unit_qty"] * items_per_hour[catalog.input_rows],
+             (catalog.input_items, catalog.input_rows)),
+            shape=(len(catalog.item_names), n_recipes)
+        )
+        limit_items = [
+            i for i, limit in enumerate(buy_limits)
+            if limit and units_per_hour[i].nnz
+        ]
+        if limit_items:
+            A_ub = sparse.vstack([A_ub, units_per_hour[limit_items]]).tocsr()
+            rhs.extend(buy_limits[i] * windows for i in limit_items)
+
+    solution = linprog(
+        -profit_per_hour,
+        A_ub=A_ub,
+        b_ub=np.asarray(rhs, dtype=float),
+        bounds=bounds,
+        method="highs"
+    )
+
+    plan = {
+        "status": solution.status,
+        "message": solution.message,
+        "hours": np.zeros(n_recipes),
+        "items": np.zeros(n_recipes),
+        "profit": np.zeros(n_recipes),
+        "total_profit": 0.0,
+        "total_hours": 0.0,
+        "capital_used": 0.0,
+        "limited_items": [],
+    }
+    if solution.status != 0:
+        return plan
+
+    hours = np.where(solution.x > 1e-9, solution.x, 0)
+    plan["hours"] = hours
+    plan["items"] = hours * items_per_hour
+    plan["profit"] = hours * profit_per_hour
+    plan["total_profit"] = float(plan["profit"].sum())
+    plan["total_hours"] = float(hours.sum())
+    plan["capital_used"] = float(hours @ cost_per_hour)
+
+    # Buy-limit rows start after the time and capital rows
+    slack = solution.ineqlin.residual[2:]
+    plan["limited_items"] = [
+        catalog.item_names[i] for i, s, b in zip(limit_items, slack, rhs[2:]) if s <= 1e-6 * max(1, b)
+    ]
+    return plan
@@ -0,0 +1,142 @@
+"""
+Tick-level Monte Carlo simulation of banking trips.
+
+Validates the analytic GP/hr model, which uses expected values: a flat
+0.15 ticks off every smithing action for the Smiths' Uniform and banking
+overhead in fractional seconds. Here each action draws its own tick save,
+actions and banking complete on tick boundaries, banking picks up random
+delays, and actions that don't finish inside the hour don't count.
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from ..data import SMITHING_OUTFIT_TICK_SAVE_CHANCE, TICK_SECONDS
+except ImportError:
+    from data import SMITHING_OUTFIT_TICK_SAVE_CHANCE, TICK_SECONDS
+
+from .calculations import _trip_model
+
+TICKS_PER_HOUR = int(round(3600 / TICK_SECONDS))
+
+# Mean extra ticks lost per bank trip (misclicks, reaction time)
+DEFAULT_BANK_DELAY_TICKS = 1.0
+
+SIMULATION_PERCENTILES = (5, 50, 95)
+
+# Hours per worker task; keeps each draw array to a few MB
+SIMULATION_CHUNK_HOURS = 250
+
+
+def _trip_parameters(timing_key: str, config: Dict) -> Optional[Dict]:
+    """Per-trip action count, action ticks and overhead ticks for the simulator."""
+    trip = _trip_model(timing_key, config)
+    if trip is None:
+        return None
+
+    timing = trip["timing"]
+    if timing_key == "Planks_Sawmill":
+        # One "action" per trip: the sawmill run, paying out a full inventory
+        return {
+            "actions_per_trip": 1,
+            "items_per_action": trip["items_per_trip"],
+            "action_ticks": trip["seconds_per_trip"] / TICK_SECONDS,
+            "tick_save_chance": 0.0,
+            "speed": 1.0,
+            "overhead_ticks": 0,
+        }
+
+    return {
+        "actions_per_trip": int(trip["actions_per_trip"]),
+        "items_per_action": timing.items_per_action,
+        "action_ticks": float(timing.ticks_per_action),
+        "tick_save_chance": (
+            SMITHING_OUTFIT_TICK_SAVE_CHANCE
+            if config.get("has_smithing_outfit", False) and timing.is_smithing else 0.0
+        ),
+        "speed": 2.0 if trip["ancient_furnace_active"] else 1.0,
+        "overhead_ticks": math.ceil(trip["trip_overhead"] / TICK_SECONDS - 1e-9),
+    }
+
+
+def _simulate_chunk(task: Tuple[Dict, int, float, np.random.SeedSequence]) -> np.ndarray:
+    """Items completed in each of n_hours independent simulated hours."""
+    params, n_hours, bank_delay, seed = task
+    rng = np.random.default_rng(seed)
+
+    actions = params["actions_per_trip"]
+    expected_action = params["action_ticks"] * (1 - params["tick_save_chance"]) / params["speed"]
+    trip_ticks = max(actions * expected_action + params["overhead_ticks"], 1.0)
+    n_trips = int(TICKS_PER_HOUR / trip_ticks * 1.2) + 2
+
+    # Craft every action, then bank: overhead sits in an extra column
+    durations = np.empty((n_hours, n_trips, actions + 1))
+    durations[..., :actions] = params["action_ticks"]
+    if params["tick_save_chance"] > 0:
+        durations[..., :actions] -= rng.random((n_hours, n_trips, actions)) < params["tick_save_chance"]
+    durations[..., :actions] /= params["speed"]
+    durations[..., actions] = params["overhead_ticks"]
+    if bank_delay > 0:
+        durations[..., actions] += rng.poisson(bank_delay, (n_hours, n_trips))
+
+    # Events land on the next tick boundary after their cumulative time
+    finish = np.ceil(np.cumsum(durations.reshape(n_hours, -1), axis=1) - 1e-9)
+    is_action = np.ones(actions + 1, dtype=bool)
+    is_action[actions] = False
+    completed = (finish <= TICKS_PER_HOUR) & np.tile(is_action, n_trips)
+    return completed.sum(axis=1) * params["items_per_action"]
+
+
+def simulate_items_per_hour(
+    timing_key: str,
+    config: Dict,
+    n_hours: int = 2_000,
+    seed: Optional[int] = None,
+    bank_delay_ticks: float = DEFAULT_BANK_DELAY_TICKS,
+    workers: Optional[int] = None
+) -> Optional[Dict]:
+    """
+    Simulate n_hours independent hours of an activity.
+
+    Hours are split into chunks drawn as NumPy batches and spread across a
+    process pool (workers=1 runs inline). Returns None without timing data,
+    else dict with 'samples' (n_hours,), 'mean', 'std', 'p5'/'p50'/'p95',
+    'analytic' (the items/hr model) and 'difference_pct'.
+    """
+    params = _trip_parameters(timing_key, config)
+    if params is None:
+        return None
+    trip = _trip_model(timing_key, config)
+    analytic = 3600.0 * trip["items_per_trip"] / trip["seconds_per_trip"]
+
+    chunks = [SIMULATION_CHUNK_HOURS] * (n_hours // SIMULATION_CHUNK_HOURS)
+    if n_hours % SIMULATION_CHUNK_HOURS:
+        chunks.append(n_hours % SIMULATION_CHUNK_HOURS)
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+    tasks = [(params, size, bank_delay_ticks, s) for size, s in zip(chunks, seeds)]
+
+    workers = workers or min(len(tasks), os.cpu_count() or 1)
+    if workers <= 1:
+        parts: List[np.ndarray] = [_simulate_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_simulate_chunk, tasks))
+
+    samples = np.concatenate(parts).astype(float)
+    p5, p50, p95 = np.percentile(samples, SIMULATION_PERCENTILES)
+    mean = samples.mean()
+    return {
+        "samples": samples,
+        "mean": mean,
+        "std": samples.std(),
+        "p5": p5,
+        "p50": p50,
+        "p95": p95,
+        "analytic": analytic,
+        "difference_pct": (mean - analytic) / analytic * 100,
+    }
@@ -0,0 +1,216 @@
+"""
+Backtest every chain under every setup in parallel.
+
+Prices only affect profit through the plank method (rune costs), and a
+setup's bank location, stamina and equipment only scale items/hr. So
+workers replay time ranges of the shared price matrix once per plank
+method and return mergeable per-recipe aggregates. Setups are expanded
+with the pareto rate grid after merging, and work scales with windows,
+not windows x setups.
+"""
+
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+from typing import Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from .backtest import replay_prices
+from .history import forward_fill
+from .pareto import PLANK_METHODS, _rate_grid
+
+if TYPE_CHECKING:
+    from ..models.catalog import CompiledCatalog
+
+# Tasks queued per worker, so early finishers pick up more and progress
+# updates stay frequent; tasks never go below SWEEP_MIN_CHUNK_ROWS windows
+SWEEP_TASKS_PER_WORKER = 4
+SWEEP_MIN_CHUNK_ROWS = 64
+
+# Per-worker state set by _init_worker: catalog, config, shared arrays
+_worker: Dict = {}
+
+
+def _attach(name: str, shape: Tuple[int, ...]) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    # Pool workers inherit the parent's resource tracker, which unlinks the
+    # block once when the parent does
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+
+
+def _init_worker(catalog: 'CompiledCatalog', config: Dict, names: Tuple[str, str], shape: Tuple[int, int]) -> None:
+    high_shm, high = _attach(names[0], shape)
+    low_shm, low = _attach(names[1], shape)
+    _worker.update(catalog=catalog, config=config, high=high, low=low, shm=(high_shm, low_shm))
+
+
+def _empty_aggregates(n_recipes: int) -> Dict[str, np.ndarray]:
+    shape = (len(PLANK_METHODS), n_recipes)
+    return {
+        "windows": np.zeros(shape),
+        "profitable": np.zeros(shape),
+        "profit_sum": np.zeros(shape),
+        "profit_sq_sum": np.zeros(shape),
+        "profit_min": np.full(shape, np.inf),
+        "profit_max": np.full(shape, -np.inf),
+    }
+
+
+def _merge(into: Dict[str, np.ndarray], part: Dict[str, np.ndarray]) -> None:
+    for key in ("windows", "profitable", "profit_sum", "profit_sq_sum"):
+        into[key] += part[key]
+    np.minimum(into["profit_min"], part["profit_min"], out=into["profit_min"])
+    np.maximum(into["profit_max"], part["profit_max"], out=into["profit_max"])
+
+
+def _chunk_aggregates(
+    catalog: 'CompiledCatalog',
+    high: np.ndarray,
+    low: np.ndarray,
+    config: Dict
+) -> Dict[str, np.ndarray]:
+    """Per plank method x recipe aggregates over one block of windows."""
+    parts = _empty_aggregates(len(catalog))
+    for m, method in enumerate(PLANK_METHODS):
+        method_config = {**config, "plank_method": method, "use_earth_staff": "Earth Staff" in method}
+        results, valid = replay_prices(catalog, high, low, method_config)
+        profit = np.where(valid, results["profit_per_item"], 0.0)
+        parts["windows"][m] = valid.sum(axis=0)
+        parts["profitable"][m] = (valid & (profit > 0)).sum(axis=0)
+        parts["profit_sum"][m] = profit.sum(axis=0)
+        parts["profit_sq_sum"][m] = (profit ** 2).sum(axis=0)
+        parts["profit_min"][m] = np.where(valid, profit, np.inf).min(axis=0, initial=np.inf)
+        parts["profit_max"][m] = np.where(valid, profit, -np.inf).max(axis=0, initial=-np.inf)
+    return parts
+
+
+def _sweep_task(bounds: Tuple[int, int]) -> Tuple[int, Dict[str, np.ndarray]]:
+    i0, i1 = bounds
+    parts = _chunk_aggregates(_worker["catalog"], _worker["high"][i0:i1], _worker["low"][i0:i1], _worker["config"])
+    return i1 - i0, parts
+
+
+def _expand(catalog: 'CompiledCatalog', totals: Dict[str, np.ndarray]) -> Dict:
+    """Per setup x recipe results from per plank method aggregates."""
+    configs, items_per_hour, _ = _rate_grid(catalog)
+    method_row = np.array([PLANK_METHODS.index(c["plank_method"]) for c in configs])
+
+    windows = totals["windows"][method_row]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_profit = np.where(windows > 0, totals["profit_sum"][method_row] / windows, np.nan)
+        variance = totals["profit_sq_sum"][method_row] / windows - mean_profit ** 2
+        profitable_fraction = np.where(windows > 0, totals["profitable"][method_row] / windows, np.nan)
+    mean_gp_per_hour = mean_profit * items_per_hour
+
+    ranked = np.where(np.isnan(mean_gp_per_hour), -np.inf, mean_gp_per_hour)
+    best = ranked.argmax(axis=0)
+    has_best = np.isfinite(ranked.max(axis=0))
+
+    return {
+        "configs": configs,
+        "windows": windows,
+        "profitable_fraction": profitable_fraction,
+        "mean_profit_per_item": mean_profit,
+        "std_profit_per_item": np.sqrt(np.maximum(variance, 0.0)),
+        "min_gp_per_hour": np.where(windows > 0, totals["profit_min"][method_row], np.nan) * items_per_hour,
+        "max_gp_per_hour": np.where(windows > 0, totals["profit_max"][method_row], np.nan) * items_per_hour,
+        "mean_gp_per_hour": mean_gp_per_hour,
+        "best_config": np.where(has_best, best, -1),
+    }
+
+
+def iter_sweep(
+    catalog: 'CompiledCatalog',
+    history: Dict[str, np.ndarray],
+    config: Dict,
+    workers: Optional[int] = None,
+    chunk_rows: Optional[int] = None,
+    cancel: Optional[threading.Event] = None
+) -> Iterator[Dict]:
+    """
+    Yield merged results after each finished time range.
+
+    The forward-filled high/low matrices are placed in shared memory once
+    and workers map them by name; tasks are just row bounds. Closing the
+    generator or setting cancel stops queued ranges; the last yield then
+    covers the ranges finished so far. workers defaults to every core and
+    runs inline when 1; chunk_rows defaults to splitting the windows into
+    SWEEP_TASKS_PER_WORKER ranges per worker.
+
+    Each yield is a dict of (n_configs, n_recipes) arrays as in _expand,
+    plus 'configs', 'windows_done', 'windows_total' and 'complete'.
+    """
+    high = forward_fill(history["high"])
+    low = forward_fill(history["low"])
+    n_windows = len(high)
+    workers = workers or os.cpu_count() or 1
+    if chunk_rows is None:
+        chunk_rows = max(SWEEP_MIN_CHUNK_ROWS, -(-n_windows // (workers * SWEEP_TASKS_PER_WORKER)))
+    bounds = [(i, min(i + chunk_rows, n_windows)) for i in range(0, n_windows, chunk_rows)]
+    workers = min(workers, len(bounds))
+    totals = _empty_aggregates(len(catalog))
+    done = 0
+
+    def snapshot() -> Dict:
+        return {**_expand(catalog, totals), "windows_done": done, "windows_total": n_windows,
+                "complete": done == n_windows}
+
+    if workers <= 1:
+        for i0, i1 in bounds:
+            if cancel is not None and cancel.is_set():
+                break
+            _merge(totals, _chunk_aggregates(catalog, high[i0:i1], low[i0:i1], config))
+            done += i1 - i0
+            yield snapshot()
+        return
+
+    blocks: List[shared_memory.SharedMemory] = []
+    try:
+        for source in (high, low):
+            shm = shared_memory.SharedMemory(create=True, size=max(source.nbytes, 1))
+            np.ndarray(source.shape, dtype=np.float64, buffer=shm.buf)[:] = source
+            blocks.append(shm)
+        del high, low
+
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(catalog, config, tuple(b.name for b in blocks), (n_windows, len(catalog.item_names))),
+        )
+        try:
+            pending = {pool.submit(_sweep_task, b) for b in bounds}
+            while pending:
+                if cancel is not None and cancel.is_set():
+                    break
+                finished, pending = wait(pending, timeout=0.25, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    rows, parts = future.result()
+                    _merge(totals, parts)
+                    done += rows
+                if finished:
+                    yield snapshot()
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+    finally:
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+
+
+def sweep_backtest(
+    catalog: 'CompiledCatalog',
+    history: Dict[str, np.ndarray],
+    config: Dict,
+    workers: Optional[int] = None,
+    cancel: Optional[threading.Event] = None
+) -> Dict:
+    """Run iter_sweep to the end (or cancellation) and return the last result."""
+    result = None
+    for result in iter_sweep(catalog, history, config, workers, cancel=cancel):
+        pass
+    if result is None:
+        result = {**_expand(catalog, _empty_aggregates(len(catalog))), "windows_done": 0,
+                  "windows_total": len(history["timestamps"]), "complete": len(history["timestamps"]) == 0}
+    return result
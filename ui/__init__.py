@@ -8,6 +8,11 @@ from .charts import (
     create_profit_histogram,
     create_roi_scatter,
     create_category_comparison,
+    create_pareto_scatter,
+    create_quantity_curve,
+    create_simulation_histogram,
+    create_profit_over_time,
+    create_correlation_heatmap,
 )
 
 __all__ = [
@@ -20,4 +25,9 @@ __all__ = [
     'create_profit_histogram',
     'create_roi_scatter',
     'create_category_comparison',
+    'create_pareto_scatter',
+    'create_quantity_curve',
+    'create_simulation_histogram',
+    'create_profit_over_time',
+    'create_correlation_heatmap',
 ]
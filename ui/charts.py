@@ -500,3 +500,348 @@ def create_category_comparison(results: List[Dict]) -> go.Figure:
     )
     
     return fig
+
+
+def create_pareto_scatter(
+    gp_per_hour: List[float],
+    xp_per_hour: List[float],
+    capital_per_hour: List[float],
+    labels: List[str],
+    on_front: List[bool]
+) -> go.Figure:
+    """GP/hr vs XP/hr scatter, frontier highlighted and coloured by capital/hr."""
+    front = [i for i, f in enumerate(on_front) if f]
+    rest = [i for i, f in enumerate(on_front) if not f]
+    
+    fig = go.Figure()
+    
+    if rest:
+        fig.add_trace(
+            go.Scatter(
+                x=[xp_per_hour[i] for i in rest],
+                y=[gp_per_hour[i] for i in rest],
+                mode='markers',
+                name='Dominated',
+                marker=dict(size=5, color='rgba(160,139,109,0.25)'),
+                text=[labels[i] for i in rest],
+                hovertemplate='<b>%{text}</b><br>XP/hr: %{x:,.0f}<br>GP/hr: %{y:,.0f}<extra></extra>'
+            )
+        )
+    
+    fig.add_trace(
+        go.Scatter(
+            x=[xp_per_hour[i] for i in front],
+            y=[gp_per_hour[i] for i in front],
+            mode='markers',
+            name='Frontier',
+            marker=dict(
+                size=9,
+                color=[capital_per_hour[i] for i in front],
+                colorscale='YlOrRd',
+                colorbar=dict(
+                    title=dict(text="Capital/hr", font=dict(color='#f4e4bc', size=10)),
+                    tickfont=dict(color='#f4e4bc', size=9)
+                ),
+                line=dict(width=1, color='#1a2a3a')
+            ),
+            text=[labels[i] for i in front],
+            customdata=[capital_per_hour[i] for i in front],
+            hovertemplate='<b>%{text}</b><br>XP/hr: %{x:,.0f}<br>GP/hr: %{y:,.0f}<br>Capital/hr: %{customdata:,.0f} GP<extra></extra>'
+        )
+    )
+    
+    fig.add_hline(y=0, line_dash="dash", line_color="rgba(244,228,188,0.3)", line_width=1)
+    
+    fig.update_layout(
+        title=dict(
+            text="GP/hr vs XP/hr",
+            font=dict(color='#ffd700', size=16),
+            subtitle=dict(
+                text="Frontier points are not beaten on GP/hr, XP/hr and capital at once",
+                font=dict(color='#a08b6d', size=10)
+            )
+        ),
+        xaxis=dict(
+            title="XP/hr",
+            title_font=dict(color='#f4e4bc', size=11),
+            tickfont=dict(color='#f4e4bc', size=9),
+            gridcolor='rgba(139,115,85,0.25)',
+            tickformat=',.0f'
+        ),
+        yaxis=dict(
+            title="GP/hr",
+            title_font=dict(color='#f4e4bc', size=11),
+            tickfont=dict(color='#f4e4bc', size=9),
+            gridcolor='rgba(139,115,85,0.25)',
+            tickformat=',.0f'
+        ),
+        height=450,
+        margin=dict(l=65, r=20, t=60, b=80),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(26,42,58,0.8)',
+        legend=dict(
+            font=dict(color='#f4e4bc', size=10),
+            bgcolor='rgba(26,42,58,0.8)',
+            bordercolor='#8b7355',
+            borderwidth=1,
+            orientation='h',
+            yanchor='bottom',
+            y=-0.25,
+            xanchor='center',
+            x=0.5
+        )
+    )
+    
+    return fig
+
+
+def create_quantity_curve(
+    quantities: List[float],
+    net_profit: List[float],
+    breakpoints: Dict[str, float],
+    optimal_quantity: Optional[float] = None
+) -> go.Figure:
+    """Net profit vs batch size (log scale) with breakpoints marked."""
+    per_item = [p / q for p, q in zip(net_profit, quantities)]
+    
+    fig = go.Figure()
+    
+    fig.add_trace(
+        go.Scatter(
+            x=quantities,
+            y=net_profit,
+            mode='lines',
+            name='Net Profit',
+            line=dict(color='#ffd700', width=2),
+            customdata=per_item,
+            hovertemplate='Qty: %{x:,.0f}<br>Profit: %{y:,.0f} GP<br>Per item: %{customdata:,.1f} GP<extra></extra>'
+        )
+    )
+    
+    for label, quantity in breakpoints.items():
+        fig.add_vline(
+            x=quantity,
+            line_dash="dot",
+            line_color="rgba(244,228,188,0.5)",
+            line_width=1,
+            annotation_text=label,
+            annotation_font=dict(color='#a08b6d', size=9)
+        )
+    
+    if optimal_quantity is not None:
+        fig.add_vline(
+            x=optimal_quantity,
+            line_dash="dash",
+            line_color="#2ecc71",
+            line_width=1.5,
+            annotation_text="Best batch",
+            annotation_position="bottom right",
+            annotation_font=dict(color='#2ecc71', size=9)
+        )
+    
+    fig.add_hline(y=0, line_dash="dash", line_color="rgba(244,228,188,0.3)", line_width=1)
+    
+    fig.update_layout(
+        title=dict(
+            text="Profit vs Batch Size",
+            font=dict(color='#ffd700', size=16),
+            subtitle=dict(
+                text="GE tax is charged on the whole batch",
+                font=dict(color='#a08b6d', size=10)
+            )
+        ),
+        xaxis=dict(
+            title="Quantity",
+            type='log',
+            title_font=dict(color='#f4e4bc', size=11),
+            tickfont=dict(color='#f4e4bc', size=9),
+            gridcolor='rgba(139,115,85,0.25)'
+        ),
+        yaxis=dict(
+            title="Net Profit (GP)",
+            title_font=dict(color='#f4e4bc', size=11),
+            tickfont=dict(color='#f4e4bc', size=9),
+            gridcolor='rgba(139,115,85,0.25)',
+            tickformat=',.0f'
+        ),
+        height=380,
+        margin=dict(l=65, r=20, t=60, b=45),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(26,42,58,0.8)',
+        showlegend=False
+    )
+    
+    return fig
+
+
+def create_simulation_histogram(samples: List[float], analytic: float) -> go.Figure:
+    """Histogram of simulated items/hr with the analytic estimate marked."""
+    samples_arr = np.asarray(samples)
+    
+    fig = go.Figure(data=[
+        go.Histogram(
+            x=samples_arr,
+            name='Simulated hours',
+            marker_color=CHART_COLORS['gold'],
+            marker_line_color=CHART_COLORS['gold_dark'],
+            marker_line_width=1,
+            opacity=0.9,
+            nbinsx=40,
+            hovertemplate='Items/hr: %{x:,.0f}<br>Hours: %{y}<extra></extra>'
+        )
+    ])
+    
+    fig.add_vline(
+        x=analytic,
+        line_dash="dash",
+        line_color=CHART_COLORS['dragon_red'],
+        line_width=2,
+        annotation_text="Analytic",
+        annotation_font=dict(color='#f4e4bc', size=9)
+    )
+    fig.add_vline(
+        x=samples_arr.mean(),
+        line_dash="dot",
+        line_color='#f4e4bc',
+        line_width=1.5,
+        annotation_text="Mean",
+        annotation_position="bottom right",
+        annotation_font=dict(color='#f4e4bc', size=9)
+    )
+    
+    fig.update_layout(
+        title=dict(
+            text="Simulated Items/hr",
+            font=dict(color='#ffd700', size=16),
+            subtitle=dict(
+                text=f"{len(samples_arr):,} simulated hours",
+                font=dict(color='#a08b6d', size=10)
+            )
+        ),
+        xaxis=dict(
+            title="Items/hr",
+            title_font=dict(color='#f4e4bc', size=11),
+            tickfont=dict(color='#f4e4bc', size=9),
+            gridcolor='rgba(139,115,85,0.25)',
+            tickformat=',.0f'
+        ),
+        yaxis=dict(
+            title="Hours",
+            title_font=dict(color='#f4e4bc', size=11),
+            tickfont=dict(color='#f4e4bc', size=9),
+            gridcolor='rgba(139,115,85,0.25)'
+        ),
+        height=350,
+        margin=dict(l=55, r=20, t=60, b=45),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(26,42,58,0.8)',
+        showlegend=False
+    )
+    
+    return fig
+
+
+def create_profit_over_time(
+    timestamps: List[int],
+    series: Dict[str, List[float]],
+    metric: str = "Profit per item (GP)"
+) -> go.Figure:
+    """One line per chain over replayed history, gaps left blank."""
+    times = np.asarray(timestamps, dtype='datetime64[s]')
+    
+    fig = go.Figure()
+    for name, values in series.items():
+        fig.add_trace(
+            go.Scatter(
+                x=times,
+                y=values,
+                mode='lines',
+                name=get_clean_item_name(name),
+                line=dict(color=get_item_tier_color(name), width=2),
+                connectgaps=False,
+                hovertemplate=f'{get_clean_item_name(name)}<br>%{{x|%d %b %H:%M}}<br>%{{y:,.0f}}<extra></extra>'
+            )
+        )
+    
+    fig.add_hline(y=0, line_dash="dash", line_color="rgba(244,228,188,0.3)", line_width=1)
+    
+    fig.update_layout(
+        title=dict(
+            text="Profit over Time",
+            font=dict(color='#ffd700', size=16),
+            subtitle=dict(
+                text=f"{len(times):,} windows replayed at historical prices",
+                font=dict(color='#a08b6d', size=10)
+            )
+        ),
+        xaxis=dict(
+            title_font=dict(color='#f4e4bc', size=11),
+            tickfont=dict(color='#f4e4bc', size=9),
+            gridcolor='rgba(139,115,85,0.25)'
+        ),
+        yaxis=dict(
+            title=metric,
+            title_font=dict(color='#f4e4bc', size=11),
+            tickfont=dict(color='#f4e4bc', size=9),
+            gridcolor='rgba(139,115,85,0.25)',
+            tickformat=',.0f'
+        ),
+        height=400,
+        margin=dict(l=65, r=20, t=60, b=45),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(26,42,58,0.8)',
+        legend=dict(
+            font=dict(color='#f4e4bc', size=10),
+            bgcolor='rgba(26,42,58,0.8)',
+            bordercolor='#8b7355',
+            borderwidth=1,
+            orientation='h',
+            yanchor='bottom',
+            y=-0.3,
+            xanchor='center',
+            x=0.5
+        )
+    )
+    
+    return fig
+
+
+def create_correlation_heatmap(matrix: List[List[float]], labels: List[str]) -> go.Figure:
+    """Item x item return correlation, red for moving together and blue for opposite."""
+    names = [get_clean_item_name(label) for label in labels]
+    
+    fig = go.Figure(
+        go.Heatmap(
+            z=matrix,
+            x=names,
+            y=names,
+            zmin=-1,
+            zmax=1,
+            colorscale='RdBu',
+            reversescale=True,
+            colorbar=dict(
+                title=dict(text="Corr.", font=dict(color='#f4e4bc', size=10)),
+                tickfont=dict(color='#f4e4bc', size=9)
+            ),
+            hovertemplate='%{y} / %{x}<br>Correlation: %{z:.2f}<extra></extra>'
+        )
+    )
+    
+    fig.update_layout(
+        title=dict(
+            text="Price Co-movement",
+            font=dict(color='#ffd700', size=16),
+            subtitle=dict(
+                text="Exponentially weighted correlation of hourly log returns",
+                font=dict(color='#a08b6d', size=10)
+            )
+        ),
+        xaxis=dict(tickfont=dict(color='#f4e4bc', size=9), tickangle=-45),
+        yaxis=dict(tickfont=dict(color='#f4e4bc', size=9), autorange='reversed'),
+        height=max(400, 18 * len(names) + 150),
+        margin=dict(l=120, r=20, t=60, b=120),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(26,42,58,0.8)'
+    )
+    
+    return fig